@@ -0,0 +1,39 @@
+import time
+
+import numpy as np
+
+
+def latency_summary(latencies: list, rows: int, wall_time: float) -> dict:
+    """Summarize per-call latencies (seconds) into milliseconds and rows/sec."""
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "calls": len(latencies_ms),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "rows_per_sec": rows / wall_time if wall_time else 0.0,
+    }
+
+
+def print_results(results: dict):
+    """Print one row per benchmark variant with its summary metrics."""
+    columns = list(next(iter(results.values())).keys())
+    print(f"{'variant':<24}" + "".join(f"{c:>16}" for c in columns))
+    for name, summary in results.items():
+        row = "".join(
+            f"{v:>16.3f}" if isinstance(v, float) else f"{v:>16}"
+            for v in summary.values()
+        )
+        print(f"{name:<24}{row}")
+
+
+def time_calls(fn, calls: list) -> dict:
+    """Call fn once per item sequentially and summarize the per-call latency."""
+    latencies = []
+    start = time.perf_counter()
+    for call in calls:
+        call_start = time.perf_counter()
+        fn(call)
+        latencies.append(time.perf_counter() - call_start)
+    return latency_summary(
+        latencies, rows=len(calls), wall_time=time.perf_counter() - start
+    )
@@ -0,0 +1,58 @@
+import time
+
+import click
+import numpy as np
+from sklearn import metrics
+
+from benchmarks.common import print_results
+from src.functions.evaluation import evaluate
+
+
+def sklearn_evaluate(y_true, y_pred, proba) -> dict:
+    # Same calls as the original eval_model, plus the probability metrics
+    return {
+        "accuracy": metrics.accuracy_score(y_true, y_pred),
+        "test-error": np.sum(y_true != y_pred) / y_true.shape[0],
+        "f1": metrics.f1_score(y_true, y_pred, average="macro"),
+        "precision": metrics.precision_score(y_true, y_pred, average="macro"),
+        "recall": metrics.recall_score(y_true, y_pred, average="macro"),
+        "roc_auc": metrics.roc_auc_score(y_true, proba[:, 1]),
+        "log_loss": metrics.log_loss(y_true, proba),
+    }
+
+
+def time_evaluation(evaluate_fn, repeat: int, *args) -> dict:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        evaluate_fn(*args)
+    seconds = (time.perf_counter() - start) / repeat
+    return {"seconds": seconds, "rows_per_sec": len(args[0]) / seconds}
+
+
+@click.command()
+@click.option("--rows", "n_rows", type=int, default=5_000_000)
+@click.option("--repeat", type=int, default=3)
+def main(n_rows, repeat):
+    # Binary labels with informative probabilities, like the heart classifier
+    rng = np.random.default_rng(42)
+    y_true = rng.integers(0, 2, n_rows)
+    positive = np.clip(0.3 * y_true + rng.uniform(0, 0.7, n_rows), 0, 1)
+    proba = np.column_stack([1 - positive, positive])
+    y_pred = proba.argmax(axis=1)
+
+    print_results(
+        {
+            "sklearn": time_evaluation(sklearn_evaluate, repeat, y_true, y_pred, proba),
+            "single_pass": time_evaluation(
+                lambda *args: evaluate(*args, classes=[0, 1]),
+                repeat,
+                y_true,
+                y_pred,
+                proba,
+            ),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
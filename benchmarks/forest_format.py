@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+
+import click
+import cloudpickle
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.common import print_results, time_calls
+from src.functions.forest import CompactForest
+
+
+def load_seconds(load, path: str, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        load(path)
+    return (time.perf_counter() - start) / repeat
+
+
+def load_pickle(path: str):
+    with open(path, "rb") as f:
+        return cloudpickle.load(f)
+
+
+@click.command()
+@click.option("--n-estimators", type=int, default=2000)
+@click.option("--max-depth", type=int, default=None)
+@click.option("--rows", "n_rows", type=int, default=200)
+def main(n_estimators, max_depth, n_rows):
+    X, y = make_classification(n_samples=1000, n_features=30, random_state=42)
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth, random_state=42
+    ).fit(X, y)
+
+    model_dir = tempfile.mkdtemp()
+    pickle_file, compact_file = f"{model_dir}/model.pkl", f"{model_dir}/model.npy"
+    with open(pickle_file, "wb") as f:
+        cloudpickle.dump(model, f)
+    CompactForest.from_sklearn(model).save(compact_file)
+
+    results = {}
+    rows = [X[i : i + 1] for i in range(n_rows)]
+    for name, path, load in [
+        ("pickle", pickle_file, load_pickle),
+        ("compact", compact_file, CompactForest.load),
+    ]:
+        loaded = load(path)
+        results[name] = {
+            "file_mb": os.path.getsize(path) / 1024**2,
+            "load_ms": load_seconds(load, path) * 1000,
+            **time_calls(loaded.predict, rows),
+        }
+        assert np.array_equal(loaded.predict(X), model.predict(X))
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
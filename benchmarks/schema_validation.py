@@ -0,0 +1,46 @@
+import time
+
+import click
+import pandas as pd
+import pandera as pa
+from pandera.typing import DataFrame
+
+from benchmarks.common import print_results
+from src.functions.columnar_validation import ColumnarValidator
+from src.functions.models import HeartSchema
+
+
+@pa.check_types(lazy=True)
+def check_types(data: pd.DataFrame) -> DataFrame[HeartSchema]:
+    # Pandera's in-memory validation of the whole frame
+    return data
+
+
+def time_validation(validate, data: pd.DataFrame, repeat: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        validate(data)
+    seconds = (time.perf_counter() - start) / repeat
+    return {"seconds": seconds, "rows_per_sec": len(data) / seconds}
+
+
+@click.command()
+@click.option("--source-url", type=str, default="data/heart.csv")
+@click.option("--rows", "n_rows", type=int, default=5_000_000)
+@click.option("--repeat", type=int, default=3)
+def main(source_url, n_rows, repeat):
+    # Synthetic heart data by resampling the source rows
+    data = pd.read_csv(source_url)
+    data = data.sample(n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+    validator = ColumnarValidator(HeartSchema.to_schema())
+    print_results(
+        {
+            "pandera_check_types": time_validation(check_types, data, repeat),
+            "columnar": time_validation(validator.validate, data, repeat),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
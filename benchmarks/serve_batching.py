@@ -0,0 +1,53 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.common import latency_summary, print_results
+from src.functions.batching import MicroBatcher
+
+
+def run_clients(predict_fn, rows: np.ndarray, concurrency: int) -> dict:
+    # Each call sends a single row, like simulate_traffic and the model tester
+    def call(row):
+        start = time.perf_counter()
+        predict_fn(row[np.newaxis, :])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(call, rows))
+    return latency_summary(
+        latencies, rows=len(rows), wall_time=time.perf_counter() - start
+    )
+
+
+@click.command()
+@click.option("--n-estimators", type=int, default=200)
+@click.option("--requests", "n_requests", type=int, default=2000)
+@click.option("--concurrency", type=int, default=32)
+@click.option("--batch-max-size", type=int, default=64)
+@click.option("--batch-window-ms", type=float, default=5.0)
+def main(n_estimators, n_requests, concurrency, batch_max_size, batch_window_ms):
+    X, y = make_classification(n_samples=1000, n_features=30, random_state=42)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=42)
+    model.fit(X, y)
+    rows = X[np.random.default_rng(42).integers(0, len(X), n_requests)]
+
+    results = {"per_request": run_clients(model.predict, rows, concurrency)}
+    batcher = MicroBatcher(
+        predict_fn=model.predict,
+        max_batch_size=batch_max_size,
+        window_ms=batch_window_ms,
+    )
+    results["micro_batch"] = run_clients(batcher.predict, rows, concurrency)
+    batcher.close()
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import json
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from benchmarks.common import print_results, time_calls
+from src.functions.preprocessing import CompiledPreprocessor
+
+
+def two_step(pipeline, feature_names, label_column, model, records):
+    # Graph step 1: SKLearnPipeline.do
+    df_transformed = pd.DataFrame(
+        data=pipeline.transform(pd.DataFrame(records)), columns=feature_names
+    )
+    transformed = df_transformed.drop(label_column, axis=1).to_dict(orient="records")
+
+    # Hop between graph steps serializes the intermediate body
+    body = json.loads(json.dumps({"inputs": [list(r.values()) for r in transformed]}))
+
+    # Graph step 2: ClassifierModel.predict
+    return model.predict(np.asarray(body["inputs"])).tolist()
+
+
+def fused(compiled, model, records):
+    # FusedClassifierModel.predict
+    return model.predict(compiled.transform(records)).tolist()
+
+
+@click.command()
+@click.option("--source-url", type=str, default="data/heart.csv")
+@click.option("--label-column", type=str, default="target")
+@click.option(
+    "--ohe-columns",
+    type=str,
+    default="sex,cp,slope,thal,restecg",
+    help="Comma separated.",
+)
+@click.option("--n-estimators", type=int, default=200)
+@click.option("--events", "n_events", type=int, default=500)
+def main(source_url, label_column, ohe_columns, n_estimators, n_events):
+    data = pd.read_csv(source_url)
+    pipeline = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(sparse=False), ohe_columns.split(",")),
+            remainder="passthrough",
+            verbose_feature_names_out=False,
+        )
+    ).fit(data)
+    feature_names = pipeline.get_feature_names_out()
+    compiled = CompiledPreprocessor(pipeline, drop_columns=[label_column])
+
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=42)
+    model.fit(compiled.transform(data.to_dict(orient="list")), data[label_column])
+
+    # Two-step graph needs the label column to satisfy the fitted transformer
+    records = data.sample(n_events, replace=True, random_state=42)
+    events = [[record] for record in records.to_dict(orient="records")]
+    raw_events = [
+        [record]
+        for record in records.drop(label_column, axis=1).to_dict(orient="records")
+    ]
+
+    print_results(
+        {
+            "two_step_graph": time_calls(
+                lambda e: two_step(pipeline, feature_names, label_column, model, e),
+                events,
+            ),
+            "fused": time_calls(lambda e: fused(compiled, model, e), raw_events),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
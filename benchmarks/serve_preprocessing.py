@@ -0,0 +1,55 @@
+import click
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from benchmarks.common import print_results, time_calls
+from src.functions.preprocessing import CompiledPreprocessor
+
+
+def sklearn_do(pipeline, feature_names, event):
+    # Per-event path of SKLearnPipeline.do without compilation
+    df_transformed = pd.DataFrame(
+        data=pipeline.transform(pd.DataFrame(event)), columns=feature_names
+    )
+    return df_transformed.to_dict(orient="records")
+
+
+@click.command()
+@click.option("--source-url", type=str, default="data/heart.csv")
+@click.option(
+    "--ohe-columns",
+    type=str,
+    default="sex,cp,slope,thal,restecg",
+    help="Comma separated.",
+)
+@click.option("--events", "n_events", type=int, default=2000)
+def main(source_url, ohe_columns, n_events):
+    data = pd.read_csv(source_url)
+    pipeline = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(sparse=False), ohe_columns.split(",")),
+            remainder="passthrough",
+            verbose_feature_names_out=False,
+        )
+    ).fit(data)
+    compiled = CompiledPreprocessor(pipeline)
+    feature_names = pipeline.get_feature_names_out()
+
+    # Single-record events, as sent by the traffic generator
+    records = data.sample(n_events, replace=True, random_state=42)
+    events = [[record] for record in records.to_dict(orient="records")]
+
+    print_results(
+        {
+            "sklearn_pipeline": time_calls(
+                lambda e: sklearn_do(pipeline, feature_names, e), events
+            ),
+            "compiled": time_calls(compiled.transform_records, events),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from typing import Dict, List
 
 from pydantic import BaseModel, BaseSettings, PyObject
 
+from src.functions.defaults import DEFAULT_BATCH_SIZES
+
 
 class TrainConfig(BaseModel):
     source_url: str
@@ -9,6 +11,18 @@ class TrainConfig(BaseModel):
     allow_validation_failure: bool
     ohe_columns: list
     test_size: float
+    export_compact_model: bool
+    search_engine: str
+    ingest_chunk_size: int
+    process_chunk_size: int
+    validation_backend: str
+    combined_validation: bool
+    validation_workers: int
+    validation_sample_rows: int
+    profile_batch_sizes: list
+    step_cache_dir: str
+    step_cache_max_mb: float
+    step_cache_max_age_days: float
 
 
 class DeployConfig(BaseModel):
@@ -16,6 +30,22 @@ class DeployConfig(BaseModel):
     champion_model_tag: str
     label_column: str
     deploy_model_name: str
+    fused_serving: bool
+    perf_requests: int
+    perf_concurrency: int
+    perf_target_rps: float
+    max_p99_latency_ms: float
+    min_throughput_rps: float
+    max_error_rate: float
+    max_latency_regression: float
+    max_throughput_regression: float
+    shadow_source_url: str
+    shadow_chunk_size: int
+    serving_batch_max_size: int
+    serving_batch_window_ms: float
+    model_cache_dir: str
+    model_cache_max_mb: float
+    model_prefetch: bool
 
 
 class AppConfig(BaseSettings):
@@ -26,6 +56,7 @@ class AppConfig(BaseSettings):
     git_branch: str = "master"
     secrets_file: str = "secrets.env"
     artifact_path: str = "s3://iguazio-demo/projects/{{run.project}}/artifacts"
+    incremental_setup: bool = True
 
     # CI/CD environments
     environments: List[str] = ["development", "staging", "master"]
@@ -41,9 +72,43 @@ class AppConfig(BaseSettings):
     allow_validation_failure: bool = True
     ohe_columns: List[str] = ["sex", "cp", "slope", "thal", "restecg"]
     test_size: float = 0.2
+    export_compact_model: bool = False
+    search_engine: str = "random"
+    ingest_chunk_size: int = 0
+    process_chunk_size: int = 0
+    validation_backend: str = "pandera"
+    combined_validation: bool = False
+    validation_workers: int = 1
+    validation_sample_rows: int = 0
+    profile_batch_sizes: List[int] = list(DEFAULT_BATCH_SIZES)
+    step_cache_dir: str = ""
+    step_cache_max_mb: float = 10240
+    step_cache_max_age_days: float = 0
     deploy_model_name: str = "model"
     deploy_condition_metric: str = "evaluation_accuracy"
     force_deploy: bool = False
+    fused_serving: bool = False
+
+    # Performance gate - thresholds and allowed regression from the champion
+    perf_requests: int = 1000
+    perf_concurrency: int = 16
+    perf_target_rps: float = 0
+    max_p99_latency_ms: float = 500
+    min_throughput_rps: float = 10
+    max_error_rate: float = 0.0
+    max_latency_regression: float = 0.2
+    max_throughput_regression: float = 0.2
+
+    # Shadow evaluation - large labeled raw dataset to compare models on, if any
+    shadow_source_url: str = ""
+    shadow_chunk_size: int = 100_000
+
+    # Model server - micro-batching, local model file cache and background load
+    serving_batch_max_size: int = 0
+    serving_batch_window_ms: float = 5.0
+    model_cache_dir: str = ""
+    model_cache_max_mb: float = 1024
+    model_prefetch: bool = False
 
     # Workflow config schemas
     workflows: Dict[str, PyObject] = {"train": TrainConfig, "deploy": DeployConfig}
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import re
+import stat
+import tempfile
+import zipfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+from project_fingerprint import repo_files
+
+# Fixed entry timestamp, so the same files always make the same archive
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def read_manifest(path: str) -> list:
+    """Patterns of an archive manifest, without comments and blank lines."""
+    with open(path) as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def pattern_regex(pattern: str) -> re.Pattern:
+    """
+    Regex of a manifest pattern, anchored at the project root. "*" and "?"
+    do not match "/", while "**" matches across directories.
+    """
+    regex = ""
+    for part in re.split(r"(\*\*/|\*\*|\*|\?)", pattern):
+        if part == "**/":
+            regex += "(?:.*/)?"
+        elif part == "**":
+            regex += ".*"
+        elif part == "*":
+            regex += "[^/]*"
+        elif part == "?":
+            regex += "[^/]"
+        else:
+            regex += re.escape(part)
+    return re.compile(regex)
+
+
+def select_files(files: list, patterns: list) -> list:
+    """
+    Sorted files matching the manifest patterns. Patterns starting with "!"
+    exclude files, and the last pattern a file matches decides.
+    """
+    rules = [
+        (pattern.startswith("!"), pattern_regex(pattern.lstrip("!")))
+        for pattern in patterns
+    ]
+    selected = []
+    for path in files:
+        path = Path(path).as_posix()
+        included = False
+        for exclude, regex in rules:
+            if regex.fullmatch(path):
+                included = not exclude
+        if included:
+            selected.append(path)
+    return sorted(selected)
+
+
+def archive_files(root: str, manifest_path: str) -> list:
+    return select_files(repo_files(root), read_manifest(manifest_path))
+
+
+def build_archive(root: str, files: list, target_path: str) -> str:
+    """
+    Write files under root to a zip at target_path and return its sha256.
+    Entries are sorted and carry fixed timestamps and permissions, so the
+    archive (and its hash) only changes when the file contents change.
+    """
+    with zipfile.ZipFile(target_path, "w") as zipf:
+        for path in sorted(files):
+            full_path = Path(root) / path
+            info = zipfile.ZipInfo(path, date_time=ZIP_DATE_TIME)
+            executable = full_path.stat().st_mode & stat.S_IXUSR
+            info.external_attr = (0o100755 if executable else 0o100644) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zipf.writestr(info, full_path.read_bytes(), compresslevel=6)
+    digest = hashlib.sha256()
+    with open(target_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remote_hash(target_url: str):
+    """Hash stored next to the remote archive, or None if there is none."""
+    import mlrun
+
+    try:
+        return mlrun.get_dataitem(f"{target_url}.sha256").get(encoding="utf-8")
+    except Exception:
+        # Missing objects raise different errors per datastore
+        return None
+
+
+def upload_archive(
+    archive_path: str, target_url: str, chunk_size_mb: int = 25, max_workers: int = 8
+):
+    """
+    Upload the archive to target_url. S3 targets are uploaded as a multipart
+    upload of chunk_size_mb parts, max_workers at a time. Other datastores
+    (e.g. v3io, which only supports appending) use their own upload.
+    """
+    import mlrun
+
+    data_item = mlrun.get_dataitem(target_url)
+    if data_item.kind == "s3":
+        from boto3.s3.transfer import TransferConfig
+
+        chunk_size = chunk_size_mb * 1024 * 1024
+        config = TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=max_workers,
+        )
+        bucket, key = data_item.store.get_bucket_and_key(urlparse(target_url).path)
+        data_item.store.s3.Bucket(bucket).upload_file(archive_path, key, Config=config)
+    else:
+        data_item.upload(archive_path)
+
+
+def export_archive(
+    project,
+    target_url: str,
+    manifest_path: str = "archive.manifest",
+    chunk_size_mb: int = 25,
+    max_workers: int = 8,
+) -> bool:
+    """
+    Export the project yaml and pack the project files selected by the
+    manifest into a deterministic zip. The zip is uploaded to target_url
+    unless the hash stored with the remote archive matches. Returns whether
+    it was uploaded.
+    """
+    root = project.context or "."
+    # Write project.yaml to the context so it is packed with the code
+    project.export()
+    files = archive_files(root, os.path.join(root, manifest_path))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_path = f"{tmp_dir}/{Path(urlparse(target_url).path).name}"
+        content_hash = build_archive(root, files, archive_path)
+        size_mb = os.path.getsize(archive_path) / 1024 / 1024
+
+        if remote_hash(target_url) == content_hash:
+            print(f"Archive {target_url} is up to date, skipping upload")
+            return False
+
+        print(f"Uploading {len(files)} files ({size_mb:.1f}MB) to {target_url}...")
+        upload_archive(archive_path, target_url, chunk_size_mb, max_workers)
+
+    # Written last, so a failed upload is never taken as up to date
+    import mlrun
+
+    mlrun.get_dataitem(f"{target_url}.sha256").put(content_hash)
+    return True
@@ -1,10 +1,17 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from typing import Callable
+
 import click
-from mlrun.datastore import StoreManager
 
 from config import AppConfig
 
+# Settings only - MLRun is imported once a command actually runs
 config = AppConfig()
 
+STORE_MODELS_PREFIX = "store://models/"
+
 
 def prompt_user(model_uri: str, challenger_model_tag: str) -> bool:
     while True:
@@ -23,12 +30,111 @@ def prompt_user(model_uri: str, challenger_model_tag: str) -> bool:
             print("Invalid input. Please enter 'yes' or 'no'.")
 
 
+def is_pattern(model_uri: str) -> bool:
+    return any(c in model_uri for c in "*?[")
+
+
+def expand_model_uris(
+    model_uris: list,
+    model_tags: list,
+    list_models: Callable[[str, str], dict],
+    project_name: str,
+) -> list:
+    """
+    (requested, store URI) pairs for every model to export. Model URIs may
+    glob the model key, e.g. store://models/<project>/model-*:latest (any
+    #iter and @tree suffix is ignored), and tags select all models of the
+    project with that tag. list_models returns {key: store URI} of the
+    models of a project with a tag.
+    """
+    expanded = []
+    for model_uri in model_uris:
+        if not model_uri.startswith("store://"):
+            raise ValueError("Must be MLRun store URL with 'store://' prefix")
+        if not is_pattern(model_uri):
+            expanded.append((model_uri, model_uri))
+            continue
+        if not model_uri.startswith(STORE_MODELS_PREFIX):
+            raise ValueError(
+                f"Model URI patterns must start with {STORE_MODELS_PREFIX}"
+            )
+        project, _, key_pattern = model_uri[len(STORE_MODELS_PREFIX) :].partition("/")
+        key_pattern, _, tag = key_pattern.split("@")[0].partition(":")
+        key_pattern = key_pattern.split("#")[0]
+        models = list_models(project, tag or "latest")
+        matches = [
+            uri for key, uri in sorted(models.items()) if fnmatch(key, key_pattern)
+        ]
+        if not matches:
+            raise ValueError(f"No models match {model_uri}")
+        expanded.extend((model_uri, uri) for uri in matches)
+    for tag in model_tags:
+        models = list_models(project_name, tag)
+        if not models:
+            raise ValueError(f"No models with tag '{tag}' in project {project_name}")
+        expanded.extend((tag, uri) for _, uri in sorted(models.items()))
+
+    # Identical URIs are only confirmed once - the same model under different
+    # URIs is dropped by unique_artifacts once resolved
+    unique = {}
+    for requested, uri in expanded:
+        unique.setdefault(uri, requested)
+    return [(requested, uri) for uri, requested in unique.items()]
+
+
+def unique_artifacts(model_artifacts: list) -> list:
+    """
+    Model artifacts without repeats of the same model version, e.g. one
+    requested by URI and again by tag. Raises if different versions of a
+    model would be exported under the same key.
+    """
+    unique = {}
+    for model_artifact in model_artifacts:
+        metadata = model_artifact.metadata
+        unique.setdefault((metadata.key, metadata.tree or metadata.uid), model_artifact)
+    keys = [key for key, _ in unique]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicates:
+        raise ValueError(f"More than one model to export as {duplicates}")
+    return list(unique.values())
+
+
+def read_confirm_file(path: str) -> set:
+    """Model URIs, URI patterns or tags approved for export, one per line."""
+    with open(path) as f:
+        lines = [line.strip() for line in f]
+    return {line for line in lines if line and not line.startswith("#")}
+
+
+def set_artifact_block(exports: list, challenger_model_tag: str) -> str:
+    """
+    Fingerprinted set_artifact calls for project_setup.py from (key, target
+    path) pairs.
+    """
+    return "\n".join(
+        f"""fingerprints.run(
+    "artifact:{key}",
+    lambda: project.set_artifact(
+        key="{key}", artifact="{target_path}", tag="{challenger_model_tag}"
+    ),
+    files=["{target_path}"],
+)"""
+        for key, target_path in exports
+    )
+
+
 @click.command()
 @click.option(
     "--model-uri",
     type=str,
-    required=True,
-    help="Specify the model URI.",
+    multiple=True,
+    help="Specify the model URI, or a glob of model URIs - can be repeated.",
+)
+@click.option(
+    "--model-tag",
+    type=str,
+    multiple=True,
+    help="Export all project models with this tag - can be repeated.",
 )
 @click.option(
     "--challenger-model-tag",
@@ -44,34 +150,89 @@ def prompt_user(model_uri: str, challenger_model_tag: str) -> bool:
     help="Specify the export path for the model YAML.",
     default=config.yaml_export_dir,
 )
+@click.option(
+    "--confirm-file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File listing the model URIs, patterns or tags approved for export, "
+    "instead of prompting.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=8,
+    help="Number of models to resolve and export concurrently.",
+)
 def export_challenger_model(
-    model_uri: str, challenger_model_tag: str, yaml_export_dir: str
+    model_uri: tuple,
+    model_tag: tuple,
+    challenger_model_tag: str,
+    yaml_export_dir: str,
+    confirm_file: str,
+    workers: int,
 ):
-    # Validate model uri
-    if not model_uri.startswith("store://"):
-        raise ValueError("Must be MLRun store URL with 'store://' prefix")
+    if not model_uri and not model_tag:
+        raise click.UsageError("Specify at least one --model-uri or --model-tag")
 
-    # Prompt by confirmation
-    if not prompt_user(model_uri=model_uri, challenger_model_tag=challenger_model_tag):
-        raise ValueError("Model export cancelled")
+    import mlrun
+    from mlrun.datastore import StoreManager
 
-    # Get model artifact
-    store_manager = StoreManager()
-    model_artifact, *_ = store_manager.get_store_artifact(url=model_uri)
+    def list_models(project: str, tag: str) -> dict:
+        artifacts = mlrun.get_run_db().list_artifacts(
+            project=project, tag=tag, category="model"
+        )
+        return {
+            artifact.metadata.key: artifact.uri for artifact in artifacts.to_objects()
+        }
 
-    # Export given model URI to YAML
-    target_path = (
-        f"{yaml_export_dir}/{model_artifact.metadata.key}:{challenger_model_tag}.yaml"
+    # Validate model uris and expand patterns and tags
+    requested = expand_model_uris(
+        model_uri, model_tag, list_models, project_name=config.project_name
     )
-    print(f"Exporting model to {target_path}...")
-    model_artifact.export(target_path=target_path)
 
-    # Print out command to add to project_setup.py with challenger tag
+    # Confirm by file, or else prompt for every model
+    if confirm_file:
+        confirmed = read_confirm_file(confirm_file)
+        unconfirmed = [uri for spec, uri in requested if not {spec, uri} & confirmed]
+        if unconfirmed:
+            raise ValueError(
+                f"Model export not confirmed in {confirm_file}: {unconfirmed}"
+            )
+    else:
+        for _, uri in requested:
+            if not prompt_user(
+                model_uri=uri, challenger_model_tag=challenger_model_tag
+            ):
+                raise ValueError("Model export cancelled")
+
+    # Get model artifacts, sharing one store manager
+    store_manager = StoreManager()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        model_artifacts = list(
+            pool.map(
+                lambda uri: store_manager.get_store_artifact(url=uri)[0],
+                [uri for _, uri in requested],
+            )
+        )
+    model_artifacts = unique_artifacts(model_artifacts)
+
+    # Export given model URIs to YAML
+    os.makedirs(yaml_export_dir, exist_ok=True)
+
+    def export(model_artifact) -> tuple:
+        key = model_artifact.metadata.key
+        target_path = f"{yaml_export_dir}/{key}:{challenger_model_tag}.yaml"
+        print(f"Exporting model to {target_path}...")
+        model_artifact.export(target_path=target_path)
+        return key, target_path
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        exports = list(pool.map(export, model_artifacts))
+
+    # Print out commands to add to project_setup.py with challenger tag
     print(
-        f"""\nAdd the following to the `project_setup.py` script:\n
-project.set_artifact(
-    key="{model_artifact.metadata.key}", artifact="{target_path}", tag="{challenger_model_tag}"
-)"""
+        "\nAdd the following to the `project_setup.py` script:\n\n"
+        + set_artifact_block(exports, challenger_model_tag)
     )
 
 
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+# File in the project context the setup fingerprints are saved to
+FINGERPRINTS_FILE = ".setup-fingerprints.json"
+
+
+def hash_files(paths: Iterable[str], root: str = ".") -> str:
+    """Hash of the relative paths and contents of the files that exist."""
+    digest = hashlib.sha256()
+    for path in sorted(set(paths)):
+        full_path = Path(root) / path
+        if not full_path.is_file():
+            continue
+        digest.update(str(path).encode())
+        digest.update(hashlib.sha256(full_path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def repo_files(root: str = ".") -> list:
+    """Files under root, without hidden directories, byte code and fingerprints."""
+    files = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [
+            d for d in dir_names if not d.startswith(".") and d != "__pycache__"
+        ]
+        files.extend(
+            os.path.relpath(os.path.join(dir_path, f), root)
+            for f in file_names
+            if not f.endswith((".pyc", ".pyo")) and f != FINGERPRINTS_FILE
+        )
+    return files
+
+
+def guard_hash(guard_files: Iterable[str], guard_value, root: str = ".") -> str:
+    """Hash of the guard files and the guard value, e.g. the target project."""
+    return hashlib.sha256(
+        hash_files(guard_files, root).encode()
+        + json.dumps(guard_value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class SetupFingerprints:
+    """
+    Fingerprints of the parts of a project setup, e.g. a function
+    registration or the archive export. run() only runs a part when its
+    files or value changed since the previous fingerprints, and remembers
+    how long every part took to report the time saved by skipping it.
+    """
+
+    def __init__(self, previous: dict = None, root: str = "."):
+        self.previous = previous or {}
+        self.current = {}
+        self.root = root
+        self.ran = []
+        self.skipped = []
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        root: str = ".",
+        guard_files: Iterable[str] = (),
+        guard_value=None,
+    ):
+        """
+        Fingerprints saved to path, or none if there are none, the guard
+        files (e.g. the project yaml) changed or they were saved with another
+        guard value (e.g. for another project or MLRun DB).
+        """
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(root=root)
+        if saved.get("guard") != guard_hash(guard_files, guard_value, root):
+            return cls(root=root)
+        return cls(saved.get("parts"), root=root)
+
+    def save(self, path: str, guard_files: Iterable[str] = (), guard_value=None):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "guard": guard_hash(guard_files, guard_value, self.root),
+                    "parts": self.current,
+                },
+                f,
+                indent=2,
+            )
+
+    def run(self, part: str, fn: Callable, files: Iterable[str] = (), value=None):
+        fingerprint = hashlib.sha256(
+            hash_files(files, self.root).encode()
+            + json.dumps(value, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        previous = self.previous.get(part, {})
+        if previous.get("hash") == fingerprint:
+            self.current[part] = previous
+            self.skipped.append(part)
+            return None
+
+        start = time.perf_counter()
+        result = fn()
+        self.ran.append(part)
+        self.current[part] = {
+            "hash": fingerprint,
+            "seconds": time.perf_counter() - start,
+        }
+        return result
+
+    def summary(self) -> str:
+        saved = sum(self.current[part]["seconds"] for part in self.skipped)
+        if not self.skipped:
+            return "Setup fingerprints: nothing skipped"
+        return (
+            f"Setup fingerprints: skipped {len(self.skipped)} unchanged parts "
+            f"({', '.join(self.skipped)}), saving about {saved:.1f}s"
+        )
@@ -1,8 +1,8 @@
 import click
-import mlrun
 
 from config import AppConfig
 
+# Settings only - MLRun is imported once a command actually runs
 config = AppConfig()
 
 
@@ -36,6 +36,8 @@ config = AppConfig()
 def main(
     workflow_name: str, source: str, branch: str, single_cluster_mode: bool
 ) -> None:
+    import mlrun
+
     global config
 
     # Set source - git or archive
@@ -55,6 +57,7 @@ def main(
             "source": project_source,
             "artifact_path": config.artifact_path,
             "force_build": False,
+            "incremental_setup": config.incremental_setup,
         },
     )
 
@@ -3,6 +3,9 @@ from pathlib import Path
 
 import mlrun
 
+from project_archive import archive_files, export_archive
+from project_fingerprint import FINGERPRINTS_FILE, SetupFingerprints
+
 
 def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
     source = project.get_param("source")
@@ -14,10 +17,34 @@ def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
     artifact_path = project.get_param("artifact_path")
     secrets_file = project.get_param("secrets_file")
     force_build = project.get_param("force_build", False)
+    incremental_setup = project.get_param("incremental_setup", False)
+    archive_manifest = project.get_param("archive_manifest", "archive.manifest")
+    archive_upload_workers = project.get_param("archive_upload_workers", 8)
+    archive_chunk_size_mb = project.get_param("archive_chunk_size_mb", 25)
+
+    # Incremental setup - only redo the parts whose files or settings changed.
+    # Secrets and artifacts live on the server, so fingerprints only apply to
+    # the project and MLRun DB they were recorded against
+    context = project.context or "."
+    fingerprints_file = f"{context}/{FINGERPRINTS_FILE}"
+    fingerprints_guard = {
+        "guard_files": ["project.yaml"],
+        "guard_value": [project.metadata.name, mlrun.mlconf.dbpath],
+    }
+    if incremental_setup:
+        fingerprints = SetupFingerprints.load(
+            fingerprints_file, root=context, **fingerprints_guard
+        )
+    else:
+        fingerprints = SetupFingerprints(root=context)
 
     # Set MLRun project secrets via secrets file
     if secrets_file and os.path.exists(secrets_file):
-        project.set_secrets(file_path=secrets_file)
+        fingerprints.run(
+            "secrets",
+            lambda: project.set_secrets(file_path=secrets_file),
+            files=[secrets_file],
+        )
         mlrun.set_env_from_file(secrets_file)
 
     # Set artifact path
@@ -25,18 +52,30 @@ def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
         project.artifact_path = artifact_path
 
     # Load artifacts
-    project.register_artifacts()
+    fingerprints.run(
+        "artifacts",
+        project.register_artifacts,
+        files=[
+            str(path.relative_to(context))
+            for path in Path(context).glob("artifacts/*.yaml")
+        ],
+        value=project.spec.artifacts,
+    )
 
     # Set default project docker image - functions that do not specify image will use this
     if default_base_image and image_requirements_file and force_build:
         requirements = Path(image_requirements_file).read_text().split()
         command = f'pip install {" ".join(requirements)}'
-        project.build_image(
-            base_image=default_base_image,
-            commands=[command],
-            set_as_default=True,
-            overwrite_build_params=True,
-            with_mlrun=False,
+        fingerprints.run(
+            "image",
+            lambda: project.build_image(
+                base_image=default_base_image,
+                commands=[command],
+                set_as_default=True,
+                overwrite_build_params=True,
+                with_mlrun=False,
+            ),
+            value=[default_base_image, command],
         )
     if project.default_image is None and default_image:
         project.set_default_image(default_image)
@@ -47,51 +86,109 @@ def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
         project.set_source(source, pull_at_runtime=True)
 
         if ".zip" in source:
-            print(f"Exporting project as zip archive to {source}...")
-            project.export(source)
+
+            def export():
+                print(f"Exporting project as zip archive to {source}...")
+                export_archive(
+                    project,
+                    source,
+                    manifest_path=archive_manifest,
+                    chunk_size_mb=archive_chunk_size_mb,
+                    max_workers=archive_upload_workers,
+                )
+
+            fingerprints.run(
+                "archive",
+                export,
+                files=[archive_manifest]
+                + archive_files(context, f"{context}/{archive_manifest}"),
+                value=source,
+            )
+
+    def set_function(name: str, func: str, **kwargs):
+        local_files = [] if func.startswith("hub://") else [func]
+        requirements_file = kwargs.get("requirements_file")
+        fingerprints.run(
+            f"function:{name}",
+            lambda: project.set_function(name=name, func=func, **kwargs),
+            files=local_files + ([requirements_file] if requirements_file else []),
+            value=kwargs,
+        )
 
     # Set MLRun functions
-    project.set_function(
-        name="data", func="src/functions/data.py", kind="job", with_repo=True
-    )
-    project.set_function(
+    set_function(name="data", func="src/functions/data.py", kind="job", with_repo=True)
+    set_function(
         name="describe",
         func="hub://describe",
         kind="job",
         handler="analyze",
     )
-    project.set_function(
+    set_function(
         name="train",
         func="src/functions/train.py",
         kind="job",
         handler="train_model",
         image=default_base_image,
+        with_repo=True,
     )
-    project.set_function(
+    set_function(
         name="validate",
         func="src/functions/validate.py",
         kind="job",
+        with_repo=True,
+    )
+    set_function(
+        name="profile",
+        func="src/functions/model_profile.py",
+        kind="job",
+        handler="record_model_profile",
+        with_repo=True,
     )
-    project.set_function(
+    set_function(
         name="test",
         func="src/functions/test_classifier.py",
         kind="job",
         handler="test_classifier",
+        with_repo=True,
     )
-    project.set_function(
+    set_function(
         name="serving",
-        func="hub://v2_model_server",
+        func="src/functions/serve.py",
+        kind="serving",
+        image=default_base_image,
+        requirements_file=image_requirements_file,
+        with_repo=True,
+    )
+    set_function(
+        name="serving-fused",
+        func="src/functions/serve.py",
         kind="serving",
         image=default_base_image,
         requirements_file=image_requirements_file,
+        with_repo=True,
     )
-    project.set_function(
+    set_function(
         name="model-server-tester",
         func="src/functions/v2_model_tester.py",
         kind="job",
         handler="model_server_tester",
+        with_repo=True,
     )
-    project.set_function(
+    set_function(
+        name="performance-gate",
+        func="src/functions/performance_gate.py",
+        kind="job",
+        handler="performance_gate",
+        with_repo=True,
+    )
+    set_function(
+        name="shadow-evaluation",
+        func="src/functions/shadow_evaluation.py",
+        kind="job",
+        handler="shadow_evaluation",
+        with_repo=True,
+    )
+    set_function(
         name="get-model-uri",
         func="src/functions/get_model_uri.py",
         kind="job",
@@ -99,16 +196,36 @@ def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
     )
 
     # Set MLRun workflows
-    project.set_workflow(name="train", workflow_path="src/workflows/train_workflow.py")
-    project.set_workflow(
-        name="deploy", workflow_path="src/workflows/deploy_workflow.py"
-    )
+    for name, workflow_path in [
+        ("train", "src/workflows/train_workflow.py"),
+        ("deploy", "src/workflows/deploy_workflow.py"),
+    ]:
+        fingerprints.run(
+            f"workflow:{name}",
+            lambda: project.set_workflow(name=name, workflow_path=workflow_path),
+            files=[workflow_path],
+        )
 
     # Set artifacts
-    project.set_artifact(
-        key="model", artifact="artifacts/model:challenger.yaml", tag="challenger"
+    fingerprints.run(
+        "artifact:model",
+        lambda: project.set_artifact(
+            key="model", artifact="artifacts/model:challenger.yaml", tag="challenger"
+        ),
+        files=["artifacts/model:challenger.yaml"],
     )
 
-    # Save and return the project:
-    project.save()
+    # Save and return the project - unless it matches the project yaml saved
+    # for this project and MLRun DB
+    project_file = Path(context) / "project.yaml"
+    saved_yaml = project_file.read_text() if project_file.is_file() else None
+    if (
+        not incremental_setup
+        or not fingerprints.previous
+        or project.to_yaml() != saved_yaml
+    ):
+        project.save()
+    if incremental_setup:
+        fingerprints.save(fingerprints_file, **fingerprints_guard)
+        print(fingerprints.summary())
     return project
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Collect rows from concurrent callers into a single predict call. A batch
+    is flushed when it holds max_batch_size rows or when its oldest request
+    has waited window_ms, whichever comes first. Each caller receives the
+    slice of the batch result that corresponds to its own rows.
+
+    Only requests that arrive while the batcher is busy (a batch in flight
+    or other requests pending) wait for the window. A lone request, e.g. in
+    a worker that handles one event at a time, is predicted right away.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 64,
+        window_ms: float = 5.0,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._pending = deque()
+        self._pending_rows = 0
+        self._in_flight = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, feats: np.ndarray) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            busy = self._in_flight or bool(self._pending)
+            self._pending.append((time.monotonic(), feats, future, busy))
+            self._pending_rows += len(feats)
+            self._cond.notify()
+        return future
+
+    def predict(self, feats: np.ndarray) -> np.ndarray:
+        return self.submit(feats).result()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+
+    def _next_batch(self) -> list:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+
+            # Under load, wait for more rows until the batch is full or the oldest
+            # request expires
+            if self._pending and self._pending[0][3]:
+                deadline = self._pending[0][0] + self.window
+                while self._pending_rows < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            # A single request larger than max_batch_size is still served whole
+            batch, rows = [], 0
+            while self._pending:
+                n_rows = len(self._pending[0][1])
+                if batch and rows + n_rows > self.max_batch_size:
+                    break
+                _, feats, future, _ = self._pending.popleft()
+                batch.append((feats, future))
+                rows += n_rows
+            self._pending_rows -= rows
+            self._in_flight = bool(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            result = error = None
+            try:
+                result = np.asarray(
+                    self.predict_fn(np.concatenate([f for f, _ in batch]))
+                )
+            except Exception as exc:
+                error = exc
+
+            # Idle again before callers are answered, so their next request
+            # does not wait for the window
+            with self._cond:
+                self._in_flight = False
+
+            start = 0
+            for feats, future in batch:
+                if error is not None:
+                    future.set_exception(error)
+                    continue
+                future.set_result(result[start : start + len(feats)])
+                start += len(feats)
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pandera as pa
+from pandera.errors import SchemaError, SchemaErrorReason, SchemaErrors
+
+
+def _range_mask(values: np.ndarray, stats: dict) -> np.ndarray:
+    lower = (
+        values >= stats["min_value"]
+        if stats.get("include_min", True)
+        else values > stats["min_value"]
+    )
+    upper = (
+        values <= stats["max_value"]
+        if stats.get("include_max", True)
+        else values < stats["max_value"]
+    )
+    return lower & upper
+
+
+# Vectorized equivalents of pandera builtin checks, returning a passing mask
+CHECKS = {
+    "in_range": _range_mask,
+    "greater_than": lambda v, s: v > s["min_value"],
+    "greater_than_or_equal_to": lambda v, s: v >= s["min_value"],
+    "less_than": lambda v, s: v < s["max_value"],
+    "less_than_or_equal_to": lambda v, s: v <= s["max_value"],
+    "equal_to": lambda v, s: v == s["value"],
+    "not_equal_to": lambda v, s: v != s["value"],
+    "isin": lambda v, s: np.isin(v, list(s["allowed_values"])),
+    "notin": lambda v, s: ~np.isin(v, list(s["forbidden_values"])),
+}
+
+
+def _failure_cases(index: np.ndarray, values) -> pd.DataFrame:
+    return pd.DataFrame({"index": index, "failure_case": values})
+
+
+class ColumnarValidator:
+    """
+    Validation backend that compiles a pandera DataFrameSchema once into
+    vectorized NumPy dtype, nullability and builtin range checks. validate
+    raises the same SchemaErrors as pandera lazy mode, so the failure_cases
+    report has the same structure.
+    """
+
+    def __init__(self, schema: pa.DataFrameSchema):
+        if schema.strict or schema.coerce or schema.unique or schema.checks:
+            raise ValueError("Only column dtype, nullable and builtin checks compile")
+
+        self.schema = schema
+        self.columns = []
+        for name, column in schema.columns.items():
+            if column.coerce or column.unique or column.regex:
+                raise ValueError(f"Cannot compile options of column '{name}'")
+            checks = []
+            for check_index, check in enumerate(column.checks):
+                if check.name not in CHECKS:
+                    raise ValueError(f"Cannot compile check {check} of column '{name}'")
+                checks.append((check_index, check, CHECKS[check.name]))
+            self.columns.append((name, column, str(column.dtype), checks))
+
+    def validate(self, df: pd.DataFrame, lazy: bool = True) -> pd.DataFrame:
+        errors = []
+        for name, column, dtype, checks in self.columns:
+            if name not in df.columns:
+                if column.required:
+                    errors.append(
+                        SchemaError(
+                            schema=self.schema,
+                            data=df,
+                            message=f"column '{name}' not in dataframe",
+                            failure_cases=_failure_cases([None], [name]),
+                            check="column_in_dataframe",
+                            reason_code=SchemaErrorReason.COLUMN_NOT_IN_DATAFRAME,
+                        )
+                    )
+                continue
+            errors.extend(self._validate_column(df[name], column, dtype, checks))
+
+        if errors:
+            if not lazy:
+                raise errors[0]
+            raise SchemaErrors(schema=self.schema, schema_errors=errors, data=df)
+        return df
+
+    def _validate_column(self, series, column, dtype, checks) -> list:
+        errors = []
+        values = series.to_numpy()
+        index = series.index.to_numpy()
+        is_null = pd.isna(values)
+        has_nulls = is_null.any()
+
+        if has_nulls and not column.nullable:
+            errors.append(
+                SchemaError(
+                    schema=column,
+                    data=series,
+                    message=f"non-nullable series '{series.name}' contains null values",
+                    failure_cases=_failure_cases(index[is_null], values[is_null]),
+                    check="not_nullable",
+                    reason_code=SchemaErrorReason.SERIES_CONTAINS_NULLS,
+                )
+            )
+
+        # Strings are checked per element, other types by the series dtype
+        if dtype == "str":
+            is_str = values.dtype == object and (
+                pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+            )
+            if not is_str:
+                wrong = ~is_null & ~np.array([isinstance(v, str) for v in values])
+                errors.append(
+                    SchemaError(
+                        schema=column,
+                        data=series,
+                        message=f"expected series '{series.name}' to have type str",
+                        failure_cases=_failure_cases(index[wrong], values[wrong]),
+                        check=f"dtype('{dtype}')",
+                        reason_code=SchemaErrorReason.WRONG_DATATYPE,
+                    )
+                )
+        elif str(series.dtype) != dtype:
+            errors.append(
+                SchemaError(
+                    schema=column,
+                    data=series,
+                    message=f"expected series '{series.name}' to have type {dtype}, "
+                    f"got {series.dtype}",
+                    failure_cases=_failure_cases([None], [str(series.dtype)]),
+                    check=f"dtype('{dtype}')",
+                    reason_code=SchemaErrorReason.WRONG_DATATYPE,
+                )
+            )
+
+        # Builtin checks ignore nulls, like pandera
+        checked = values[~is_null] if has_nulls else values
+        checked_index = index[~is_null] if has_nulls else index
+        for check_index, check, passes in checks:
+            # Values of the wrong dtype (e.g. strings in an object column) may
+            # not compare with the check's bounds - report it like pandera does
+            try:
+                failed = ~passes(checked, check.statistics)
+            except TypeError as err:
+                msg = f'{err.__class__.__name__}("{err}")'
+                errors.append(
+                    SchemaError(
+                        schema=column,
+                        data=series,
+                        message=msg,
+                        failure_cases=_failure_cases([None], [msg]),
+                        check=check,
+                        check_index=check_index,
+                        reason_code=SchemaErrorReason.CHECK_ERROR,
+                    )
+                )
+                continue
+            if failed.any():
+                errors.append(
+                    SchemaError(
+                        schema=column,
+                        data=series,
+                        message=f"Column '{series.name}' failed element-wise validator "
+                        f"number {check_index}: {check}",
+                        failure_cases=_failure_cases(
+                            checked_index[failed], checked[failed]
+                        ),
+                        check=check,
+                        check_index=check_index,
+                        reason_code=SchemaErrorReason.DATAFRAME_CHECK,
+                    )
+                )
+        return errors
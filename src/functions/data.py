@@ -1,25 +1,66 @@
+import tempfile
+
+import cloudpickle
 import mlrun
+import numpy as np
 import pandas as pd
-import pandera as pa
-from pandera.typing import DataFrame
 from sklearn.compose import make_column_transformer
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import OneHotEncoder
 
+from src.functions.columnar_validation import ColumnarValidator
 from src.functions.models import HeartSchema
+from src.functions.preprocessing import CompiledPreprocessor
+from src.functions.step_cache import memoize_step, workflow_step_cache
+from src.functions.streaming import (
+    ParquetChunkWriter,
+    fit_vocabularies,
+    read_chunks,
+    read_dtypes,
+    split_chunks,
+    validate_to_parquet,
+)
+
+
+@mlrun.handler()
+@memoize_step(workflow_step_cache)
+def get_data_chunked(
+    context: mlrun.MLClientCtx,
+    data: mlrun.DataItem,
+    chunk_size: int = 0,
+    validation_backend: str = "pandera",
+):
+    # Validate the source in bounded row batches and write them straight to parquet
+    schema = HeartSchema.to_schema()
+    output_path = f"{tempfile.mkdtemp()}/data.parquet"
+    rows = validate_to_parquet(
+        chunks=read_chunks(data.local(), chunk_size, dtype=read_dtypes(schema)),
+        schema=schema,
+        output_path=output_path,
+        validator=(
+            ColumnarValidator(schema) if validation_backend == "columnar" else None
+        ),
+    )
 
+    context.log_result("rows", rows)
+    context.log_artifact("data", local_path=output_path, format="parquet")
 
-@mlrun.handler(outputs=["data"])
-@pa.check_types(lazy=True)
-def get_data(data: pd.DataFrame) -> DataFrame[HeartSchema]:
-    # Alternatively
-    # HeartSchema.validate(data, lazy=True)
-    return data.copy()
+
+def make_preprocessor(ohe_columns: list, categories="auto"):
+    return make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(categories=categories, sparse=False), ohe_columns),
+            remainder="passthrough",
+            verbose_feature_names_out=False,
+        )
+    )
 
 
 @mlrun.handler(outputs=["train", "test", "preprocessor:object"])
+@memoize_step(workflow_step_cache)
 def process_data(
+    context: mlrun.MLClientCtx,
     data: pd.DataFrame,
     label_column: str,
     test_size: float,
@@ -28,23 +69,79 @@ def process_data(
 ):
     train, test = train_test_split(data, test_size=test_size, random_state=random_state)
 
+    preprocessor = make_preprocessor(ohe_columns if ohe_columns else [])
+    preprocessor.fit(train)
+
+    # Sklearn pipeline outputs numpy array - convert back to dataframe
+    feature_names = preprocessor.get_feature_names_out()
+    train = pd.DataFrame(data=preprocessor.transform(train), columns=feature_names)
+    test = pd.DataFrame(data=preprocessor.transform(test), columns=feature_names)
+
+    return train, test, preprocessor
+
+
+@mlrun.handler()
+def process_data_chunked(
+    context: mlrun.MLClientCtx,
+    data: mlrun.DataItem,
+    label_column: str,
+    test_size: float,
+    ohe_columns: list = None,
+    random_state: int = 42,
+    chunk_size: int = 100_000,
+    encoding: str = "onehot",
+):
+    # Out-of-core process_data - rows are split at random per chunk instead of
+    # with train_test_split, so the split differs from process_data
     ohe_columns = ohe_columns if ohe_columns else []
-    preprocessor = make_pipeline(
-        make_column_transformer(
-            (OneHotEncoder(sparse=False), ohe_columns),
-            remainder="passthrough",
-            verbose_feature_names_out=False,
+    source_path = data.local()
+
+    # Read every chunk with the schema dtypes, so the parquet writers keep one schema
+    dtype = read_dtypes(HeartSchema.to_schema())
+
+    def split():
+        return split_chunks(
+            read_chunks(source_path, chunk_size, dtype=dtype), test_size, random_state
         )
+
+    # Fit category vocabularies on the train rows in one streaming pass
+    vocabularies = fit_vocabularies((train for train, _ in split()), ohe_columns)
+    first_train, _ = next(split())
+    preprocessor = make_preprocessor(
+        ohe_columns, categories=[vocabularies[c] for c in ohe_columns]
+    ).fit(first_train)
+    compiled = CompiledPreprocessor(preprocessor)
+    context.log_artifact(
+        "preprocessor",
+        body=cloudpickle.dumps(preprocessor),
+        local_path="preprocessor.pkl",
     )
 
-    preprocessor.fit(train)
+    # Dense one-hot floats like process_data, or compact integer category codes
+    def encode(chunk: pd.DataFrame) -> pd.DataFrame:
+        if encoding == "codes":
+            return chunk.assign(
+                **{
+                    c: compiled.category_codes(c, chunk[c]).astype(
+                        np.min_scalar_type(len(vocabularies[c]))
+                    )
+                    for c in ohe_columns
+                }
+            )
+        return pd.DataFrame(
+            data=compiled.transform_columns(chunk), columns=compiled.feature_names
+        )
 
-    # Sklearn pipeline outputs numpy array - convert back to dataframe
-    train = pd.DataFrame(
-        data=preprocessor.transform(train), columns=preprocessor.get_feature_names_out()
-    )
-    test = pd.DataFrame(
-        data=preprocessor.transform(test), columns=preprocessor.get_feature_names_out()
-    )
+    # Transform chunk by chunk straight to parquet
+    output_dir = tempfile.mkdtemp()
+    train_writer = ParquetChunkWriter(f"{output_dir}/train.parquet")
+    test_writer = ParquetChunkWriter(f"{output_dir}/test.parquet")
+    with train_writer, test_writer:
+        for train, test in split():
+            train_writer.write(encode(train))
+            test_writer.write(encode(test))
 
-    return train, test, preprocessor
+    context.log_result("train_rows", train_writer.rows)
+    context.log_result("test_rows", test_writer.rows)
+    context.log_artifact("train", local_path=train_writer.path, format="parquet")
+    context.log_artifact("test", local_path=test_writer.path, format="parquet")
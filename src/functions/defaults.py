@@ -0,0 +1,5 @@
+# Defaults shared with config.py, which CLIs import - keep this module free of
+# heavy imports
+
+# Batch sizes the inference cost profile measures throughput at
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1000)
@@ -0,0 +1,154 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from src.functions.resources import available_cpus
+
+# Test matrix and labels memory-mapped once per worker process
+_shared_test = {}
+
+
+def confusion_matrix(y_true, y_pred, classes=None) -> tuple:
+    """
+    Confusion matrix (rows are true, columns predicted classes) from a single
+    bincount over class codes. classes defaults to the sorted labels seen in
+    y_true or y_pred, like sklearn.
+    """
+    y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+    if classes is None:
+        classes = np.union1d(y_true, y_pred)
+    classes = np.asarray(classes)
+    n_classes = len(classes)
+    sorter = np.argsort(classes)
+    true_codes = sorter[np.searchsorted(classes, y_true, sorter=sorter)]
+    pred_codes = sorter[np.searchsorted(classes, y_pred, sorter=sorter)]
+    matrix = np.bincount(
+        true_codes * n_classes + pred_codes, minlength=n_classes * n_classes
+    ).reshape(n_classes, n_classes)
+    return matrix, classes
+
+
+def classification_metrics(matrix: np.ndarray) -> dict:
+    """Accuracy, error and macro averaged f1/precision/recall of a confusion matrix."""
+    # Only classes seen in y_true or y_pred count in the macro average
+    seen = (matrix.sum(axis=0) + matrix.sum(axis=1)) > 0
+    matrix = matrix[seen][:, seen]
+    total = matrix.sum()
+    true_positives = np.diag(matrix).astype(float)
+    predicted = matrix.sum(axis=0)
+    actual = matrix.sum(axis=1)
+
+    # Classes with no predictions (or no samples) score 0, like sklearn
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+        recall = np.where(actual > 0, true_positives / actual, 0.0)
+        f1 = np.where(
+            precision + recall > 0,
+            2 * precision * recall / (precision + recall),
+            0.0,
+        )
+    accuracy = true_positives.sum() / total if total else 0.0
+    return {
+        "accuracy": float(accuracy),
+        "test-error": float(1 - accuracy),
+        "f1": float(f1.mean()),
+        "precision": float(precision.mean()),
+        "recall": float(recall.mean()),
+    }
+
+
+def _binary_roc_auc(is_positive: np.ndarray, scores: np.ndarray) -> float:
+    # Mann-Whitney U statistic, with average ranks for tied scores
+    n_positive = is_positive.sum()
+    n_negative = len(is_positive) - n_positive
+    if not n_positive or not n_negative:
+        return float("nan")
+    ranks = rankdata(scores)
+    u = ranks[is_positive].sum() - n_positive * (n_positive + 1) / 2
+    return float(u / (n_positive * n_negative))
+
+
+def roc_auc(true_codes: np.ndarray, proba: np.ndarray) -> float:
+    """ROC AUC, one-vs-rest macro averaged for more than two classes."""
+    if proba.shape[1] == 2:
+        return _binary_roc_auc(true_codes == 1, proba[:, 1])
+    return float(
+        np.mean(
+            [
+                _binary_roc_auc(true_codes == k, proba[:, k])
+                for k in range(proba.shape[1])
+            ]
+        )
+    )
+
+
+def log_loss(true_codes: np.ndarray, proba: np.ndarray) -> float:
+    """Mean negative log likelihood with sklearn's clipping and renormalization."""
+    eps = np.finfo(proba.dtype).eps
+    proba = np.clip(proba, eps, 1 - eps)
+    proba = proba / proba.sum(axis=1, keepdims=True)
+    return float(-np.mean(np.log(proba[np.arange(len(true_codes)), true_codes])))
+
+
+def evaluate(y_true, y_pred, proba: np.ndarray = None, classes=None) -> dict:
+    """
+    All evaluation metrics from one confusion matrix and, when given,
+    one matrix of predicted probabilities with columns ordered as classes
+    (e.g. model.classes_, defaults to the sorted labels seen).
+    """
+    matrix, seen_classes = confusion_matrix(y_true, y_pred)
+    metrics = classification_metrics(matrix)
+    if proba is not None:
+        classes = np.asarray(seen_classes if classes is None else classes)
+        unknown = ~np.isin(y_true, classes)
+        if unknown.any():
+            raise ValueError(
+                f"Found label {np.asarray(y_true)[unknown][0]!r} not in the model "
+                f"classes {classes.tolist()}"
+            )
+        proba = np.asarray(proba, dtype=float)
+        sorter = np.argsort(classes)
+        true_codes = sorter[np.searchsorted(classes, y_true, sorter=sorter)]
+        metrics["roc_auc"] = roc_auc(true_codes, proba)
+        metrics["log_loss"] = log_loss(true_codes, proba)
+    return metrics
+
+
+def _load_shared_test(data_dir: str, columns: list):
+    X = np.load(f"{data_dir}/X.npy", mmap_mode="r")
+    _shared_test["X"] = pd.DataFrame(X, columns=columns, copy=False)
+    _shared_test["y"] = np.load(f"{data_dir}/y.npy", allow_pickle=True)
+
+
+def _predict_and_evaluate(model_file: str) -> tuple:
+    with open(model_file, "rb") as f:
+        model = cloudpickle.load(f)
+    X, y = _shared_test["X"], _shared_test["y"]
+    ypred = model.predict(X)
+    proba = model.predict_proba(X) if hasattr(model, "predict_proba") else None
+    return ypred, evaluate(y, ypred, proba, classes=getattr(model, "classes_", None))
+
+
+def evaluate_models(model_files: dict, xtest: pd.DataFrame, ytest) -> dict:
+    """
+    Load and evaluate every pickled model in model_files (name -> local
+    path) in its own worker process. Workers memory-map one shared copy of
+    the test matrix. Returns the predictions and metrics per model name.
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        np.save(f"{data_dir}/X.npy", np.ascontiguousarray(xtest.to_numpy()))
+        np.save(f"{data_dir}/y.npy", np.asarray(ytest), allow_pickle=True)
+        with ProcessPoolExecutor(
+            max_workers=min(len(model_files), available_cpus()),
+            initializer=_load_shared_test,
+            initargs=(data_dir, list(xtest.columns)),
+        ) as pool:
+            futures = {
+                name: pool.submit(_predict_and_evaluate, model_file)
+                for name, model_file in model_files.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,110 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+
+def node_dtype(n_classes: int) -> np.dtype:
+    return np.dtype(
+        [
+            ("feature", np.int32),
+            ("threshold", np.float64),
+            ("left", np.int32),
+            ("right", np.int32),
+            ("value", np.float64, (n_classes,)),
+        ]
+    )
+
+
+class CompactForest:
+    """
+    Array-backed inference format for a fitted RandomForestClassifier. All
+    trees are flattened into one contiguous node table saved as a single
+    memory-mappable .npy file.
+
+    Row 0 is a header holding the tree count in 'feature', the feature count
+    in 'left' and the class labels in 'value'. Tree nodes follow with global
+    child indices. Leaves point to themselves and hold normalized class
+    probabilities, so traversal can run a fixed step for all rows and trees.
+    """
+
+    def __init__(self, nodes: np.ndarray):
+        self.nodes = nodes
+        header, table = nodes[0], nodes[1:]
+        self.n_trees = int(header["feature"])
+        self.n_features = int(header["left"])
+        self.classes_ = header["value"]
+
+        self.feature = table["feature"]
+        self.threshold = table["threshold"]
+        self.left = table["left"]
+        self.right = table["right"]
+        self.value = table["value"]
+
+        # Roots are the only nodes that are not another node's child
+        index = np.arange(len(table))
+        is_child = np.zeros(len(table), dtype=bool)
+        is_child[self.left[self.left != index]] = True
+        is_child[self.right[self.right != index]] = True
+        self.roots = np.flatnonzero(~is_child)
+
+    @classmethod
+    def from_sklearn(cls, model: RandomForestClassifier) -> "CompactForest":
+        if model.n_outputs_ != 1:
+            raise ValueError("Only single output forests are supported")
+        if not np.issubdtype(model.classes_.dtype, np.number):
+            raise ValueError("Only numeric class labels are supported")
+
+        n_classes = len(model.classes_)
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        nodes = np.zeros(
+            1 + sum(t.node_count for t in trees), dtype=node_dtype(n_classes)
+        )
+        nodes[0]["feature"] = len(trees)
+        nodes[0]["left"] = model.n_features_in_
+        nodes[0]["value"] = model.classes_
+
+        offset = 0
+        for tree in trees:
+            index = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            table = nodes[1 + offset : 1 + offset + tree.node_count]
+            table["feature"] = np.where(is_leaf, -1, tree.feature)
+            table["threshold"] = tree.threshold
+            table["left"] = np.where(is_leaf, index, tree.children_left + offset)
+            table["right"] = np.where(is_leaf, index, tree.children_right + offset)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :]
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            table["value"] = value / normalizer
+            offset += tree.node_count
+
+        return cls(nodes)
+
+    def save(self, path: str):
+        np.save(path, self.nodes, allow_pickle=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactForest":
+        return cls(np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False))
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the leaf index reached in every tree, shaped (n_rows, n_trees)."""
+        # Trees split on float32 features, as in sklearn
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        feature = self.feature[node]
+        while (feature >= 0).any():
+            go_left = X[rows, np.maximum(feature, 0)] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+            feature = self.feature[node]
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # Accumulate trees in order like sklearn so ties resolve identically
+        proba = np.cumsum(self.value[self.apply(X)], axis=1)[:, -1]
+        return proba / self.n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,19 @@
+import hashlib
+
+import pandas as pd
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Hash of the frame values, index, column names and dtypes."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(str(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    return digest.hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,293 @@
+import asyncio
+import itertools
+import time
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+
+def latency_percentiles(latencies: list) -> dict:
+    """p50/p90/p99/p999 of latencies given in seconds, in microseconds."""
+    if not latencies:
+        return {}
+    values = np.percentile(np.asarray(latencies) * 1e6, [50, 90, 99, 99.9])
+    return {
+        f"{name}_latency": int(value)
+        for name, value in zip(["p50", "p90", "p99", "p999"], values)
+    }
+
+
+async def _run_load(
+    url: str,
+    bodies: list,
+    n_requests: int,
+    concurrency: int,
+    target_rps: float,
+    timeout: float,
+) -> tuple:
+    responses = [None] * n_requests
+    latencies = []
+    counter = itertools.count()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    headers = {"Content-Type": "application/json"}
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as session:
+        start = time.perf_counter()
+
+        async def worker():
+            for i in counter:
+                if i >= n_requests:
+                    return
+                # Pace requests on a fixed schedule when a target rate is set
+                if target_rps:
+                    await asyncio.sleep(
+                        max(0.0, start + i / target_rps - time.perf_counter())
+                    )
+                request_start = time.perf_counter()
+                try:
+                    async with session.put(
+                        url, data=bodies[i % len(bodies)], headers=headers
+                    ) as resp:
+                        payload = await resp.json(content_type=None)
+                        if resp.ok:
+                            responses[i] = payload
+                            latencies.append(time.perf_counter() - request_start)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    pass
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall_time = time.perf_counter() - start
+
+    return responses, latencies, wall_time
+
+
+def run_load(
+    url: str,
+    bodies: list,
+    n_requests: int,
+    concurrency: int = 8,
+    target_rps: float = 0,
+    timeout: float = 30,
+) -> dict:
+    """
+    Send n_requests PUT requests with pre-encoded JSON bodies (cycled) over a
+    pooled connection with up to concurrency requests in flight. With
+    target_rps the requests start on a fixed schedule at that rate,
+    otherwise as fast as the server responds. Returns the response payload
+    per request (None on error) and latency, throughput and error summary.
+    """
+    responses, latencies, wall_time = asyncio.run(
+        _run_load(url, bodies, n_requests, concurrency, target_rps, timeout)
+    )
+    errors = sum(r is None for r in responses)
+    return {
+        "responses": responses,
+        "latencies": latencies,
+        "summary": {
+            "total_tests": n_requests,
+            "errors": errors,
+            "error_rate": errors / n_requests if n_requests else 0.0,
+            "throughput_rps": (n_requests - errors) / wall_time if wall_time else 0.0,
+            "target_rps": target_rps,
+            **latency_percentiles(latencies),
+        },
+    }
+
+
+def arrival_times(
+    n_requests: int,
+    rate: float,
+    process: str = "poisson",
+    burst_size: int = 10,
+    random_state: int = None,
+) -> np.ndarray:
+    """
+    Send offsets in seconds for n_requests arriving at rate per second on
+    average. "poisson" draws exponential gaps, "constant" spaces requests
+    evenly and "bursty" sends burst_size requests at once with Poisson gaps
+    between the bursts.
+    """
+    rng = np.random.default_rng(random_state)
+    if process == "constant":
+        return np.arange(n_requests) / rate
+    if process == "poisson":
+        gaps = rng.exponential(1 / rate, n_requests)
+        gaps[0] = 0.0
+        return np.cumsum(gaps)
+    if process == "bursty":
+        n_bursts = -(-n_requests // burst_size)
+        gaps = rng.exponential(burst_size / rate, n_bursts)
+        gaps[0] = 0.0
+        return np.repeat(np.cumsum(gaps), burst_size)[:n_requests]
+    raise ValueError(f"Unknown arrival process {process}")
+
+
+def trace_arrival_times(timestamps, speedup: float = 1.0) -> np.ndarray:
+    """Send offsets in seconds replaying recorded request timestamps."""
+    timestamps = pd.to_datetime(pd.Series(timestamps)).sort_values()
+    offsets = (timestamps - timestamps.iloc[0]).dt.total_seconds().to_numpy()
+    return offsets / speedup
+
+
+async def _run_open_loop(
+    url: str,
+    bodies: list,
+    arrivals: np.ndarray,
+    concurrency: int,
+    timeout: float,
+    method: str,
+) -> tuple:
+    n_requests = len(arrivals)
+    responses = [None] * n_requests
+    latencies = []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    headers = {"Content-Type": "application/json"}
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as session:
+
+        async def send(i, scheduled):
+            try:
+                async with session.request(
+                    method, url, data=bodies[i % len(bodies)], headers=headers
+                ) as resp:
+                    payload = await resp.json(content_type=None)
+                    if resp.ok:
+                        responses[i] = payload
+                        # Measured from the scheduled send time, so client side
+                        # queueing behind a slow server counts as latency
+                        latencies.append(time.perf_counter() - scheduled)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                pass
+
+        tasks = []
+        start = time.perf_counter()
+        for i, offset in enumerate(arrivals):
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(i, scheduled)))
+        send_time = time.perf_counter() - start
+        await asyncio.gather(*tasks)
+        wall_time = time.perf_counter() - start
+
+    return responses, latencies, send_time, wall_time
+
+
+async def run_open_loop_async(
+    url: str,
+    bodies: list,
+    arrivals: np.ndarray,
+    concurrency: int = 64,
+    timeout: float = 30,
+    method: str = "POST",
+) -> dict:
+    """
+    Send one request per arrival offset (see arrival_times) with pre-encoded
+    JSON bodies (cycled), without waiting for earlier responses. Requests
+    share a connection pool of up to concurrency connections. The summary
+    reports the achieved send rate next to the requested one, which falls
+    behind when the client itself cannot keep up. Await it from code that
+    already runs an event loop, e.g. an async nuclio handler.
+    """
+    arrivals = np.asarray(arrivals, dtype=float)
+    responses, latencies, send_time, wall_time = await _run_open_loop(
+        url, bodies, arrivals, concurrency, timeout, method
+    )
+    n_requests = len(arrivals)
+    errors = sum(r is None for r in responses)
+    duration = arrivals[-1] if n_requests else 0.0
+    return {
+        "responses": responses,
+        "latencies": latencies,
+        "summary": {
+            "total_tests": n_requests,
+            "errors": errors,
+            "error_rate": errors / n_requests if n_requests else 0.0,
+            "requested_rps": (n_requests - 1) / duration if duration else 0.0,
+            "achieved_rps": (n_requests - 1) / send_time if send_time else 0.0,
+            "throughput_rps": (n_requests - errors) / wall_time if wall_time else 0.0,
+            **latency_percentiles(latencies),
+        },
+    }
+
+
+def run_open_loop(
+    url: str,
+    bodies: list,
+    arrivals: np.ndarray,
+    concurrency: int = 64,
+    timeout: float = 30,
+    method: str = "POST",
+) -> dict:
+    """Blocking run_open_loop_async, for callers without a running event loop."""
+    return asyncio.run(
+        run_open_loop_async(url, bodies, arrivals, concurrency, timeout, method)
+    )
+
+
+def latency_histogram(latencies: list, n_bins: int = 50) -> pd.DataFrame:
+    """Log-spaced histogram of latencies given in seconds, with bins in milliseconds."""
+    latencies_ms = np.asarray(latencies) * 1000
+    edges = np.geomspace(
+        max(latencies_ms.min(), 1e-3), max(latencies_ms.max(), 2e-3), n_bins + 1
+    )
+    counts, _ = np.histogram(np.clip(latencies_ms, edges[0], edges[-1]), bins=edges)
+    return pd.DataFrame(
+        {"bin_start_ms": edges[:-1], "bin_end_ms": edges[1:], "count": counts}
+    )
+
+
+def check_performance(
+    summary: dict,
+    max_p99_latency_ms: float = None,
+    min_throughput_rps: float = None,
+    max_error_rate: float = None,
+    champion: dict = None,
+    max_latency_regression: float = 0.2,
+    max_throughput_regression: float = 0.2,
+) -> list:
+    """
+    Compare a run_load summary to absolute thresholds and, when given, to the
+    champion's summary. Returns a description of every violation.
+    """
+    violations = []
+    p99_latency_ms = summary.get("p99_latency", 0) / 1000
+    if max_p99_latency_ms is not None and p99_latency_ms > max_p99_latency_ms:
+        violations.append(
+            f"p99 latency {p99_latency_ms:.1f}ms above {max_p99_latency_ms}ms"
+        )
+    if (
+        min_throughput_rps is not None
+        and summary["throughput_rps"] < min_throughput_rps
+    ):
+        violations.append(
+            f"throughput {summary['throughput_rps']:.1f} rps below {min_throughput_rps} rps"
+        )
+    if max_error_rate is not None and summary["error_rate"] > max_error_rate:
+        violations.append(
+            f"error rate {summary['error_rate']:.4f} above {max_error_rate}"
+        )
+
+    if champion and "p99_latency" in champion:
+        allowed = champion["p99_latency"] * (1 + max_latency_regression)
+        if summary.get("p99_latency", 0) > allowed:
+            violations.append(
+                f"p99 latency {p99_latency_ms:.1f}ms regressed more than "
+                f"{max_latency_regression:.0%} from champion "
+                f"{champion['p99_latency'] / 1000:.1f}ms"
+            )
+    if champion and "throughput_rps" in champion:
+        allowed = champion["throughput_rps"] * (1 - max_throughput_regression)
+        if summary["throughput_rps"] < allowed:
+            violations.append(
+                f"throughput {summary['throughput_rps']:.1f} rps regressed more than "
+                f"{max_throughput_regression:.0%} from champion "
+                f"{champion['throughput_rps']:.1f} rps"
+            )
+    return violations
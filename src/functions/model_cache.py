@@ -0,0 +1,80 @@
+import os
+import posixpath
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+def extra_data_urls(target: str, extra_data: dict) -> dict:
+    """
+    URLs of a model's extra data, with relative paths resolved against the
+    model target the same way mlrun.artifacts.get_model does.
+    """
+    urls = {}
+    for key, path in (extra_data or {}).items():
+        relative = path and not (path.startswith("/") or ":\\" in path or "://" in path)
+        urls[key] = (
+            posixpath.join(posixpath.dirname(target), path) if relative else path
+        )
+    return urls
+
+
+class ModelCache:
+    """
+    Local cache of model files keyed by the artifact content hash. Entries
+    are evicted least recently used first once the cache exceeds max_size_mb.
+    Files without a hash are never cached, they would all share one entry.
+    Entries keep the suffix of the cached file, e.g. .pkl or .npy.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = ".pkl") -> Optional[str]:
+        if not key:
+            return None
+        path = self._path(key, suffix)
+        try:
+            # Mark entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return str(path)
+
+    def put(self, key: str, source_path: str) -> str:
+        if not key:
+            return source_path
+        # Copy to a temp file first so concurrent replicas never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source_path, tmp_path)
+        path = self._path(key, Path(source_path).suffix)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+        return str(path)
+
+    def evict(self, keep: str = None):
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total_size <= self.max_size:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total_size -= size
@@ -0,0 +1,54 @@
+import mlrun
+import pandas as pd
+from mlrun.artifacts import get_model, update_model
+
+from src.functions.defaults import DEFAULT_BATCH_SIZES
+from src.functions.profiling import PROFILE_PREFIX, profile_model
+
+
+def get_profile_metrics(model_uri: str) -> dict:
+    model_artifact, _ = mlrun.datastore.store_manager.get_store_artifact(model_uri)
+    return {
+        key[len(PROFILE_PREFIX) :]: value
+        for key, value in (model_artifact.spec.metrics or {}).items()
+        if key.startswith(PROFILE_PREFIX)
+    }
+
+
+@mlrun.handler()
+def record_model_profile(
+    context: mlrun.MLClientCtx,
+    model_path: str,
+    test: pd.DataFrame,
+    label_column: str,
+    batch_sizes: list = None,
+    n_single: int = 200,
+    min_seconds: float = 1.0,
+):
+    """Measure the inference cost of a trained model and record it on the artifact
+
+    :param model_path:  store URI of the model artifact
+    :param test:        test set to draw prediction rows from
+    :param label_column: name of the label column in test
+    :param batch_sizes: batch sizes to measure throughput at
+    :param n_single:    number of single row predictions to time
+    :param min_seconds: minimal time to predict each batch size for
+    """
+    model_file, *_ = get_model(model_path, suffix=".pkl")
+    profile = profile_model(
+        model_file,
+        test.drop(label_column, axis=1),
+        batch_sizes=batch_sizes or DEFAULT_BATCH_SIZES,
+        n_single=n_single,
+        min_seconds=min_seconds,
+    )
+    for key, value in profile.items():
+        context.log_result(key, value)
+
+    # Record the profile on the model so accuracy can be weighed against cost
+    update_model(
+        model_path,
+        metrics=profile,
+        key_prefix=PROFILE_PREFIX,
+        labels={"profile-run": context.uid},
+    )
@@ -0,0 +1,133 @@
+import json
+
+import mlrun
+from mlrun.artifacts import update_model
+from mlrun.datastore import DataItem
+
+from src.functions.load_test import check_performance, latency_histogram, run_load
+from src.functions.model_profile import get_profile_metrics
+from src.functions.profiling import PROFILE_PREFIX, check_profile
+
+# Run results recorded on the model artifact and compared across model tags
+GATE_METRICS = ["p50_latency", "p99_latency", "throughput_rps", "error_rate"]
+METRIC_PREFIX = "performance-"
+
+
+def get_champion_metrics(
+    context: mlrun.MLClientCtx,
+    model_name: str,
+    model_tag: str,
+    prefix: str = METRIC_PREFIX,
+):
+    project = context.get_project_object()
+    try:
+        model_uri = project.get_artifact_uri(
+            key=model_name, category="model", tag=model_tag, iter=0
+        )
+        model_artifact, _ = mlrun.datastore.store_manager.get_store_artifact(model_uri)
+    except mlrun.errors.MLRunNotFoundError:
+        return {}
+    return {
+        key[len(prefix) :]: value
+        for key, value in (model_artifact.spec.metrics or {}).items()
+        if key.startswith(prefix)
+    }
+
+
+def performance_gate(
+    context: mlrun.MLClientCtx,
+    table: DataItem,
+    addr: str,
+    model_uri: str,
+    label_column: str,
+    model: str = "model",
+    model_name: str = "model",
+    model_tag: str = "challenger",
+    champion_model_tag: str = "champion",
+    requests: int = 1000,
+    concurrency: int = 16,
+    target_rps: float = 0,
+    rows: int = 100,
+    max_p99_latency_ms: float = None,
+    min_throughput_rps: float = None,
+    max_error_rate: float = 0.0,
+    max_latency_regression: float = 0.2,
+    max_throughput_regression: float = 0.2,
+):
+    """Run sustained load against a deployed model and fail on SLO regressions
+
+    :param table:                     csv/parquet table with test data
+    :param addr:                      function address/url
+    :param model_uri:                 store URI of the deployed model artifact
+    :param label_column:              name of the label column in table
+    :param model:                     deployed model name in the serving function
+    :param model_name:                artifact key of the champion model
+    :param model_tag:                 tag of the deployed model, for traceability
+    :param champion_model_tag:        tag of the model to compare against
+    :param requests:                  number of requests to send
+    :param concurrency:               max requests in flight
+    :param target_rps:                request rate, 0 for as fast as possible
+    :param rows:                      number of test set rows to cycle through
+    :param max_p99_latency_ms:        p99 latency threshold
+    :param min_throughput_rps:        throughput threshold
+    :param max_error_rate:            fraction of failed requests allowed
+    :param max_latency_regression:    allowed p99 latency increase over the champion
+    :param max_throughput_regression: allowed throughput decrease from the champion
+    """
+    table = table.as_df().drop(label_column, axis=1)
+    if rows and rows < table.shape[0]:
+        table = table.sample(rows)
+    bodies = [json.dumps({"inputs": [x.tolist()]}) for x in table.values]
+
+    # Sustained load against the new endpoint
+    load = run_load(
+        url=f"{addr}/v2/models/{model}/infer",
+        bodies=bodies,
+        n_requests=requests,
+        concurrency=concurrency,
+        target_rps=target_rps,
+    )
+    summary = load["summary"]
+    for key, value in summary.items():
+        context.log_result(key, value)
+    if load["latencies"]:
+        context.log_dataset(
+            "latency_histogram",
+            df=latency_histogram(load["latencies"]),
+            format="csv",
+            index=False,
+            labels={"model_tag": model_tag},
+        )
+
+    # Compare to SLO thresholds and the champion's recorded numbers
+    champion = get_champion_metrics(context, model_name, champion_model_tag)
+    violations = check_performance(
+        summary,
+        max_p99_latency_ms=max_p99_latency_ms,
+        min_throughput_rps=min_throughput_rps,
+        max_error_rate=max_error_rate,
+        champion=champion,
+        max_latency_regression=max_latency_regression,
+        max_throughput_regression=max_throughput_regression,
+    )
+
+    # Same regression limits for the offline inference profile from training
+    violations += check_profile(
+        get_profile_metrics(model_uri),
+        get_champion_metrics(
+            context, model_name, champion_model_tag, prefix=PROFILE_PREFIX
+        ),
+        max_latency_regression=max_latency_regression,
+        max_throughput_regression=max_throughput_regression,
+    )
+    context.log_result("passed_gate", not violations)
+    if violations:
+        raise ValueError(f"Performance gate failed: {'; '.join(violations)}")
+
+    # Record the numbers on the model so it can be the baseline once promoted
+    update_model(
+        model_uri,
+        metrics={k: summary[k] for k in GATE_METRICS if k in summary},
+        key_prefix=METRIC_PREFIX,
+        labels={"performance-gate": context.uid},
+    )
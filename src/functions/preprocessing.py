@@ -0,0 +1,145 @@
+from typing import Union
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+
+class CompiledPreprocessor:
+    """
+    Precomputed index map of a fitted one-hot + passthrough column transformer,
+    as produced by process_data. Encodes events straight into a float64 NumPy
+    array without building pandas objects. Passthrough columns listed in
+    drop_columns (e.g. the label) are left out of the output and not required
+    in events.
+    """
+
+    def __init__(
+        self,
+        preprocessor: Union[Pipeline, ColumnTransformer],
+        drop_columns: list = None,
+    ):
+        column_transformer = (
+            preprocessor.steps[-1][1]
+            if isinstance(preprocessor, Pipeline)
+            else preprocessor
+        )
+        if not isinstance(column_transformer, ColumnTransformer):
+            raise ValueError(
+                f"Cannot compile {type(column_transformer).__name__}, "
+                "expected a ColumnTransformer"
+            )
+
+        self.feature_names = list(preprocessor.get_feature_names_out())
+        self.categories = {}
+        self.category_arrays = {}
+        self.passthrough = {}
+        drop_columns = set(drop_columns or [])
+        dropped = []
+
+        # Output features are laid out in the order of the fitted transformers
+        offset = 0
+        for name, transformer, columns in column_transformer.transformers_:
+            columns = [
+                column_transformer.feature_names_in_[c] if isinstance(c, int) else c
+                for c in columns
+            ]
+            if transformer == "drop" or not columns:
+                continue
+            elif transformer == "passthrough":
+                for column in columns:
+                    if column in drop_columns:
+                        dropped.append(offset)
+                    else:
+                        self.passthrough[column] = offset
+                    offset += 1
+            elif isinstance(transformer, OneHotEncoder) and transformer.drop is None:
+                for column, categories in zip(columns, transformer.categories_):
+                    self.categories[column] = {
+                        category: offset + i for i, category in enumerate(categories)
+                    }
+                    self.category_arrays[column] = (categories, np.argsort(categories))
+                    offset += len(categories)
+            else:
+                raise ValueError(f"Cannot compile transformer '{name}': {transformer}")
+
+        if offset != len(self.feature_names):
+            raise ValueError(
+                f"Compiled {offset} features, expected {len(self.feature_names)}"
+            )
+
+        # Shift output indices to close the gaps left by dropped columns
+        if dropped:
+
+            def shift(index):
+                return index - sum(d < index for d in dropped)
+
+            self.feature_names = [
+                n for i, n in enumerate(self.feature_names) if i not in dropped
+            ]
+            self.passthrough = {c: shift(i) for c, i in self.passthrough.items()}
+            self.categories = {
+                column: {category: shift(i) for category, i in index.items()}
+                for column, index in self.categories.items()
+            }
+        self.input_columns = list(self.categories) + list(self.passthrough)
+
+    def transform(self, event: Union[dict, list]) -> np.ndarray:
+        """Encode a dict of column lists or a list of records into a 2D array."""
+        if isinstance(event, dict):
+            columns = event
+        else:
+            columns = {c: [record[c] for record in event] for c in self.input_columns}
+        n_rows = len(columns[self.input_columns[0]])
+
+        transformed = np.zeros((n_rows, len(self.feature_names)), dtype=np.float64)
+        # Missing passthrough values (JSON null) become NaN like in pandas
+        for column, index in self.passthrough.items():
+            transformed[:, index] = np.asarray(columns[column], dtype=np.float64)
+        for column, category_index in self.categories.items():
+            for row, value in enumerate(columns[column]):
+                try:
+                    transformed[row, category_index[value]] = 1.0
+                except KeyError:
+                    raise ValueError(
+                        f"Found unknown category {value!r} in column {column!r}"
+                    )
+        return transformed
+
+    def category_codes(self, column: str, values) -> np.ndarray:
+        """Vectorized position of each value in the fitted categories of column."""
+        categories, sorter = self.category_arrays[column]
+        values = np.asarray(values, dtype=categories.dtype)
+        positions = np.searchsorted(categories, values, sorter=sorter)
+        codes = sorter[np.minimum(positions, len(categories) - 1)]
+        unknown = categories[codes] != values
+        if unknown.any():
+            raise ValueError(
+                f"Found unknown category {values[unknown][0]!r} in column {column!r}"
+            )
+        return codes
+
+    def transform_columns(self, columns) -> np.ndarray:
+        """
+        Vectorized encoding of whole columns, e.g. a DataFrame chunk. Faster
+        than transform for many rows, slower for single events.
+        """
+        n_rows = len(columns[self.input_columns[0]])
+        transformed = np.zeros((n_rows, len(self.feature_names)), dtype=np.float64)
+        # Missing passthrough values (JSON null) become NaN like in pandas
+        for column, index in self.passthrough.items():
+            transformed[:, index] = np.asarray(columns[column], dtype=np.float64)
+        rows = np.arange(n_rows)
+        for column, category_index in self.categories.items():
+            offset = min(category_index.values())
+            transformed[rows, offset + self.category_codes(column, columns[column])] = (
+                1.0
+            )
+        return transformed
+
+    def transform_records(self, event: Union[dict, list]) -> list:
+        """Encode an event and return it as a list of feature-name records."""
+        return [
+            dict(zip(self.feature_names, row)) for row in self.transform(event).tolist()
+        ]
@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+
+from src.functions.defaults import DEFAULT_BATCH_SIZES
+
+# Profile metrics recorded on the model artifact under this prefix
+PROFILE_PREFIX = "profile-"
+
+
+def _profile(
+    model_file: str,
+    X: pd.DataFrame,
+    batch_sizes: list,
+    n_single: int,
+    min_seconds: float,
+    random_state: int,
+) -> dict:
+    start = time.perf_counter()
+    with open(model_file, "rb") as f:
+        model = cloudpickle.load(f)
+    profile = {"load_seconds": time.perf_counter() - start}
+
+    rng = np.random.default_rng(random_state)
+    latencies = []
+    for i in rng.integers(0, len(X), n_single):
+        row = X.iloc[[i]]
+        start = time.perf_counter()
+        model.predict(row)
+        latencies.append(time.perf_counter() - start)
+    profile["single_row_p50_ms"] = float(np.percentile(latencies, 50) * 1000)
+    profile["single_row_p99_ms"] = float(np.percentile(latencies, 99) * 1000)
+
+    for batch_size in batch_sizes:
+        batch = X.iloc[rng.integers(0, len(X), batch_size)]
+        rows, start = 0, time.perf_counter()
+        while rows == 0 or time.perf_counter() - start < min_seconds:
+            model.predict(batch)
+            rows += batch_size
+        profile[f"throughput_rps_batch_{batch_size}"] = rows / (
+            time.perf_counter() - start
+        )
+
+    # ru_maxrss is in kilobytes on Linux
+    profile["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return profile
+
+
+def profile_model(
+    model_file: str,
+    X: pd.DataFrame,
+    batch_sizes: list = DEFAULT_BATCH_SIZES,
+    n_single: int = 200,
+    min_seconds: float = 1.0,
+    random_state: int = 42,
+) -> dict:
+    """
+    Inference cost of a pickled model: load time, single-row predict latency
+    over n_single rows of X, throughput in rows/sec for every batch size
+    (predicting repeatedly for at least min_seconds), peak RSS and file
+    size. Runs in a freshly spawned process, so load time and memory are
+    not skewed by objects already loaded here.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        profile = pool.submit(
+            _profile,
+            model_file,
+            X,
+            list(batch_sizes),
+            n_single,
+            min_seconds,
+            random_state,
+        ).result()
+    profile["model_size_mb"] = os.path.getsize(model_file) / 1024 / 1024
+    return profile
+
+
+def check_profile(
+    profile: dict,
+    champion: dict,
+    max_latency_regression: float = 0.2,
+    max_throughput_regression: float = 0.2,
+) -> list:
+    """
+    Compare a profile_model result to the champion's. Returns a description
+    of every single-row latency or batch throughput regression beyond the
+    allowed fraction.
+    """
+    violations = []
+    if "single_row_p50_ms" in profile and "single_row_p50_ms" in champion:
+        allowed = champion["single_row_p50_ms"] * (1 + max_latency_regression)
+        if profile["single_row_p50_ms"] > allowed:
+            violations.append(
+                f"single row latency {profile['single_row_p50_ms']:.2f}ms regressed "
+                f"more than {max_latency_regression:.0%} from champion "
+                f"{champion['single_row_p50_ms']:.2f}ms"
+            )
+    for key in sorted(set(profile) & set(champion)):
+        if not key.startswith("throughput_rps_batch_"):
+            continue
+        allowed = champion[key] * (1 - max_throughput_regression)
+        if profile[key] < allowed:
+            violations.append(
+                f"{key} {profile[key]:.1f} regressed more than "
+                f"{max_throughput_regression:.0%} from champion {champion[key]:.1f}"
+            )
+    return violations
@@ -0,0 +1,91 @@
+import json
+import math
+import os
+import tempfile
+
+import numpy as np
+import pyarrow.parquet as pq
+
+
+def load_rows(path, drop_columns=(), mmap_path: str = None) -> np.ndarray:
+    """
+    Read a parquet file into a single row-major NumPy array, without the
+    drop_columns and the pandas index. path is a local path or an MLRun
+    DataItem, which is only downloaded (with its datastore credentials) when
+    needed. With mmap_path the rows are written there as .npy once and
+    memory-mapped, so workers on the same node share one copy through the
+    page cache.
+    """
+    if mmap_path and os.path.exists(mmap_path):
+        return np.load(mmap_path, mmap_mode="r")
+    if hasattr(path, "local"):
+        path = path.local()
+
+    schema = pq.read_schema(path)
+    index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+    columns = [
+        name
+        for name in schema.names
+        if name not in drop_columns and name not in index_columns
+    ]
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    columns = [column.to_numpy() for column in table.columns]
+    rows = np.empty((table.num_rows, len(columns)), dtype=np.result_type(*columns))
+    for i, column in enumerate(columns):
+        rows[:, i] = column
+    if not mmap_path:
+        return rows
+
+    # Write to a temp file first so concurrent workers never map a partial file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(mmap_path) or ".", suffix=".tmp"
+    )
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, rows)
+    os.replace(tmp_path, mmap_path)
+    return np.load(mmap_path, mmap_mode="r")
+
+
+def encode_row(row: list) -> bytes:
+    """Strict JSON encoding of a row, with missing (NaN) values as null."""
+    return json.dumps(
+        [None if isinstance(v, float) and math.isnan(v) else v for v in row],
+        allow_nan=False,
+    ).encode()
+
+
+class BodyPool:
+    """
+    Pool of pre-encoded {"inputs": [...]} request bodies, each with
+    batch_size rows sampled from rows. Sampled rows are JSON encoded once and
+    all bodies are packed into one bytes buffer, so getting a body is a
+    slice lookup.
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        batch_size: int = 1,
+        n_bodies: int = 1000,
+        random_state: int = None,
+    ):
+        self.batch_size = batch_size
+        rng = np.random.default_rng(random_state)
+        samples = rng.integers(0, len(rows), size=(n_bodies, batch_size))
+        # Only the sampled rows are read (and paged in when memory-mapped)
+        sampled, samples = np.unique(samples, return_inverse=True)
+        samples = samples.reshape(n_bodies, batch_size)
+        encoded_rows = [encode_row(row) for row in rows[sampled].tolist()]
+        bodies = [
+            b'{"inputs": [' + b", ".join(encoded_rows[i] for i in sample) + b"]}"
+            for sample in samples
+        ]
+        self.buffer = b"".join(bodies)
+        self.offsets = np.zeros(n_bodies + 1, dtype=np.int64)
+        np.cumsum([len(body) for body in bodies], out=self.offsets[1:])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.buffer[self.offsets[i] : self.offsets[i + 1]]
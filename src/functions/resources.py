@@ -0,0 +1,8 @@
+import os
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which respects the pod's CPU set."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
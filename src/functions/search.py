@@ -0,0 +1,158 @@
+import copy
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterSampler
+
+from src.functions.resources import available_cpus
+
+# Train/test arrays memory-mapped once per worker process
+_shared_data = {}
+
+
+def _load_shared_data(data_dir: str):
+    for name in ["X_train", "y_train", "X_test", "y_test"]:
+        _shared_data[name] = np.load(f"{data_dir}/{name}.npy", mmap_mode="r")
+
+
+def _fit_and_score(params: dict) -> dict:
+    start, cpu_start = time.perf_counter(), time.process_time()
+    model = RandomForestClassifier(**params)
+    model.fit(_shared_data["X_train"], _shared_data["y_train"])
+    accuracy = float(
+        np.mean(model.predict(_shared_data["X_test"]) == _shared_data["y_test"])
+    )
+    return {
+        **params,
+        "accuracy": accuracy,
+        "fit_seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+
+
+def successive_halving(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    param_grid: dict,
+    n_candidates: int = 27,
+    factor: int = 3,
+    n_workers: int = None,
+    random_state: int = 42,
+) -> dict:
+    """
+    Random search over param_grid with successive halving on n_estimators.
+    All sampled candidates are first fit with the smallest n_estimators in
+    the grid, then the best 1/factor move to a factor times larger forest
+    until the largest n_estimators is reached. Candidates are fit in a
+    process pool that memory-maps one shared copy of the train/test arrays.
+    """
+    param_grid = dict(param_grid)
+    estimators = param_grid.pop("n_estimators", [100])
+    min_estimators, max_estimators = min(estimators), max(estimators)
+    candidates = list(
+        ParameterSampler(param_grid, n_iter=n_candidates, random_state=random_state)
+    )
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name, array in [
+            ("X_train", X_train),
+            ("y_train", y_train),
+            ("X_test", X_test),
+            ("y_test", y_test),
+        ]:
+            np.save(f"{data_dir}/{name}.npy", np.asarray(array))
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers or available_cpus(),
+            initializer=_load_shared_data,
+            initargs=(data_dir,),
+        ) as pool:
+            n_estimators, rung = min_estimators, 0
+            while True:
+                rung_params = [
+                    {
+                        **params,
+                        "n_estimators": n_estimators,
+                        "random_state": random_state,
+                    }
+                    for params in candidates
+                ]
+                rung_results = list(pool.map(_fit_and_score, rung_params))
+                results.extend({**r, "rung": rung} for r in rung_results)
+                if n_estimators >= max_estimators or len(candidates) == 1:
+                    break
+
+                # Keep the best 1/factor of candidates for the next, larger rung
+                ranking = np.argsort(
+                    [-r["accuracy"] for r in rung_results], kind="stable"
+                )
+                candidates = [
+                    candidates[i] for i in ranking[: max(1, len(candidates) // factor)]
+                ]
+                n_estimators = min(n_estimators * factor, max_estimators)
+                rung += 1
+
+    # The seed is part of the selected configuration, so a refit matches the
+    # scored model
+    best = max(rung_results, key=lambda r: r["accuracy"])
+    return {
+        "best_params": {
+            k: v
+            for k, v in best.items()
+            if k in param_grid or k in ("n_estimators", "random_state")
+        },
+        "best_accuracy": best["accuracy"],
+        "results": results,
+        "wall_seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time()
+        - cpu_start
+        + sum(r["cpu_seconds"] for r in results),
+    }
+
+
+def warm_start_checkpoints(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    params: dict,
+    estimators: list,
+) -> tuple:
+    """
+    Grow a single forest through the given n_estimators checkpoints with
+    warm_start, scoring the test accuracy at each one. Returns the grown
+    model and one result per checkpoint with the cumulative fit time.
+    """
+    model = RandomForestClassifier(warm_start=True, **params)
+    checkpoints = []
+    fit_seconds = 0.0
+    for n_estimators in sorted(estimators):
+        start = time.perf_counter()
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X_train, y_train)
+        fit_seconds += time.perf_counter() - start
+        checkpoints.append(
+            {
+                "n_estimators": n_estimators,
+                "accuracy": float(np.mean(model.predict(X_test) == np.asarray(y_test))),
+                "fit_seconds": fit_seconds,
+            }
+        )
+    return model, checkpoints
+
+
+def truncate_forest(
+    model: RandomForestClassifier, n_estimators: int
+) -> RandomForestClassifier:
+    """Return a copy of a warm-started forest with only its first n_estimators trees."""
+    truncated = copy.copy(model)
+    truncated.estimators_ = model.estimators_[:n_estimators]
+    truncated.set_params(n_estimators=n_estimators, warm_start=False)
+    return truncated
@@ -1,41 +1,183 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import cloudpickle
 import mlrun
 import numpy as np
 import pandas as pd
 
+from src.functions.batching import MicroBatcher
+from src.functions.forest import CompactForest
+from src.functions.model_cache import ModelCache, extra_data_urls
+from src.functions.preprocessing import CompiledPreprocessor
+
 
 class SKLearnPipeline:
     """
     Apply sklearn pipeline to incoming record. Receives a
     dict and returns a dict with the sklearn processing in between.
+
+    With compiled=True the fitted one-hot encoder is turned into an index map
+    at init and events are encoded without pandas.
     """
 
-    def __init__(self, pipeline_path: str):
+    def __init__(self, pipeline_path: str, compiled: bool = False):
         local_path = mlrun.get_dataitem(pipeline_path).local()
         with open(local_path, "rb") as f:
             self.pipeline = cloudpickle.load(f)
+        self.feature_names = self.pipeline.get_feature_names_out()
+        self.compiled = CompiledPreprocessor(self.pipeline) if compiled else None
 
     def do(self, event: dict) -> dict:
+        if self.compiled:
+            return self.compiled.transform_records(event)
+
         df_event = pd.DataFrame(event)
         df_transformed = pd.DataFrame(
             data=self.pipeline.transform(df_event),
-            columns=self.pipeline.get_feature_names_out(),
+            columns=self.feature_names,
         )
-        return df_transformed.to_dict(orient="record")
+        return df_transformed.to_dict(orient="records")
 
 
 class ClassifierModel(mlrun.serving.V2ModelServer):
     """
-    Model server for individual model. Describes load and predict behavior
+    Model server for individual model. Describes load and predict behavior.
+
+    Set batch_max_size to micro-batch rows from concurrent requests in the
+    same worker into a single predict call, flushed after batch_window_ms.
+    Requests only wait for the window while others are in flight, so a
+    worker serving one event at a time is not slowed down.
+
+    Set model_cache_dir to keep downloaded model files in a local cache keyed
+    by the artifact hash (bounded by model_cache_max_mb), and model_prefetch
+    to load the model in the background so the replica becomes ready while
+    the download runs. Requests wait until the model is loaded.
+
+    Set model_format to 'compact' to serve the model_compact artifact logged
+    by train_model, which is memory-mapped instead of unpickled.
     """
 
     def load(self):
         """load and initialize the model and/or other elements"""
-        model_file, extra_data = self.get_model(".pkl")
-        self.model = cloudpickle.load(open(model_file, "rb"))
+        self.model_cache = None
+        cache_dir = self.get_param("model_cache_dir")
+        if cache_dir:
+            self.model_cache = ModelCache(
+                cache_dir=cache_dir,
+                max_size_mb=self.get_param("model_cache_max_mb", 1024),
+            )
+
+        self.model_format = self.get_param("model_format", "pickle")
+        self.loading = None
+        if self.get_param("model_prefetch", False):
+            executor = ThreadPoolExecutor(max_workers=1)
+            self.loading = executor.submit(self.load_model)
+            executor.shutdown(wait=False)
+        else:
+            self.load_model()
+
+    def load_model(self):
+        """download and unpickle the model, recording cold vs warm load time"""
+        start = time.monotonic()
+        model_file, self.extra_data, cache_hit = self.get_model_file()
+        if self.model_format == "compact":
+            self.model = CompactForest.load(model_file)
+        else:
+            with open(model_file, "rb") as f:
+                self.model = cloudpickle.load(f)
+        load_seconds = time.monotonic() - start
+        load_type = "warm" if cache_hit else "cold"
+        self.metrics[f"model_load_{load_type}_seconds"] = load_seconds
+        self.context.logger.info(
+            f"Loaded model {self.name} ({load_type}) in {load_seconds:.3f}s"
+        )
+
+        self.batcher = None
+        batch_max_size = self.get_param("batch_max_size", 0)
+        if batch_max_size:
+            self.batcher = MicroBatcher(
+                predict_fn=self.model.predict,
+                max_batch_size=batch_max_size,
+                window_ms=self.get_param("batch_window_ms", 5.0),
+            )
+
+    def get_model_file(self) -> tuple:
+        """get the local model file, from the model cache when the hash matches"""
+        suffix = ".npy" if self.model_format == "compact" else ".pkl"
+        if not self.model_cache or not mlrun.datastore.is_store_uri(self.model_path):
+            return (*self.get_model(suffix), False)
+
+        model_spec, target = mlrun.datastore.store_manager.get_store_artifact(
+            self.model_path
+        )
+        model_hash = model_spec.metadata.hash
+        if not model_hash:
+            # Artifacts without a hash (e.g. not uploaded) cannot be told apart
+            return (*self.get_model(suffix), False)
+
+        cached_file = self.model_cache.get(model_hash, suffix)
+        if cached_file:
+            self.model_spec = model_spec
+            extra_data = {
+                key: mlrun.get_dataitem(url)
+                for key, url in extra_data_urls(
+                    target, model_spec.spec.extra_data
+                ).items()
+            }
+            return cached_file, extra_data, True
+
+        model_file, extra_data = self.get_model(suffix)
+        return self.model_cache.put(model_hash, model_file), extra_data, False
+
+    def wait_for_model(self):
+        """block until a background model load has finished"""
+        if self.loading:
+            self.loading.result()
 
     def predict(self, body: dict) -> list:
         """Generate model predictions from sample."""
+        self.wait_for_model()
         feats = np.asarray(body["inputs"])
-        result: np.ndarray = self.model.predict(feats)
+        if self.batcher:
+            result: np.ndarray = self.batcher.predict(feats)
+        else:
+            result: np.ndarray = self.model.predict(feats)
         return result.tolist()
+
+
+class FusedClassifierModel(ClassifierModel):
+    """
+    Model server that runs the process_data preprocessor and the model as one
+    inference unit. Accepts raw HeartSchema records, or already encoded rows.
+    The preprocessor is read from preprocessor_path or from the model's
+    'preprocessor' extra data.
+    """
+
+    def load_model(self):
+        """load the model and compile the preprocessor stored alongside it"""
+        super().load_model()
+        preprocessor_path = self.get_param("preprocessor_path")
+        if preprocessor_path:
+            preprocessor_item = mlrun.get_dataitem(preprocessor_path)
+        elif "preprocessor" in (self.extra_data or {}):
+            preprocessor_item = self.extra_data["preprocessor"]
+        else:
+            raise ValueError(
+                f"Model {self.model_path} has no 'preprocessor' extra data - set the "
+                "preprocessor_path param or serve a model trained with the "
+                "preprocessor logged alongside it"
+            )
+        with open(preprocessor_item.local(), "rb") as f:
+            preprocessor = cloudpickle.load(f)
+        self.preprocessor = CompiledPreprocessor(
+            preprocessor, drop_columns=[self.get_param("label_column", "target")]
+        )
+
+    def predict(self, body: dict) -> list:
+        """Encode raw records and generate model predictions."""
+        self.wait_for_model()
+        inputs = body["inputs"]
+        if inputs and isinstance(inputs[0], dict):
+            inputs = self.preprocessor.transform(inputs)
+        return super().predict({"inputs": inputs})
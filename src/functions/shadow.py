@@ -0,0 +1,144 @@
+import time
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.functions.evaluation import classification_metrics, confusion_matrix
+
+
+class StreamingMetrics:
+    """
+    Evaluation metrics accumulated chunk by chunk in bounded memory: a
+    confusion matrix, the log loss sum and per-class score histograms for
+    ROC AUC, which is exact up to the n_bins score resolution.
+    """
+
+    def __init__(self, classes, n_bins: int = 1000):
+        self.classes = np.asarray(classes)
+        self.n_bins = n_bins
+        n_classes = len(self.classes)
+        self.matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.rows = 0
+        # Score histograms of the positive and negative rows, per class column
+        self.positive_hist = np.zeros((n_classes, n_bins), dtype=np.int64)
+        self.negative_hist = np.zeros((n_classes, n_bins), dtype=np.int64)
+
+    def update(self, y_true, y_pred, proba: np.ndarray = None):
+        matrix, _ = confusion_matrix(y_true, y_pred, classes=self.classes)
+        self.matrix += matrix
+        self.rows += len(y_pred)
+        if proba is None:
+            return
+
+        sorter = np.argsort(self.classes)
+        true_codes = sorter[np.searchsorted(self.classes, y_true, sorter=sorter)]
+        eps = np.finfo(float).eps
+        clipped = np.clip(proba, eps, 1 - eps)
+        clipped = clipped / clipped.sum(axis=1, keepdims=True)
+        self.log_loss_sum -= np.log(
+            clipped[np.arange(len(true_codes)), true_codes]
+        ).sum()
+
+        bins = np.minimum((proba * self.n_bins).astype(int), self.n_bins - 1)
+        for k in range(proba.shape[1]):
+            is_positive = true_codes == k
+            self.positive_hist[k] += np.bincount(
+                bins[is_positive, k], minlength=self.n_bins
+            )
+            self.negative_hist[k] += np.bincount(
+                bins[~is_positive, k], minlength=self.n_bins
+            )
+
+    def _roc_auc(self, k: int) -> float:
+        positive, negative = self.positive_hist[k], self.negative_hist[k]
+        n_positive, n_negative = positive.sum(), negative.sum()
+        if not n_positive or not n_negative:
+            return float("nan")
+        # Positives outrank the negatives in lower bins and tie within their bin
+        negative_below = np.cumsum(negative) - negative
+        pairs = (positive * negative_below).sum() + 0.5 * (positive * negative).sum()
+        return float(pairs / (n_positive * n_negative))
+
+    def result(self) -> dict:
+        metrics = classification_metrics(self.matrix)
+        if self.positive_hist.any():
+            if len(self.classes) == 2:
+                metrics["roc_auc"] = self._roc_auc(1)
+            else:
+                metrics["roc_auc"] = float(
+                    np.mean([self._roc_auc(k) for k in range(len(self.classes))])
+                )
+            metrics["log_loss"] = float(self.log_loss_sum / self.rows)
+        return metrics
+
+
+def shadow_evaluate(
+    chunks: Iterator[pd.DataFrame],
+    models: dict,
+    label_column: str,
+    classes,
+    disagreement_writer=None,
+    transforms: dict = None,
+) -> dict:
+    """
+    Stream labeled chunks through every model in models (name -> fitted
+    classifier) and accumulate their metrics. transforms optionally maps a
+    model name to a function turning a chunk into that model's features,
+    e.g. its own preprocessor for raw chunks; by default a model gets the
+    chunk without the label column. The first model is compared
+    to the others row by row: rows where any prediction differs count as
+    disagreements and are appended to disagreement_writer (a
+    ParquetChunkWriter) with every model's prediction. Also reports the
+    prediction throughput of every model.
+    """
+    transforms = transforms or {}
+    metrics = {name: StreamingMetrics(classes) for name in models}
+    predict_seconds = {name: 0.0 for name in models}
+    rows, disagreements = 0, 0
+    for chunk in chunks:
+        y = chunk[label_column].to_numpy()
+        predictions = {}
+        for name, model in models.items():
+            if name in transforms:
+                X = transforms[name](chunk)
+            else:
+                X = chunk.drop(label_column, axis=1)
+            start = time.perf_counter()
+            if hasattr(model, "predict_proba"):
+                # Predictions follow from the probabilities, saving a pass
+                proba = model.predict_proba(X)
+                ypred = model.classes_[proba.argmax(axis=1)]
+            else:
+                proba, ypred = None, model.predict(X)
+            predict_seconds[name] += time.perf_counter() - start
+            metrics[name].update(y, ypred, proba)
+            predictions[name] = ypred
+
+        reference, *others = predictions.values()
+        disagree = np.zeros(len(chunk), dtype=bool)
+        for ypred in others:
+            disagree |= ypred != reference
+        rows += len(chunk)
+        disagreements += int(disagree.sum())
+        if disagreement_writer is not None and disagree.any():
+            disagreement_writer.write(
+                chunk[disagree].assign(
+                    **{
+                        f"prediction_{name}": ypred[disagree]
+                        for name, ypred in predictions.items()
+                    }
+                )
+            )
+
+    return {
+        "rows": rows,
+        "disagreements": disagreements,
+        "disagreement_rate": disagreements / rows if rows else 0.0,
+        "metrics": {name: metric.result() for name, metric in metrics.items()},
+        "throughput_rps": {
+            name: rows / seconds if seconds else 0.0
+            for name, seconds in predict_seconds.items()
+        },
+    }
@@ -0,0 +1,134 @@
+import tempfile
+
+import cloudpickle
+import mlrun
+import pandas as pd
+from mlrun.artifacts import get_model
+
+from src.functions.preprocessing import CompiledPreprocessor
+from src.functions.shadow import shadow_evaluate
+from src.functions.streaming import ParquetChunkWriter, read_chunks
+
+
+def load_tagged_model(context: mlrun.MLClientCtx, model_name: str, model_tag: str):
+    project = context.get_project_object()
+    try:
+        model_uri = project.get_artifact_uri(
+            key=model_name, category="model", tag=model_tag, iter=0
+        )
+        model_file, _, extra_data = get_model(model_uri, suffix=".pkl")
+    except mlrun.errors.MLRunNotFoundError:
+        return None, {}
+    with open(model_file, "rb") as f:
+        return cloudpickle.load(f), extra_data
+
+
+def load_transform(extra_data: dict, model_label: str, label_column: str):
+    """Chunk transform with the preprocessor logged alongside a model."""
+    if "preprocessor" not in extra_data:
+        raise ValueError(
+            f"The {model_label} has no 'preprocessor' extra data - raw_data needs "
+            "every model trained with the preprocessor logged alongside it"
+        )
+    with open(extra_data["preprocessor"].local(), "rb") as f:
+        compiled = CompiledPreprocessor(
+            cloudpickle.load(f), drop_columns=[label_column]
+        )
+
+    def transform(chunk: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(
+            data=compiled.transform_columns(chunk), columns=compiled.feature_names
+        )
+
+    return transform
+
+
+def shadow_evaluation(
+    context: mlrun.MLClientCtx,
+    dataset: mlrun.DataItem,
+    label_column: str,
+    model_name: str = "model",
+    challenger_model_tag: str = "challenger",
+    champion_model_tag: str = "champion",
+    raw_data: bool = False,
+    chunk_size: int = 100_000,
+    comparison_metric: str = "accuracy",
+    max_throughput_regression: float = 0.2,
+    fail_on_regression: bool = False,
+):
+    """Stream a large labeled dataset through the challenger and champion models
+
+    :param dataset:                   csv/parquet dataset, processed like the test set
+                                      unless raw_data
+    :param label_column:              name of the label column in dataset
+    :param model_name:                artifact key of the models
+    :param challenger_model_tag:      tag of the candidate model
+    :param champion_model_tag:        tag of the model in production
+    :param raw_data:                  apply every model's own preprocessor to dataset
+    :param chunk_size:                rows per chunk, bounds the memory use
+    :param comparison_metric:         metric the challenger must not be worse at
+    :param max_throughput_regression: allowed throughput decrease from the champion
+    :param fail_on_regression:        raise when the challenger should not be promoted
+    """
+    challenger, challenger_extra_data = load_tagged_model(
+        context, model_name, challenger_model_tag
+    )
+    champion, champion_extra_data = load_tagged_model(
+        context, model_name, champion_model_tag
+    )
+    models = {"challenger": challenger}
+    extra_data = {"challenger": challenger_extra_data}
+    if champion is not None:
+        models["champion"] = champion
+        extra_data["champion"] = champion_extra_data
+
+    # Raw chunks go through the preprocessor stored with each model, as the
+    # champion may have been trained with a different encoding
+    transforms = {}
+    if raw_data:
+        for name in models:
+            transforms[name] = load_transform(
+                extra_data[name], f"{name} model", label_column
+            )
+    chunks = read_chunks(dataset.local(), chunk_size)
+
+    disagreements_path = f"{tempfile.mkdtemp()}/disagreements.parquet"
+    with ParquetChunkWriter(disagreements_path) as writer:
+        report = shadow_evaluate(
+            chunks,
+            models,
+            label_column,
+            classes=challenger.classes_,
+            disagreement_writer=writer,
+            transforms=transforms,
+        )
+
+    # Log metrics and throughput per model
+    for model, metrics in report["metrics"].items():
+        for metric, value in metrics.items():
+            context.log_result(f"{metric}-{model}", value)
+        context.log_result(f"throughput_rps-{model}", report["throughput_rps"][model])
+    context.log_result("rows", report["rows"])
+    context.log_result("disagreement_rate", report["disagreement_rate"])
+    if writer.rows:
+        context.log_artifact(
+            "disagreements", local_path=disagreements_path, format="parquet"
+        )
+
+    # Promote when the challenger is at least as good and not much slower
+    promote = True
+    if champion is not None:
+        metrics, throughput = report["metrics"], report["throughput_rps"]
+        as_good = (
+            metrics["challenger"][comparison_metric]
+            >= metrics["champion"][comparison_metric]
+        )
+        fast_enough = throughput["challenger"] >= throughput["champion"] * (
+            1 - max_throughput_regression
+        )
+        promote = as_good and fast_enough
+    context.log_result("promote_challenger", promote)
+    if fail_on_regression and not promote:
+        raise ValueError(
+            f"Challenger regressed from champion on {report['rows']} shadow rows"
+        )
@@ -1,36 +1,170 @@
+import asyncio
+import hashlib
+import json
 import os
+import tempfile
 from random import choice, randint, uniform
 from time import sleep
 
+import numpy as np
 import pandas as pd
 import requests
 from mlrun.artifacts import get_model
 
+from src.functions.load_test import (
+    arrival_times,
+    run_open_loop_async,
+    trace_arrival_times,
+)
+from src.functions.request_bodies import BodyPool, load_rows
+
 PREDICT_ROUTE = "v2/models/model/predict"
 
+# Open-loop settings, read from the function env and overridable per event
+OPEN_LOOP_DEFAULTS = {
+    "arrival_process": "poisson",
+    "rate": 10.0,
+    "duration": 60.0,
+    "burst_size": 10,
+    "batch_size": 1,
+    "concurrency": 64,
+    "trace_path": "",
+    "trace_column": "timestamp",
+    "trace_speedup": 1.0,
+    "n_bodies": 1000,
+}
 
-def get_data(model_uri, dataset_name, label_column):
+
+def get_data_item(model_uri, dataset_name):
     *_, extra_data = get_model(model_uri)
-    data_uri = extra_data[dataset_name].url.replace("v3io:///", "/v3io/")
+    return extra_data[dataset_name]
+
+
+def get_data(model_uri, dataset_name, label_column):
+    data_uri = get_data_item(model_uri, dataset_name).url.replace("v3io:///", "/v3io/")
     df = pd.read_parquet(data_uri).drop(label_column, axis=1)
     return df.to_dict(orient="split")["data"]
 
 
+def get_rows(model_uri, dataset_name, label_column, mmap_dir=None):
+    # Read through the data item so the datastore credentials apply
+    data_item = get_data_item(model_uri, dataset_name)
+    mmap_path = None
+    if mmap_dir:
+        key = hashlib.sha1(f"{data_item.url}:{label_column}".encode()).hexdigest()
+        mmap_path = os.path.join(mmap_dir, f"test-rows-{key[:16]}.npy")
+    return load_rows(data_item, drop_columns=[label_column], mmap_path=mmap_path)
+
+
+def get_open_loop_params(event) -> dict:
+    params = {
+        key: type(default)(os.getenv(key, default))
+        for key, default in OPEN_LOOP_DEFAULTS.items()
+    }
+    body = event.body
+    if isinstance(body, (bytes, str)) and body:
+        body = json.loads(body)
+    if isinstance(body, dict):
+        params.update(
+            {
+                key: type(OPEN_LOOP_DEFAULTS[key])(value)
+                for key, value in body.items()
+                if key in OPEN_LOOP_DEFAULTS
+            }
+        )
+    return params
+
+
+def get_arrivals(params: dict) -> np.ndarray:
+    if params["trace_path"]:
+        read = pd.read_parquet if ".parquet" in params["trace_path"] else pd.read_csv
+        trace = read(params["trace_path"], columns=[params["trace_column"]])
+        return trace_arrival_times(
+            trace[params["trace_column"]], speedup=params["trace_speedup"]
+        )
+    return arrival_times(
+        n_requests=int(params["rate"] * params["duration"]),
+        rate=params["rate"],
+        process=params["arrival_process"],
+        burst_size=params["burst_size"],
+    )
+
+
+def get_bodies(context, batch_size: int, n_bodies: int) -> BodyPool:
+    # Encoded once up front so sending a request does no JSON work
+    bodies = getattr(context, "bodies", None)
+    if bodies is None or bodies.batch_size != batch_size or len(bodies) < n_bodies:
+        bodies = BodyPool(np.asarray(context.test_data), batch_size, n_bodies)
+        context.bodies = bodies
+    return bodies
+
+
 def init_context(context):
     context.addr = os.getenv("addr")
-    context.test_data = get_data(
-        model_uri=os.getenv("model_uri"),
-        dataset_name=os.getenv("dataset_name"),
-        label_column=os.getenv("label_column"),
+    context.mode = os.getenv("mode", "random")
+    # "list" keeps rows as python lists, "array" as one NumPy array and
+    # "mmap" memory-maps them from a local .npy shared by workers on the node
+    data_format = os.getenv("data_format", "list")
+    data_params = {
+        "model_uri": os.getenv("model_uri"),
+        "dataset_name": os.getenv("dataset_name"),
+        "label_column": os.getenv("label_column"),
+    }
+    if data_format == "list":
+        context.test_data = get_data(**data_params)
+        return
+
+    mmap_dir = None
+    if data_format == "mmap":
+        mmap_dir = os.getenv("mmap_dir", tempfile.gettempdir())
+    context.test_data = get_rows(**data_params, mmap_dir=mmap_dir)
+    context.bodies = BodyPool(
+        context.test_data,
+        batch_size=int(os.getenv("batch_size", OPEN_LOOP_DEFAULTS["batch_size"])),
+        n_bodies=int(os.getenv("n_bodies", OPEN_LOOP_DEFAULTS["n_bodies"])),
+    )
+
+
+async def open_loop_handler(context, event):
+    params = get_open_loop_params(event)
+    arrivals = get_arrivals(params)
+    bodies = get_bodies(
+        context,
+        batch_size=params["batch_size"],
+        n_bodies=min(params["n_bodies"], len(arrivals)),
+    )
+    # Awaited, nuclio calls handlers from its own running event loop
+    load = await run_open_loop_async(
+        url=f"{context.addr}/{PREDICT_ROUTE}",
+        bodies=bodies,
+        arrivals=arrivals,
+        concurrency=params["concurrency"],
     )
+    summary = load["summary"]
+    context.logger.info(f"Open-loop traffic summary: {summary}")
+    return summary
 
 
-def handler(context, event):
+def closed_loop_traffic(context):
+    bodies = getattr(context, "bodies", None)
     for i in range(randint(10, 30)):
-        data_point = choice(context.test_data)
-        resp = requests.post(
-            url=f"{context.addr}/{PREDICT_ROUTE}", json={"inputs": [data_point]}
-        )
+        url = f"{context.addr}/{PREDICT_ROUTE}"
+        if bodies is not None:
+            resp = requests.post(
+                url=url,
+                data=bodies[randint(0, len(bodies) - 1)],
+                headers={"Content-Type": "application/json"},
+            )
+        else:
+            data_point = choice(context.test_data)
+            resp = requests.post(url=url, json={"inputs": [data_point]})
         print(resp.json())
         sleep(uniform(0.2, 1.7))
     return
+
+
+async def handler(context, event):
+    if context.mode == "open_loop":
+        return await open_loop_handler(context, event)
+    # Blocking requests and sleeps run in a thread to keep the event loop free
+    return await asyncio.to_thread(closed_loop_traffic, context)
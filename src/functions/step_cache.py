@@ -0,0 +1,247 @@
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import cloudpickle
+import pandas as pd
+
+from src.functions.hashing import content_hash, file_hash
+
+# Context calls recorded on a miss and replayed on a hit
+RECORDED_CALLS = ["log_result", "log_results", "log_artifact", "log_dataset"]
+
+# Packages whose version changes what a step computes
+KEY_PACKAGES = ["pandas", "scikit-learn", "pandera", "deepchecks"]
+
+
+def value_hash(value) -> str:
+    """Content hash of a step argument: frames by value, data items by file."""
+    if isinstance(value, pd.DataFrame):
+        return content_hash(value)
+    if hasattr(value, "local"):
+        return file_hash(value.local())
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=repr).encode()
+    ).hexdigest()
+
+
+def package_versions() -> str:
+    versions = []
+    for package in KEY_PACKAGES:
+        try:
+            versions.append(f"{package}=={importlib.metadata.version(package)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{package} missing")
+    return ";".join(versions)
+
+
+@functools.lru_cache(maxsize=None)
+def source_files(fn: Callable) -> tuple:
+    """
+    Source files of the module of fn and of the repo-local modules it
+    imports, directly or through other repo-local modules. The repo root is
+    the directory holding the top-level package of fn's module.
+    """
+    fn_file = Path(inspect.getsourcefile(fn)).resolve()
+    root = fn_file.parents[fn.__module__.count(".")]
+    files, seen = {fn_file}, {fn.__module__}
+    namespaces = [fn.__globals__]
+    while namespaces:
+        for value in namespaces.pop().values():
+            if inspect.ismodule(value):
+                module = value
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                module = sys.modules.get(value.__module__)
+            else:
+                continue
+            if module is None or module.__name__ in seen:
+                continue
+            seen.add(module.__name__)
+            module_file = getattr(module, "__file__", None)
+            if not module_file:
+                continue
+            path = Path(module_file).resolve()
+            if root in path.parents and "site-packages" not in path.parts:
+                files.add(path)
+                namespaces.append(vars(module))
+    return tuple(sorted(files))
+
+
+def step_key(fn: Callable, arguments: dict) -> str:
+    """
+    Key of a step run from the source of its module and the repo-local
+    modules it imports, the versions of KEY_PACKAGES, its name and argument
+    hashes.
+    """
+    digest = hashlib.sha256()
+    for path in source_files(fn):
+        digest.update(path.read_bytes())
+    digest.update(package_versions().encode())
+    digest.update(fn.__qualname__.encode())
+    for name in sorted(arguments):
+        digest.update(f"{name}={value_hash(arguments[name])}".encode())
+    return digest.hexdigest()
+
+
+class LocalStepCache:
+    """
+    On-disk cache of step outputs, one directory per key holding the
+    pickled return value, the recorded context calls and copies of the
+    logged artifact files. Entries are evicted least recently used first
+    once the cache exceeds max_size_mb, and after max_age_days.
+    """
+
+    def __init__(
+        self, cache_dir: str, max_size_mb: float = 10240, max_age_days: float = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age_days * 24 * 3600 if max_age_days else None
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self.cache_dir / key
+        try:
+            # Mark entry as recently used
+            os.utime(path)
+            with open(path / "entry.pkl", "rb") as f:
+                entry = cloudpickle.load(f)
+        except FileNotFoundError:
+            return None
+        entry["dir"] = str(path)
+        return entry
+
+    def staging_dir(self) -> str:
+        return tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+
+    def put(self, key: str, staging_dir: str, returns, calls: list):
+        with open(f"{staging_dir}/entry.pkl", "wb") as f:
+            cloudpickle.dump({"returns": returns, "calls": calls}, f)
+        # Rename the complete entry into place so readers never see a partial one
+        path = self.cache_dir / key
+        try:
+            os.rename(staging_dir, path)
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None):
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix == ".tmp" or not path.is_dir():
+                continue
+            size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+            entries.append((path.stat().st_mtime, size, path))
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        for mtime, size, path in sorted(entries):
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if path.name == keep or (total <= self.max_size and not expired):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+class RecordingContext:
+    """
+    Proxy of an MLRun context that records log calls, copying logged
+    artifact files into the cache staging directory.
+    """
+
+    def __init__(self, context, staging_dir: str):
+        self._context = context
+        self._staging_dir = staging_dir
+        self.calls = []
+
+    def __getattr__(self, name):
+        attribute = getattr(self._context, name)
+        if name not in RECORDED_CALLS:
+            return attribute
+
+        def record(*args, **kwargs):
+            recorded = dict(kwargs)
+            local_path = kwargs.get("local_path")
+            if local_path and os.path.isfile(local_path):
+                key = args[0] if args else kwargs["key"]
+                cached_path = f"{self._staging_dir}/{key}{Path(local_path).suffix}"
+                shutil.copyfile(local_path, cached_path)
+                recorded["local_path"] = os.path.basename(cached_path)
+            self.calls.append((name, args, recorded))
+            return attribute(*args, **kwargs)
+
+        return record
+
+
+def replay(context, entry: dict):
+    for name, args, kwargs in entry["calls"]:
+        if "local_path" in kwargs:
+            kwargs = {**kwargs, "local_path": f"{entry['dir']}/{kwargs['local_path']}"}
+        getattr(context, name)(*args, **kwargs)
+
+
+def memoize_step(get_cache: Callable[[Any], Optional[LocalStepCache]]):
+    """
+    Memoize a workflow step handler on its code, params and input hashes.
+    On a hit the cached return value is returned and the context log calls
+    of the original run are replayed, without running the step. get_cache
+    returns the cache to use, or None to always run the step.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            context = arguments.pop("context", None)
+            cache = get_cache(context)
+            if cache is None:
+                return fn(*args, **kwargs)
+
+            key = step_key(fn, arguments)
+
+            entry = cache.get(key)
+            if entry is not None:
+                if context is not None:
+                    replay(context, entry)
+                return entry["returns"]
+
+            staging_dir = cache.staging_dir()
+            try:
+                if context is not None:
+                    context = RecordingContext(context, staging_dir)
+                    bound.arguments["context"] = context
+                returns = fn(*bound.args, **bound.kwargs)
+            except BaseException:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+            cache.put(key, staging_dir, returns, context.calls if context else [])
+            return returns
+
+        return wrapper
+
+    return decorator
+
+
+def workflow_step_cache(context) -> Optional[LocalStepCache]:
+    """Cache set by the step_cache_* params of the handler's MLRun run, if any."""
+    cache_dir = context.get_param("step_cache_dir") if context else None
+    if not cache_dir:
+        return None
+    return LocalStepCache(
+        cache_dir,
+        max_size_mb=context.get_param("step_cache_max_mb", 10240),
+        max_age_days=context.get_param("step_cache_max_age_days"),
+    )
@@ -0,0 +1,134 @@
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pyarrow
+import pyarrow.parquet as pq
+
+
+def read_chunks(
+    path: str, chunk_size: int = 0, dtype: dict = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet source in batches of chunk_size rows, keeping a
+    continuous row index across chunks. chunk_size=0 reads it in one piece.
+    """
+    if path.endswith((".parquet", ".pq")):
+        if not chunk_size:
+            yield pd.read_parquet(path)
+            return
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            chunk = batch.to_pandas()
+            chunk.index += offset
+            offset += len(chunk)
+            yield chunk
+    elif not chunk_size:
+        yield pd.read_csv(path, dtype=dtype)
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=dtype)
+
+
+def read_dtypes(schema: pa.DataFrameSchema) -> dict:
+    """
+    Read dtypes for float and string schema columns, so a chunk that happens
+    to hold only whole numbers is not inferred as int.
+    """
+    dtypes = {}
+    for name, column in schema.columns.items():
+        if str(column.dtype).startswith("float"):
+            dtypes[name] = str(column.dtype)
+        elif str(column.dtype) == "str":
+            dtypes[name] = "object"
+    return dtypes
+
+
+def split_chunks(
+    chunks: Iterator[pd.DataFrame], test_size: float, random_state: int = 42
+) -> Iterator[tuple]:
+    """
+    Randomly assign each row of every chunk to train or test. The same chunks
+    and random_state always produce the same split, so it can be replayed
+    over several passes.
+    """
+    rng = np.random.default_rng(random_state)
+    for chunk in chunks:
+        is_test = rng.random(len(chunk)) < test_size
+        yield chunk[~is_test], chunk[is_test]
+
+
+def fit_vocabularies(chunks: Iterator[pd.DataFrame], columns: list) -> dict:
+    """Sorted categories of each column across all chunks, like OneHotEncoder."""
+    vocabularies = {column: set() for column in columns}
+    for chunk in chunks:
+        for column in columns:
+            vocabularies[column].update(chunk[column].unique())
+    return {column: sorted(values) for column, values in vocabularies.items()}
+
+
+class ParquetChunkWriter:
+    """Append DataFrame chunks to a single Parquet file with a fixed schema."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.writer = None
+        self.rows = 0
+
+    def write(self, chunk: pd.DataFrame):
+        table = pyarrow.Table.from_pandas(
+            chunk,
+            schema=self.writer.schema if self.writer else None,
+            preserve_index=False,
+        )
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def validate_to_parquet(
+    chunks: Iterator[pd.DataFrame],
+    schema: pa.DataFrameSchema,
+    output_path: str,
+    validator=None,
+) -> int:
+    """
+    Validate each chunk lazily against schema and append valid chunks to
+    output_path. Errors from all chunks are merged into one SchemaErrors,
+    raised once every chunk has been checked. Returns the number of rows.
+    validator replaces the schema's own validate, e.g. a ColumnarValidator.
+    """
+    validator = validator or schema
+    schema_errors = []
+    with ParquetChunkWriter(output_path) as writer:
+        for chunk in chunks:
+            try:
+                validator.validate(chunk, lazy=True)
+            except pa.errors.SchemaErrors as err:
+                schema_errors.extend(err.schema_errors)
+
+            # Keep validating after the first failure, but stop writing output
+            if not schema_errors:
+                writer.write(chunk)
+
+    if schema_errors:
+        # Chunks are not kept, so the report carries an empty frame as its data
+        raise pa.errors.SchemaErrors(
+            schema=schema,
+            schema_errors=schema_errors,
+            data=pd.DataFrame(columns=list(schema.columns)),
+        )
+    if not writer.rows:
+        raise ValueError("No rows found in data source")
+    return writer.rows
@@ -0,0 +1,178 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from deepchecks.core.suite import SuiteResult
+from deepchecks.tabular import Dataset, Suite
+from deepchecks.tabular.feature_importance import calculate_feature_importance
+
+from src.functions.validation_session import ValidationSession
+
+# Checks whose runtime grows fastest with the number of rows
+HEAVY_CHECKS = [
+    "BoostingOverfit",
+    "ConflictingLabels",
+    "DataDuplicates",
+    "FeatureFeatureCorrelation",
+    "MultivariateDrift",
+    "OutlierSampleDetection",
+    "SimpleModelComparison",
+    "TrainTestSamplesMix",
+    "UnusedFeatures",
+    "WeakSegmentsPerformance",
+]
+
+# Checks that inspect the fitted estimator itself, so they get the model
+# instead of the shared predictions
+ESTIMATOR_CHECKS = ["BoostingOverfit", "ModelInferenceTime", "ModelInfo"]
+
+# Full and sampled check inputs, set once per worker process
+_run_inputs = {}
+
+
+def _set_run_inputs(full_inputs: dict, sampled_inputs: dict):
+    _run_inputs["full"] = full_inputs
+    _run_inputs["sampled"] = sampled_inputs
+
+
+def _run_check(suite_name: str, check, sampled: bool) -> tuple:
+    start = time.perf_counter()
+    inputs = dict(_run_inputs["sampled" if sampled else "full"])
+    predictions = inputs.pop("predictions", {})
+    if predictions and type(check).__name__ not in ESTIMATOR_CHECKS:
+        # deepchecks only uses the given predictions when no model is passed
+        inputs = {**inputs, **predictions, "model": None}
+    # A single check suite keeps the Suite handling of train/test/model checks
+    results = Suite(suite_name, check).run(**inputs).results
+    return results, time.perf_counter() - start
+
+
+def _predict(model, datasets: dict) -> dict:
+    """Predictions and probabilities of model, keyed by the Suite.run argument."""
+    predictions = {}
+    for name, dataset in datasets.items():
+        split = name.split("_")[0]
+        features = dataset.features_columns
+        y_pred = pd.Series(model.predict(features), index=features.index)
+        predictions[f"y_pred_{split}"] = y_pred
+        if hasattr(model, "predict_proba"):
+            y_proba = pd.DataFrame(model.predict_proba(features), index=features.index)
+            predictions[f"y_proba_{split}"] = y_proba
+    return predictions
+
+
+def _select_rows(predictions: dict, datasets: dict) -> dict:
+    """Rows of the full dataset predictions that belong to the given datasets."""
+    selected = {}
+    for key, values in predictions.items():
+        rows = datasets[f"{key.split('_')[-1]}_dataset"].data.index
+        selected[key] = values.loc[rows].to_numpy()
+    return selected
+
+
+def _shares_predictions(datasets: dict) -> bool:
+    # deepchecks matches given predictions to rows by index and renames the
+    # dataset index when train and test overlap, so only share on unique ones
+    first, *others = [dataset.data.index for dataset in datasets.values()]
+    return first.append(others).is_unique
+
+
+def _model_inputs(model, datasets: dict, sampled_datasets: dict) -> tuple:
+    """
+    Compute the model predictions and feature importance once, so every
+    check reuses them instead of its own deepchecks context recomputing them.
+    """
+    feature_importance = None
+    train = datasets.get("train_dataset")
+    if isinstance(train, Dataset) and train.has_label():
+        feature_importance = calculate_feature_importance(model, train)
+    full = {"feature_importance": feature_importance}
+    sampled = dict(full)
+    if _shares_predictions(datasets):
+        predictions = _predict(model, datasets)
+        model_classes = getattr(model, "classes_", None)
+        model_classes = None if model_classes is None else list(model_classes)
+        full["predictions"] = {
+            **_select_rows(predictions, datasets),
+            "model_classes": model_classes,
+        }
+        sampled["predictions"] = {
+            **_select_rows(predictions, sampled_datasets),
+            "model_classes": model_classes,
+        }
+    return full, sampled
+
+
+def run_suite(
+    suite: Suite,
+    session: ValidationSession,
+    train_dataset: pd.DataFrame = None,
+    test_dataset: pd.DataFrame = None,
+    model=None,
+    n_workers: int = 1,
+    sample_rows: int = 0,
+    heavy_checks: list = None,
+    random_state: int = 42,
+) -> tuple:
+    """
+    Run a deepchecks suite. Without n_workers > 1 or sample_rows this is a
+    plain suite.run, which shares one deepchecks context across the checks.
+    Otherwise the checks run one by one, across a pool of n_workers processes
+    when n_workers > 1, and with sample_rows the heavy checks (HEAVY_CHECKS
+    by default) run on stratified samples of at most sample_rows rows and are
+    labelled as sampled. Model predictions and feature importance are then
+    computed once up front and passed to every check.
+
+    Returns the merged SuiteResult and the seconds spent in every check, or
+    in the whole suite under "total" when it ran in one go.
+    """
+    heavy_checks = HEAVY_CHECKS if heavy_checks is None else heavy_checks
+    frames = {"train_dataset": train_dataset, "test_dataset": test_dataset}
+    frames = {name: df for name, df in frames.items() if df is not None}
+    datasets = {name: session.dataset(df) for name, df in frames.items()}
+    if n_workers <= 1 and not sample_rows:
+        start = time.perf_counter()
+        suite_result = suite.run(**datasets, model=model)
+        return suite_result, {"total": round(time.perf_counter() - start, 3)}
+
+    sampled_datasets = datasets
+    if sample_rows:
+        sampled_datasets = {
+            name: session.sampled_dataset(df, sample_rows, random_state)
+            for name, df in frames.items()
+        }
+    full_inputs = {**datasets, "model": model}
+    sampled_inputs = {**sampled_datasets, "model": model}
+    if model is not None:
+        full_model_inputs, sampled_model_inputs = _model_inputs(
+            model, datasets, sampled_datasets
+        )
+        full_inputs.update(full_model_inputs)
+        sampled_inputs.update(sampled_model_inputs)
+
+    checks = list(suite.checks.values())
+    sampled = [bool(sample_rows) and type(c).__name__ in heavy_checks for c in checks]
+    if n_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_set_run_inputs,
+            initargs=(full_inputs, sampled_inputs),
+        ) as pool:
+            check_runs = list(
+                pool.map(_run_check, [suite.name] * len(checks), checks, sampled)
+            )
+    else:
+        _set_run_inputs(full_inputs, sampled_inputs)
+        check_runs = [
+            _run_check(suite.name, check, is_sampled)
+            for check, is_sampled in zip(checks, sampled)
+        ]
+
+    results, check_timings = [], {}
+    for check, is_sampled, (check_results, seconds) in zip(checks, sampled, check_runs):
+        if is_sampled:
+            for result in check_results:
+                result.header = f"{result.get_header()} (sampled {sample_rows} rows)"
+        results.extend(check_results)
+        check_timings[type(check).__name__] = round(seconds, 3)
+    return SuiteResult(suite.name, results), check_timings
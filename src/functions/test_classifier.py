@@ -1,27 +1,24 @@
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import mlrun
-import numpy as np
 import pandas as pd
-import sklearn
 from cloudpickle import load
 from github import Github
 from mlrun.artifacts import get_model, update_model
 
+from src.functions.evaluation import evaluate, evaluate_models
+from src.functions.model_profile import get_profile_metrics
+from src.functions.profiling import check_profile
+
 warnings.filterwarnings("ignore")
 
 
 def eval_model(context, xtest, ytest, model):
     ypred = model.predict(xtest)
-    metrics = {
-        "accuracy": float(sklearn.metrics.accuracy_score(ytest, ypred)),
-        "test-error": np.sum(ytest != ypred) / ytest.shape[0],
-        "f1": float(sklearn.metrics.f1_score(ytest, ypred, average="macro")),
-        "precision": float(
-            sklearn.metrics.precision_score(ytest, ypred, average="macro")
-        ),
-        "recall": float(sklearn.metrics.recall_score(ytest, ypred, average="macro")),
-    }
+    # All metrics from one confusion matrix and one predict_proba pass
+    proba = model.predict_proba(xtest) if hasattr(model, "predict_proba") else None
+    metrics = evaluate(ytest, ypred, proba, classes=getattr(model, "classes_", None))
     return ypred, metrics
 
 
@@ -31,10 +28,13 @@ def format_issue(model_name, models):
     body += f"    - F1: {models[model_name]['metrics']['f1']}\n"
     body += f"    - Precision: {models[model_name]['metrics']['precision']}\n"
     body += f"    - Recall: {models[model_name]['metrics']['recall']}\n"
+    profile = models[model_name].get("profile", {})
+    if "single_row_p50_ms" in profile:
+        body += f"    - Single row latency (ms): {profile['single_row_p50_ms']}\n"
     return body
 
 
-def create_issue(context, models, comparison_metric):
+def create_issue(context, models, comparison_metric, max_cost_regression=None):
     deploy_new_model = True
 
     # Format GitHub issue with train run results
@@ -46,6 +46,18 @@ def create_issue(context, models, comparison_metric):
             > models["existing_model"]["metrics"][comparison_metric]
         )
 
+        # Weigh the accuracy gain against the serving cost recorded by profiling
+        if max_cost_regression is not None:
+            violations = check_profile(
+                models["new_model"].get("profile", {}),
+                models["existing_model"].get("profile", {}),
+                max_latency_regression=max_cost_regression,
+                max_throughput_regression=max_cost_regression,
+            )
+            if violations:
+                body += f"  - Serving cost regressions: {'; '.join(violations)}\n"
+                deploy_new_model = False
+
     # Authenticate repo
     g = Github(login_or_token=mlrun.get_secret_or_env("MY_GITHUB_TOKEN"))
     repo = g.get_organization("igz-us-sales").get_repo("mlrun-github-actions-demo")
@@ -69,6 +81,52 @@ def trigger_deployment(context, repo, model_path):
     context.logger.info(deploy_workflow)
 
 
+def load_model_file(model_path):
+    try:
+        model_file, *_ = get_model(model_path, suffix=".pkl")
+    except Exception:
+        raise Exception("model location likely specified")
+    return model_file
+
+
+def predictions_frame(xtest, ytest, ypred, predictions_column) -> pd.DataFrame:
+    # Get test set column names
+    if ypred.ndim == 1 or ypred.shape[1] == 1:
+        score_names = [predictions_column]
+    else:
+        score_names = [f"{predictions_column}_" + str(x) for x in range(ypred.shape[1])]
+    return pd.concat([xtest, ytest, pd.DataFrame(ypred, columns=score_names)], axis=1)
+
+
+def upload_evaluation(df, target_path, model_path, metrics, model_update):
+    # Runs in the background - only touches the datastore and the model artifact
+    if model_update is True:
+        update_model(model_path, metrics=metrics, key_prefix="validation-")
+    mlrun.get_dataitem(target_path).put(df.to_parquet(index=False))
+
+
+def log_model_evaluation(
+    context,
+    model_name,
+    model_path,
+    xtest,
+    ytest,
+    ypred,
+    metrics,
+    predictions_column,
+    model_update,
+):
+    # Update model artifact with metrics
+    if model_update is True:
+        update_model(model_path, metrics=metrics, key_prefix="validation-")
+
+    # Log test set predictions
+    df = predictions_frame(xtest, ytest, ypred, predictions_column)
+    context.log_dataset(
+        f"test_set_preds-{model_name}", df=df, format="parquet", index=False
+    )
+
+
 def test_classifier(
     context,
     new_model_path,
@@ -78,6 +136,8 @@ def test_classifier(
     post_github: bool = False,
     predictions_column: str = "yscore",
     model_update=True,
+    concurrent: bool = False,
+    max_cost_regression: float = None,
 ) -> None:
     # Load test data
     print(test_set)
@@ -94,46 +154,91 @@ def test_classifier(
             "model_path": context.get_param("existing_model_path")
         }
 
-    for model_name, model_config in models.items():
-        # Load model
-        try:
-            model_file, model_obj, _ = get_model(
-                model_config["model_path"], suffix=".pkl"
-            )
+    if concurrent:
+        evaluate_concurrently(
+            context, models, xtest, ytest, predictions_column, model_update
+        )
+    else:
+        for model_name, model_config in models.items():
+            # Load model
+            model_file = load_model_file(model_config["model_path"])
             model_obj = load(open(model_file, "rb"))
-        except Exception:
-            raise Exception("model location likely specified")
 
-        # Evalaute
-        ypred, metrics = eval_model(context, xtest, ytest.values, model_obj)
-        models[model_name]["metrics"] = metrics
+            # Evalaute
+            ypred, metrics = eval_model(context, xtest, ytest.values, model_obj)
+            models[model_name]["metrics"] = metrics
 
-        # Log metrics per model
-        for metric, value in metrics.items():
-            context.log_result(f"{metric}-{model_name}", value)
+            # Log metrics per model
+            for metric, value in metrics.items():
+                context.log_result(f"{metric}-{model_name}", value)
 
-        # Update model artifact with metrics
-        if model_obj and model_update is True:
-            update_model(
+            log_model_evaluation(
+                context,
+                model_name,
                 model_config["model_path"],
-                metrics=metrics,
-                key_prefix="validation-",
+                xtest,
+                ytest,
+                ypred,
+                metrics,
+                predictions_column,
+                model_update,
             )
 
-        # Get test set column names
-        if ypred.ndim == 1 or ypred.shape[1] == 1:
-            score_names = [predictions_column]
-        else:
-            score_names = [
-                f"{predictions_column}_" + str(x) for x in range(ypred.shape[1])
-            ]
+    # Create GitHub issue for run
+    if post_github:
+        for model_config in models.values():
+            model_config["profile"] = get_profile_metrics(model_config["model_path"])
+        create_issue(context, models, comparison_metric, max_cost_regression)
+
+
+def evaluate_concurrently(
+    context, models, xtest, ytest, predictions_column, model_update
+):
+    # Download both models at once, then predict in one worker process per model
+    with ThreadPoolExecutor(max_workers=len(models)) as pool:
+        model_files = dict(
+            zip(
+                models,
+                pool.map(
+                    load_model_file,
+                    [config["model_path"] for config in models.values()],
+                ),
+            )
+        )
+    evaluations = evaluate_models(model_files, xtest, ytest.values)
+
+    # Upload predictions and metric updates in the background, while results
+    # are logged on the main thread - the run context is not thread safe
+    with ThreadPoolExecutor(max_workers=len(models)) as pool:
+        uploads, datasets = [], {}
+        for model_name, (ypred, metrics) in evaluations.items():
+            models[model_name]["metrics"] = metrics
+            df = predictions_frame(xtest, ytest, ypred, predictions_column)
+            key = f"test_set_preds-{model_name}"
+            target_path = f"{context.artifact_path}/{key}.parquet"
+            datasets[key] = (df, target_path)
+            uploads.append(
+                pool.submit(
+                    upload_evaluation,
+                    df,
+                    target_path,
+                    models[model_name]["model_path"],
+                    metrics,
+                    model_update,
+                )
+            )
+            for metric, value in metrics.items():
+                context.log_result(f"{metric}-{model_name}", value)
+        for upload in uploads:
+            upload.result()
 
-        # Log test set predictions
-        df = pd.concat([xtest, ytest, pd.DataFrame(ypred, columns=score_names)], axis=1)
+    # Register the uploaded predictions without writing them again
+    for key, (df, target_path) in datasets.items():
         context.log_dataset(
-            f"test_set_preds-{model_name}", df=df, format="parquet", index=False
+            key,
+            df=df,
+            format="parquet",
+            index=False,
+            target_path=target_path,
+            upload=False,
         )
-
-    # Create GitHub issue for run
-    if post_github:
-        create_issue(context, models, comparison_metric)
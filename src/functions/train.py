@@ -1,11 +1,87 @@
+import tempfile
+
+import cloudpickle
 import mlrun
 import pandas as pd
 from mlrun.frameworks.sklearn import apply_mlrun
 from sklearn import ensemble
 
+from src.functions.evaluation import evaluate
+from src.functions.forest import CompactForest
+from src.functions.search import (
+    successive_halving,
+    truncate_forest,
+    warm_start_checkpoints,
+)
+
+
+def fit_and_log_model(
+    context: mlrun.MLClientCtx,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    model_params: dict,
+    preprocessor: mlrun.DataItem = None,
+    export_compact: bool = False,
+    fitted_model: ensemble.RandomForestClassifier = None,
+) -> ensemble.RandomForestClassifier:
+    # Pick an ideal ML model, unless one was already fitted
+    model = fitted_model or ensemble.RandomForestClassifier(**model_params)
+
+    # Store the process_data preprocessor with the model so both can be served as one unit
+    extra_data = {"preprocessor": preprocessor} if preprocessor is not None else None
+
+    if fitted_model is None:
+        # Wrap our model with Mlrun features, specify the test dataset for analysis and accuracy measurements
+        apply_mlrun(
+            model,
+            model_name="model",
+            x_test=X_test,
+            y_test=y_test,
+            extra_data=extra_data,
+        )
+
+        # Train our model
+        model.fit(X_train, y_train)
+    else:
+        # A fitted model is logged directly, with metrics computed on the test set
+        metrics = evaluate(
+            y_test,
+            model.predict(X_test),
+            model.predict_proba(X_test),
+            classes=model.classes_,
+        )
+        context.log_results(metrics)
+        context.log_model(
+            "model",
+            body=cloudpickle.dumps(model),
+            model_file="model.pkl",
+            framework="sklearn",
+            algorithm=type(model).__name__,
+            metrics=metrics,
+            parameters=model.get_params(),
+            training_set=pd.concat([X_train, y_train], axis=1),
+            label_column=y_train.name,
+            extra_data=extra_data,
+        )
+
+    # Export array-backed node tables for fast loading and vectorized predict
+    if export_compact:
+        compact_file = f"{tempfile.mkdtemp()}/model.npy"
+        CompactForest.from_sklearn(model).save(compact_file)
+        context.log_model(
+            "model_compact",
+            model_file=compact_file,
+            framework="numpy",
+            extra_data=extra_data,
+        )
+    return model
+
 
 @mlrun.handler()
 def train_model(
+    context: mlrun.MLClientCtx,
     train: pd.DataFrame,
     test: pd.DataFrame,
     label_column: str,
@@ -14,6 +90,8 @@ def train_model(
     min_samples_leaf: int,
     min_samples_split: int,
     n_estimators: int,
+    preprocessor: mlrun.DataItem = None,
+    export_compact: bool = False,
 ):
     # X, y split
     X_train = train.drop(label_column, axis=1)
@@ -21,17 +99,140 @@ def train_model(
     X_test = test.drop(label_column, axis=1)
     y_test = test[label_column]
 
-    # Pick an ideal ML model
-    model = ensemble.RandomForestClassifier(
-        bootstrap=bootstrap,
-        max_depth=max_depth,
-        min_samples_leaf=min_samples_leaf,
-        min_samples_split=min_samples_split,
-        n_estimators=n_estimators,
+    fit_and_log_model(
+        context,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        model_params={
+            "bootstrap": bootstrap,
+            "max_depth": max_depth,
+            "min_samples_leaf": min_samples_leaf,
+            "min_samples_split": min_samples_split,
+            "n_estimators": n_estimators,
+        },
+        preprocessor=preprocessor,
+        export_compact=export_compact,
     )
 
-    # Wrap our model with Mlrun features, specify the test dataset for analysis and accuracy measurements
-    apply_mlrun(model, model_name="model", x_test=X_test, y_test=y_test)
 
-    # Train our model
-    model.fit(X_train, y_train)
+@mlrun.handler()
+def train_model_search(
+    context: mlrun.MLClientCtx,
+    train: pd.DataFrame,
+    test: pd.DataFrame,
+    label_column: str,
+    param_grid: dict,
+    n_candidates: int = 27,
+    halving_factor: int = 3,
+    n_workers: int = None,
+    preprocessor: mlrun.DataItem = None,
+    export_compact: bool = False,
+):
+    # X, y split
+    X_train = train.drop(label_column, axis=1)
+    y_train = train[label_column]
+    X_test = test.drop(label_column, axis=1)
+    y_test = test[label_column]
+
+    # Successive halving search in a local process pool
+    search = successive_halving(
+        X_train.values,
+        y_train.values,
+        X_test.values,
+        y_test.values,
+        param_grid=param_grid,
+        n_candidates=n_candidates,
+        factor=halving_factor,
+        n_workers=n_workers,
+    )
+    context.logger.info(f"Selected {search['best_params']}")
+    context.log_result("search_wall_seconds", search["wall_seconds"])
+    context.log_result("search_cpu_seconds", search["cpu_seconds"])
+    context.log_result("search_best_accuracy", search["best_accuracy"])
+    context.log_dataset(
+        "search_results",
+        df=pd.DataFrame(search["results"]),
+        format="parquet",
+        index=False,
+    )
+
+    # Refit the selected configuration and log it as the model
+    fit_and_log_model(
+        context,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        model_params=search["best_params"],
+        preprocessor=preprocessor,
+        export_compact=export_compact,
+    )
+
+
+@mlrun.handler()
+def train_model_warm_start(
+    context: mlrun.MLClientCtx,
+    train: pd.DataFrame,
+    test: pd.DataFrame,
+    label_column: str,
+    bootstrap: bool,
+    max_depth: int,
+    min_samples_leaf: int,
+    min_samples_split: int,
+    n_estimators: list,
+    preprocessor: mlrun.DataItem = None,
+    export_compact: bool = False,
+):
+    # X, y split
+    X_train = train.drop(label_column, axis=1)
+    y_train = train[label_column]
+    X_test = test.drop(label_column, axis=1)
+    y_test = test[label_column]
+
+    # Grow one forest through every n_estimators checkpoint instead of refitting
+    model, checkpoints = warm_start_checkpoints(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        params={
+            "bootstrap": bootstrap,
+            "max_depth": max_depth,
+            "min_samples_leaf": min_samples_leaf,
+            "min_samples_split": min_samples_split,
+        },
+        estimators=n_estimators,
+    )
+    for checkpoint in checkpoints:
+        context.log_result(
+            f"accuracy-{checkpoint['n_estimators']}", checkpoint["accuracy"]
+        )
+        context.log_result(
+            f"fit_seconds-{checkpoint['n_estimators']}", checkpoint["fit_seconds"]
+        )
+
+    # Fit time of separate models, estimated from the cost per tree of the warm start
+    fit_seconds = checkpoints[-1]["fit_seconds"]
+    context.log_result("fit_seconds", fit_seconds)
+    context.log_result(
+        "independent_fit_seconds_estimate",
+        fit_seconds
+        * sum(c["n_estimators"] for c in checkpoints)
+        / checkpoints[-1]["n_estimators"],
+    )
+
+    # Keep the best checkpoint as the trial's model, logged like a trained model
+    best = max(checkpoints, key=lambda c: c["accuracy"])
+    fit_and_log_model(
+        context,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        model_params=None,
+        preprocessor=preprocessor,
+        export_compact=export_compact,
+        fitted_model=truncate_forest(model, best["n_estimators"]),
+    )
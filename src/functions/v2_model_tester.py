@@ -15,12 +15,19 @@
 # Generated by nuclio.export.NuclioExporter
 
 import json
-from datetime import datetime
+import time
 
 import numpy as np
 import requests
 from mlrun.datastore import DataItem
 
+from src.functions.load_test import run_load
+
+
+def request_body(x: np.ndarray) -> str:
+    """JSON infer request for one row, sent as is in serial and load mode."""
+    return json.dumps({"inputs": [x.tolist()]})
+
 
 def model_server_tester(
     context,
@@ -30,37 +37,64 @@ def model_server_tester(
     model: str = "",
     match_err: bool = False,
     rows: int = 20,
+    load_requests: int = 0,
+    concurrency: int = 8,
+    target_rps: float = 0,
+    max_error_rate: float = 0.0,
 ):
     """Test a model server
 
-    :param table:         csv/parquet table with test data
-    :param addr:          function address/url
-    :param label_column:  name of the label column in table
-    :param model:         tested model name
-    :param match_err:     raise error on validation (require proper test set)
-    :param rows:          number of rows to use from test set
+    :param table:          csv/parquet table with test data
+    :param addr:           function address/url
+    :param label_column:   name of the label column in table
+    :param model:          tested model name
+    :param match_err:      raise error on validation (require proper test set)
+    :param rows:           number of rows to use from test set
+    :param load_requests:  send this many requests concurrently instead of one
+                           request per row, cycling through the sampled rows
+    :param concurrency:    max requests in flight in load mode
+    :param target_rps:     request rate in load mode, 0 for as fast as possible
+    :param max_error_rate: fraction of failed requests allowed in load mode
     """
 
     table = table.as_df()
 
-    y_list = table.pop(label_column).values.tolist()
+    labels = table.pop(label_column)
     context.logger.info(f"testing with dataset against {addr}, model: {model}")
     if rows and rows < table.shape[0]:
         table = table.sample(rows)
+    y_list = labels.loc[table.index].values.tolist()
+
+    if load_requests:
+        return load_test(
+            context,
+            table,
+            y_list,
+            url=f"{addr}/v2/models/{model}/infer",
+            n_requests=load_requests,
+            concurrency=concurrency,
+            target_rps=target_rps,
+            max_error_rate=max_error_rate,
+            match_err=match_err,
+        )
 
     count = err_count = match = 0
     times = []
     for x, y in zip(table.values, y_list):
         count += 1
-        event_data = json.dumps({"inputs": [x.tolist()]})
+        event_data = request_body(x)
         try:
-            start = datetime.now()
-            resp = requests.put(f"{addr}/v2/models/{model}/infer", json=event_data)
+            start = time.perf_counter()
+            resp = requests.put(
+                f"{addr}/v2/models/{model}/infer",
+                data=event_data,
+                headers={"Content-Type": "application/json"},
+            )
             if not resp.ok:
                 context.logger.error(f"bad function resp!!\n{resp.text}")
                 err_count += 1
                 continue
-            times.append((datetime.now() - start).microseconds)
+            times.append(int((time.perf_counter() - start) * 1e6))
 
         except OSError as err:
             context.logger.error(f"error in request, data:{event_data}, error: {err}")
@@ -91,3 +125,46 @@ def model_server_tester(
 
     if match_err and match != count:
         raise ValueError(f"only {match} results match out of {count}")
+
+
+def load_test(
+    context,
+    table,
+    y_list: list,
+    url: str,
+    n_requests: int,
+    concurrency: int,
+    target_rps: float,
+    max_error_rate: float,
+    match_err: bool,
+):
+    # Encode each row once, requests cycle through the encoded bodies
+    bodies = [request_body(x) for x in table.values]
+    context.logger.info(
+        f"load testing {url} with {n_requests} requests, concurrency {concurrency}"
+    )
+    load = run_load(
+        url=url,
+        bodies=bodies,
+        n_requests=n_requests,
+        concurrency=concurrency,
+        target_rps=target_rps,
+    )
+
+    match = sum(
+        resp is not None and resp["outputs"][0] == y_list[i % len(y_list)]
+        for i, resp in enumerate(load["responses"])
+    )
+    summary = {**load["summary"], "match": match}
+    for key, value in summary.items():
+        context.log_result(key, value)
+    context.logger.info(f"load test results: {summary}")
+
+    if summary["error_rate"] > max_error_rate:
+        raise ValueError(
+            f"error rate {summary['error_rate']:.4f} above {max_error_rate} "
+            f"({summary['errors']} of {n_requests})"
+        )
+
+    if match_err and match != n_requests:
+        raise ValueError(f"only {match} results match out of {n_requests}")
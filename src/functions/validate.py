@@ -1,41 +1,48 @@
 import cloudpickle
 import mlrun
 import pandas as pd
-from deepchecks.tabular import Dataset
 from deepchecks.tabular.suites import (
     data_integrity,
     model_evaluation,
     train_test_validation,
 )
 
+from src.functions.step_cache import memoize_step, workflow_step_cache
+from src.functions.suite_runner import run_suite
+from src.functions.validation_session import get_session
 
-def create_deepchecks_dataset(df: pd.DataFrame, label_column: str) -> Dataset:
-    # Get categorical columns based on dataframe types
-    categorical_columns = list(
-        set(df.select_dtypes("object").columns) - set([label_column])
-    )
-    return Dataset(df=df, label=label_column, cat_features=categorical_columns)
+
+def load_model(model_path: str):
+    model_file, *_ = mlrun.artifacts.get_model(model_path)
+    with open(model_file, "rb") as f:
+        return cloudpickle.load(f)
 
 
 @mlrun.handler()
+@memoize_step(workflow_step_cache)
 def validate_data_integrity(
     context: mlrun.MLClientCtx,
     data: pd.DataFrame,
     label_column: str,
     allow_validation_failure: bool = False,
+    n_workers: int = 1,
+    sample_rows: int = 0,
 ):
-    # Create deepchecks dataset with column metadata
-    dataset = create_deepchecks_dataset(df=data, label_column=label_column)
-
-    # Run suite
-    data_integrity_suite = data_integrity()
-    suite_result = data_integrity_suite.run(dataset)
+    # Run suite on deepchecks datasets shared through the validation session
+    suite_result, check_timings = run_suite(
+        data_integrity(),
+        get_session(label_column),
+        train_dataset=data,
+        n_workers=n_workers,
+        sample_rows=sample_rows,
+    )
 
     # Export results
     passed_suite = suite_result.passed()
     suite_report = suite_result.save_as_html()
 
     context.log_result("passed_suite", passed_suite)
+    context.log_result("check_timings", check_timings)
     context.log_artifact("suite_report", local_path=suite_report)
 
     assert (
@@ -44,21 +51,24 @@ def validate_data_integrity(
 
 
 @mlrun.handler()
+@memoize_step(workflow_step_cache)
 def validate_train_test_split(
     context: mlrun.MLClientCtx,
     train: pd.DataFrame,
     test: pd.DataFrame,
     label_column: str,
     allow_validation_failure: bool = False,
+    n_workers: int = 1,
+    sample_rows: int = 0,
 ):
-    # Create deepchecks dataset with column metadata
-    train_dataset = create_deepchecks_dataset(df=train, label_column=label_column)
-    test_dataset = create_deepchecks_dataset(df=test, label_column=label_column)
-
-    # Run suite
-    train_test_validation_suite = train_test_validation()
-    suite_result = train_test_validation_suite.run(
-        train_dataset=train_dataset, test_dataset=test_dataset
+    # Run suite on deepchecks datasets shared through the validation session
+    suite_result, check_timings = run_suite(
+        train_test_validation(),
+        get_session(label_column),
+        train_dataset=train,
+        test_dataset=test,
+        n_workers=n_workers,
+        sample_rows=sample_rows,
     )
 
     # Export results
@@ -66,6 +76,7 @@ def validate_train_test_split(
     suite_report = suite_result.save_as_html()
 
     context.log_result("passed_suite", passed_suite)
+    context.log_result("check_timings", check_timings)
     context.log_artifact("suite_report", local_path=suite_report)
 
     assert (
@@ -81,20 +92,21 @@ def validate_model(
     model_path: str,
     label_column: str,
     allow_validation_failure: bool = False,
+    n_workers: int = 1,
+    sample_rows: int = 0,
 ):
     # Load model
-    model_file, *_ = mlrun.artifacts.get_model(model_path)
-    with open(model_file, "rb") as f:
-        model = cloudpickle.load(f)
-
-    # Create deepchecks dataset with column metadata
-    train_dataset = create_deepchecks_dataset(df=train, label_column=label_column)
-    test_dataset = create_deepchecks_dataset(df=test, label_column=label_column)
-
-    # Run suite
-    model_evaluation_suite = model_evaluation()
-    suite_result = model_evaluation_suite.run(
-        train_dataset=train_dataset, test_dataset=test_dataset, model=model
+    model = load_model(model_path)
+
+    # Run suite on deepchecks datasets shared through the validation session
+    suite_result, check_timings = run_suite(
+        model_evaluation(),
+        get_session(label_column),
+        train_dataset=train,
+        test_dataset=test,
+        model=model,
+        n_workers=n_workers,
+        sample_rows=sample_rows,
     )
 
     # Export results
@@ -102,6 +114,54 @@ def validate_model(
     suite_report = suite_result.save_as_html()
 
     context.log_result("passed_suite", passed_suite)
+    context.log_result("check_timings", check_timings)
     context.log_artifact("suite_report", local_path=suite_report)
 
     assert allow_validation_failure or passed_suite is True, "Model validation failed"
+
+
+@mlrun.handler()
+def validate_all(
+    context: mlrun.MLClientCtx,
+    train: pd.DataFrame,
+    test: pd.DataFrame,
+    model_path: str,
+    label_column: str,
+    allow_validation_failure: bool = False,
+    n_workers: int = 1,
+    sample_rows: int = 0,
+):
+    # Datasets and column metadata are built once and shared by the split and
+    # model suites - data integrity runs on its own before training
+    session = get_session(label_column)
+    model = load_model(model_path)
+    suite_runs = {
+        "train_test_split": (
+            train_test_validation(),
+            {"train_dataset": train, "test_dataset": test},
+        ),
+        "model": (
+            model_evaluation(),
+            {"train_dataset": train, "test_dataset": test, "model": model},
+        ),
+    }
+
+    # Run suites and export results
+    failed_suites = []
+    for name, (suite, inputs) in suite_runs.items():
+        suite_result, check_timings = run_suite(
+            suite, session, n_workers=n_workers, sample_rows=sample_rows, **inputs
+        )
+        passed = suite_result.passed()
+        context.log_result(f"passed_{name}", passed)
+        context.log_result(f"{name}_check_timings", check_timings)
+        suite_report = suite_result.save_as_html(f"{name}_report.html")
+        context.log_artifact(f"{name}_report", local_path=suite_report)
+        if passed is not True:
+            failed_suites.append(name)
+
+    context.log_result("passed_suite", not failed_suites)
+
+    assert (
+        allow_validation_failure or not failed_suites
+    ), f"Validation failed for {', '.join(failed_suites)}"
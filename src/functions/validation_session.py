@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+import pandas as pd
+from deepchecks.tabular import Dataset
+
+from src.functions.hashing import content_hash
+
+
+def infer_column_metadata(df: pd.DataFrame, label_column: str) -> dict:
+    # Get categorical columns based on dataframe types
+    categorical_columns = sorted(
+        set(df.select_dtypes("object").columns) - set([label_column])
+    )
+    return {"label": label_column, "cat_features": categorical_columns}
+
+
+def stratified_sample(
+    df: pd.DataFrame, label_column: str, max_rows: int, random_state: int = 42
+) -> pd.DataFrame:
+    """Sample about max_rows rows keeping the label distribution of df."""
+    if len(df) <= max_rows:
+        return df
+    return df.groupby(label_column, group_keys=False).sample(
+        frac=max_rows / len(df), random_state=random_state
+    )
+
+
+class ValidationSession:
+    """
+    Builds deepchecks datasets once per data version, keyed by content hash,
+    so suites run in the same process share them. Column metadata is
+    inferred once per column schema, so e.g. train and test get the same
+    categorical features. Only the max_datasets most recently used datasets
+    are kept, so a long-lived process does not hold every data version.
+    """
+
+    def __init__(self, label_column: str, max_datasets: int = 8):
+        self.label_column = label_column
+        self.max_datasets = max_datasets
+        self.column_metadata = {}
+        self.datasets = OrderedDict()
+
+    def metadata(self, df: pd.DataFrame) -> dict:
+        schema = tuple(zip(df.columns, df.dtypes.astype(str)))
+        if schema not in self.column_metadata:
+            self.column_metadata[schema] = infer_column_metadata(df, self.label_column)
+        return self.column_metadata[schema]
+
+    def _cached_dataset(self, df: pd.DataFrame) -> Dataset:
+        key = content_hash(df)
+        if key in self.datasets:
+            self.datasets.move_to_end(key)
+        else:
+            self.datasets[key] = Dataset(df=df, **self.metadata(df))
+            while len(self.datasets) > self.max_datasets:
+                self.datasets.popitem(last=False)
+        return self.datasets[key]
+
+    def dataset(self, df: pd.DataFrame) -> Dataset:
+        return self._cached_dataset(df)
+
+    def sampled_dataset(
+        self, df: pd.DataFrame, max_rows: int, random_state: int = 42
+    ) -> Dataset:
+        sample = stratified_sample(df, self.label_column, max_rows, random_state)
+        return self._cached_dataset(sample)
+
+
+MAX_SESSIONS = 4
+_sessions = OrderedDict()
+
+
+def get_session(label_column: str) -> ValidationSession:
+    """
+    Process wide session per label column, reused across handler calls. Only
+    the MAX_SESSIONS most recently used sessions are kept.
+    """
+    if label_column in _sessions:
+        _sessions.move_to_end(label_column)
+    else:
+        _sessions[label_column] = ValidationSession(label_column)
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    return _sessions[label_column]
@@ -1,6 +1,61 @@
 import mlrun
 from kfp import dsl
 
+from src.workflows.params import build_value
+
+
+def deploy_and_test(
+    project: mlrun.projects.MlrunProject,
+    serving_function: str,
+    model: dict,
+    test_set_uri: str,
+    label_column: str,
+    performance_params: dict,
+    shadow=None,
+):
+    # Deploy model to a candidate copy of the serving function first, so a model
+    # that fails the gates never serves production traffic
+    serving_fn = project.get_function(serving_function)
+    # serving_fn.set_tracking()
+    candidate_fn = serving_fn.copy()
+    candidate_fn.metadata.name = f"{serving_function}-candidate"
+    candidate = project.deploy_function(candidate_fn, models=[model])
+    if shadow is not None:
+        candidate.after(shadow)
+
+    # Test model endpoint
+    tester = project.run_function(
+        "model-server-tester",
+        inputs={
+            "table": test_set_uri,
+        },
+        params={
+            "addr": candidate.outputs["endpoint"],
+            "label_column": label_column,
+            "model": model["key"],
+        },
+    )
+
+    # Gate on latency and throughput under sustained load - after the tester, so
+    # its traffic does not skew the measurements
+    gate = project.run_function(
+        "performance-gate",
+        inputs={
+            "table": test_set_uri,
+        },
+        params={
+            "addr": candidate.outputs["endpoint"],
+            "model_uri": model["model_path"],
+            "label_column": label_column,
+            "model": model["key"],
+            **performance_params,
+        },
+        outputs=["passed_gate"],
+    ).after(tester)
+
+    # Promote the model to the production endpoint once it passed the gates
+    project.deploy_function(serving_fn, models=[model]).after(gate)
+
 
 @dsl.pipeline(name="GitOps Deployment Pipeline", description="Deploy a model")
 def pipeline(
@@ -8,6 +63,22 @@ def pipeline(
     champion_model_tag: str,
     label_column: str,
     deploy_model_name: str,
+    fused_serving: bool = False,
+    perf_requests: int = 1000,
+    perf_concurrency: int = 16,
+    perf_target_rps: float = 0,
+    max_p99_latency_ms: float = 500,
+    min_throughput_rps: float = 10,
+    max_error_rate: float = 0.0,
+    max_latency_regression: float = 0.2,
+    max_throughput_regression: float = 0.2,
+    shadow_source_url: str = "",
+    shadow_chunk_size: int = 100_000,
+    serving_batch_max_size: int = 0,
+    serving_batch_window_ms: float = 5.0,
+    model_cache_dir: str = "",
+    model_cache_max_mb: float = 1024,
+    model_prefetch: bool = False,
 ):
     # Get our project object
     project = mlrun.get_current_project()
@@ -18,29 +89,69 @@ def pipeline(
         params={"model_name": "model", "model_tag": challenger_model_tag},
         outputs=["model_uri", "test_set_uri"],
     )
+    model = {
+        "key": deploy_model_name,
+        "model_path": get_challenger_model.outputs["model_uri"],
+    }
+    test_set_uri = get_challenger_model.outputs["test_set_uri"]
+    performance_params = {
+        "model_tag": challenger_model_tag,
+        "champion_model_tag": champion_model_tag,
+        "requests": perf_requests,
+        "concurrency": perf_concurrency,
+        "target_rps": perf_target_rps,
+        "max_p99_latency_ms": max_p99_latency_ms,
+        "min_throughput_rps": min_throughput_rps,
+        "max_error_rate": max_error_rate,
+        "max_latency_regression": max_latency_regression,
+        "max_throughput_regression": max_throughput_regression,
+    }
 
-    # Deploy model to endpoint
-    serving_fn = project.get_function("serving")
-    # serving_fn.set_tracking()
-    deploy = project.deploy_function(
-        serving_fn,
-        models=[
-            {
-                "key": deploy_model_name,
-                "model_path": get_challenger_model.outputs["model_uri"],
-            }
-        ],
-    )
+    # Shadow evaluate challenger vs champion on a large dataset before deploying
+    with dsl.Condition(shadow_source_url != ""):
+        shadow = project.run_function(
+            "shadow-evaluation",
+            inputs={"dataset": shadow_source_url},
+            params={
+                "label_column": label_column,
+                "challenger_model_tag": challenger_model_tag,
+                "champion_model_tag": champion_model_tag,
+                "raw_data": True,
+                "chunk_size": shadow_chunk_size,
+                "max_throughput_regression": max_throughput_regression,
+                "fail_on_regression": True,
+            },
+            outputs=["promote_challenger"],
+        )
 
-    # Test model endpoint
-    project.run_function(
-        "model-server-tester",
-        inputs={
-            "table": get_challenger_model.outputs["test_set_uri"],
-        },
-        params={
-            "addr": deploy.outputs["endpoint"],
-            "label_column": label_column,
-            "model": deploy_model_name,
-        },
+    # ClassifierModel options - resolved while the graph is built, since the
+    # serving graph is stored with plain values
+    serving_params = {
+        "batch_max_size": build_value(serving_batch_max_size),
+        "batch_window_ms": build_value(serving_batch_window_ms),
+        "model_cache_dir": build_value(model_cache_dir),
+        "model_cache_max_mb": build_value(model_cache_max_mb),
+        "model_prefetch": build_value(model_prefetch),
+    }
+
+    # Fused serving runs the preprocessor and model in one step
+    if build_value(fused_serving):
+        serving_function = "serving-fused"
+        model = {
+            **model,
+            "class_name": "FusedClassifierModel",
+            "label_column": build_value(label_column),
+        }
+    else:
+        serving_function = "serving"
+        model = {**model, "class_name": "ClassifierModel"}
+
+    deploy_and_test(
+        project,
+        serving_function=serving_function,
+        model={**model, **serving_params},
+        test_set_uri=test_set_uri,
+        label_column=label_column,
+        performance_params=performance_params,
+        shadow=shadow,
     )
@@ -0,0 +1,14 @@
+from kfp import dsl
+from mlrun.projects.pipelines import pipeline_context
+
+
+def build_value(param):
+    """
+    Value of a pipeline argument while the pipeline graph is built. KFP hands
+    the pipeline placeholders, so read the arguments MLRun runs it with, or
+    the placeholder's default.
+    """
+    if not isinstance(param, dsl.PipelineParam):
+        return param
+    args = (pipeline_context.workflow.args or {}) if pipeline_context.workflow else {}
+    return args.get(param.name, param.value)
@@ -1,6 +1,49 @@
 import mlrun
 from kfp import dsl
 
+from src.workflows.params import build_value
+
+HYPERPARAMS = {
+    "bootstrap": [True, False],
+    "max_depth": [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, None],
+    "min_samples_leaf": [1, 2, 4],
+    "min_samples_split": [2, 5, 10],
+    "n_estimators": [200, 400, 600, 800, 1000, 1200, 1400, 1600, 1800, 2000],
+}
+
+# MLRun random search over independent trials, picking the most accurate one
+RANDOM_SEARCH = {
+    "selector": "max.accuracy",
+    "hyper_param_options": mlrun.model.HyperParamOptions(
+        strategy="random", max_iterations=5
+    ),
+}
+
+
+def train_options(search_engine: str) -> dict:
+    """
+    run_function options of the train step per search engine: MLRun random
+    search (one job per trial), local successive halving, or random search
+    over warm-started forests that score every n_estimators.
+    """
+    if search_engine == "random":
+        return {"hyperparams": HYPERPARAMS, **RANDOM_SEARCH}
+    if search_engine == "halving":
+        return {
+            "handler": "train_model_search",
+            "params": {"param_grid": HYPERPARAMS},
+        }
+    if search_engine == "warm_start":
+        return {
+            "handler": "train_model_warm_start",
+            "params": {"n_estimators": HYPERPARAMS["n_estimators"]},
+            "hyperparams": {
+                k: v for k, v in HYPERPARAMS.items() if k != "n_estimators"
+            },
+            **RANDOM_SEARCH,
+        }
+    raise ValueError(f"Unknown search engine '{search_engine}'")
+
 
 @dsl.pipeline(name="GitOps Training Pipeline", description="Train a model")
 def pipeline(
@@ -9,20 +52,51 @@ def pipeline(
     allow_validation_failure: bool,
     ohe_columns: list,
     test_size: float,
+    export_compact_model: bool = False,
+    search_engine: str = "random",
+    ingest_chunk_size: int = 0,
+    process_chunk_size: int = 0,
+    validation_backend: str = "pandera",
+    combined_validation: bool = False,
+    validation_workers: int = 1,
+    validation_sample_rows: int = 0,
+    profile_batch_sizes: list = None,
+    step_cache_dir: str = "",
+    step_cache_max_mb: float = 10240,
+    step_cache_max_age_days: float = 0,
 ):
     # Get our project object
     project = mlrun.get_current_project()
 
+    # Run deepchecks suites across processes and sample rows for heavy checks
+    validation_params = {
+        "n_workers": validation_workers,
+        "sample_rows": validation_sample_rows,
+    }
+
+    # Data stages reuse their previous outputs when code, params and inputs match
+    step_cache_params = {
+        "step_cache_dir": step_cache_dir,
+        "step_cache_max_mb": step_cache_max_mb,
+        "step_cache_max_age_days": step_cache_max_age_days,
+    }
+
     # Ingest data
     ingest_fn = project.get_function("data")
     ingest = project.run_function(
         ingest_fn,
-        handler="get_data",
+        handler="get_data_chunked",
         inputs={"data": source_url},
+        params={
+            "chunk_size": ingest_chunk_size,
+            "validation_backend": validation_backend,
+            **step_cache_params,
+        },
         outputs=["data"],
     )
 
-    # Validate data integrity
+    # Validate data integrity - always before processing, so a bad dataset never
+    # reaches training
     validate_data_integrity = project.run_function(
         "validate",
         handler="validate_data_integrity",
@@ -30,6 +104,8 @@ def pipeline(
         params={
             "label_column": label_column,
             "allow_validation_failure": allow_validation_failure,
+            **validation_params,
+            **step_cache_params,
         },
         outputs=["passed_suite"],
     )
@@ -41,63 +117,79 @@ def pipeline(
         params={"label_column": label_column},
     )
 
-    # Process data
+    # Process data in memory, or out-of-core chunk by chunk for large sources
+    process_params = {
+        "label_column": label_column,
+        "test_size": test_size,
+        "ohe_columns": ohe_columns,
+    }
+    if build_value(process_chunk_size) > 0:
+        process_handler = "process_data_chunked"
+        process_params["chunk_size"] = process_chunk_size
+    else:
+        process_handler = "process_data"
+        process_params.update(step_cache_params)
     process = project.run_function(
         "data",
-        handler="process_data",
+        handler=process_handler,
         inputs={"data": ingest.outputs["data"]},
-        params={
-            "label_column": label_column,
-            "test_size": test_size,
-            "ohe_columns": ohe_columns,
-        },
-        outputs=["train", "test"],
+        params=process_params,
+        outputs=["train", "test", "preprocessor"],
     ).after(validate_data_integrity)
 
-    # Validate train test split
-    validate_train_test_split = project.run_function(
-        "validate",
-        handler="validate_train_test_split",
-        inputs={"train": process.outputs["train"], "test": process.outputs["test"]},
-        params={
-            "label_column": label_column,
-            "allow_validation_failure": allow_validation_failure,
-        },
-        outputs=["passed_suite"],
-    )
+    # Validate train test split, unless it runs with the model suite below
+    combined = build_value(combined_validation)
+    split_inputs = {
+        "train": process.outputs["train"],
+        "test": process.outputs["test"],
+    }
+    validation_step_params = {
+        "label_column": label_column,
+        "allow_validation_failure": allow_validation_failure,
+        **validation_params,
+    }
+    if not combined:
+        validate_train_test_split = project.run_function(
+            "validate",
+            handler="validate_train_test_split",
+            inputs=split_inputs,
+            params={**validation_step_params, **step_cache_params},
+            outputs=["passed_suite"],
+        )
 
+    # Train with the selected search engine
+    options = train_options(build_value(search_engine))
     train = project.run_function(
         "train",
-        inputs={
-            "train": process.outputs["train"],
-            "test": process.outputs["test"],
-        },
-        params={"label_column": label_column},
-        hyperparams={
-            "bootstrap": [True, False],
-            "max_depth": [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, None],
-            "min_samples_leaf": [1, 2, 4],
-            "min_samples_split": [2, 5, 10],
-            "n_estimators": [200, 400, 600, 800, 1000, 1200, 1400, 1600, 1800, 2000],
+        inputs={**split_inputs, "preprocessor": process.outputs["preprocessor"]},
+        params={
+            "label_column": label_column,
+            "export_compact": export_compact_model,
+            **options.pop("params", {}),
         },
-        selector="max.accuracy",
-        hyper_param_options=mlrun.model.HyperParamOptions(
-            strategy="random", max_iterations=5
-        ),
         outputs=["model"],
-    ).after(validate_train_test_split)
+        **options,
+    )
+    if not combined:
+        train.after(validate_train_test_split)
 
+    # Validate model - with combined validation the split and model suites run
+    # in one job, sharing the deepchecks datasets
     project.run_function(
         "validate",
-        handler="validate_model",
-        inputs={
-            "train": process.outputs["train"],
-            "test": process.outputs["test"],
-        },
+        handler="validate_all" if combined else "validate_model",
+        inputs=split_inputs,
+        params={"model_path": train.outputs["model"], **validation_step_params},
+        outputs=["passed_suite"],
+    )
+
+    # Record load time, latency, throughput and memory on the model artifact
+    project.run_function(
+        "profile",
+        inputs={"test": process.outputs["test"]},
         params={
             "model_path": train.outputs["model"],
             "label_column": label_column,
-            "allow_validation_failure": allow_validation_failure,
+            "batch_sizes": profile_batch_sizes,
         },
-        outputs=["passed_suite"],
     )
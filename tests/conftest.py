@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from sklearn.compose import make_column_transformer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+HEART_CSV = "data/heart.csv"
+OHE_COLUMNS = ["sex", "cp", "slope", "thal", "restecg"]
+
+
+@pytest.fixture(scope="session")
+def heart_data() -> pd.DataFrame:
+    return pd.read_csv(HEART_CSV)
+
+
+@pytest.fixture(scope="session")
+def heart_preprocessor(heart_data):
+    # Same preprocessor as process_data
+    preprocessor = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(sparse=False), OHE_COLUMNS),
+            remainder="passthrough",
+            verbose_feature_names_out=False,
+        )
+    )
+    return preprocessor.fit(heart_data)
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.functions.batching import MicroBatcher
+
+
+class RecordingModel:
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def predict(self, feats):
+        with self.lock:
+            self.batch_sizes.append(len(feats))
+        return feats.sum(axis=1)
+
+
+def test_each_caller_gets_its_own_slice():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=8, window_ms=20)
+    rows = np.arange(64, dtype=float).reshape(32, 2)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda r: batcher.predict(r[np.newaxis, :]), rows))
+    batcher.close()
+
+    np.testing.assert_array_equal(np.concatenate(results), rows.sum(axis=1))
+    assert max(model.batch_sizes) <= 8
+    assert len(model.batch_sizes) < len(rows)
+
+
+def test_oversized_request_is_served_whole():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=4, window_ms=1)
+    result = batcher.predict(np.ones((10, 3)))
+    batcher.close()
+
+    np.testing.assert_array_equal(result, np.full(10, 3.0))
+    assert model.batch_sizes == [10]
+
+
+def test_predict_errors_are_raised_to_callers():
+    def fail(feats):
+        raise ValueError("bad input")
+
+    batcher = MicroBatcher(fail, max_batch_size=4, window_ms=1)
+    with pytest.raises(ValueError, match="bad input"):
+        batcher.predict(np.ones((1, 3)))
+    batcher.close()
+
+
+def test_lone_requests_are_not_delayed_by_the_window():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=8, window_ms=500)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        batcher.predict(np.ones((1, 2)))
+    elapsed = time.perf_counter() - start
+    batcher.close()
+
+    assert elapsed < 0.25
+    assert model.batch_sizes == [1, 1, 1]
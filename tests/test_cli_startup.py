@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).parents[1]
+
+# Cumulative import time allowed for a CLI entry point, in microseconds
+IMPORT_BUDGET_US = 500_000
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in microseconds per module, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_DIR,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["project_run", "project_export"])
+def test_cli_import_is_within_budget(module):
+    times = import_times(module)
+
+    assert not any(name.split(".")[0] == "mlrun" for name in times)
+    assert times[module] < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize("script", ["project_run.py", "project_export.py"])
+def test_cli_help_runs_without_mlrun(script):
+    result = subprocess.run(
+        [sys.executable, script, "--help"],
+        capture_output=True,
+        text=True,
+        cwd=REPO_DIR,
+    )
+    assert result.returncode == 0
+    assert "Usage:" in result.stdout
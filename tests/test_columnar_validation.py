@@ -0,0 +1,58 @@
+import numpy as np
+import pandera as pa
+import pytest
+
+from src.functions.columnar_validation import ColumnarValidator
+from src.functions.models import HeartSchema
+
+SCHEMA = HeartSchema.to_schema()
+
+
+def sorted_failure_cases(err):
+    failure_cases = err.failure_cases.astype(str)
+    return failure_cases.sort_values(list(failure_cases.columns)).reset_index(drop=True)
+
+
+def test_valid_data_passes(heart_data):
+    assert ColumnarValidator(SCHEMA).validate(heart_data) is heart_data
+
+
+def test_failure_cases_match_pandera(heart_data):
+    data = heart_data.head(50).copy()
+    data.loc[3, "target"] = 5
+    data.loc[7, "age"] = np.nan
+    data.loc[2, "sex"] = None
+    data.loc[4, "thal"] = 1
+    data = data.drop(columns=["chol"])
+
+    with pytest.raises(pa.errors.SchemaErrors) as expected:
+        SCHEMA.validate(data, lazy=True)
+    with pytest.raises(pa.errors.SchemaErrors) as actual:
+        ColumnarValidator(SCHEMA).validate(data, lazy=True)
+
+    assert list(actual.value.failure_cases.columns) == list(
+        expected.value.failure_cases.columns
+    )
+    assert sorted_failure_cases(actual.value).equals(
+        sorted_failure_cases(expected.value)
+    )
+
+
+def test_uncomparable_values_match_pandera(heart_data):
+    data = heart_data.head(50).astype({"target": object})
+    data.loc[5, "target"] = "yes"
+
+    with pytest.raises(pa.errors.SchemaErrors) as expected:
+        SCHEMA.validate(data, lazy=True)
+    with pytest.raises(pa.errors.SchemaErrors) as actual:
+        ColumnarValidator(SCHEMA).validate(data, lazy=True)
+
+    assert sorted_failure_cases(actual.value).equals(
+        sorted_failure_cases(expected.value)
+    )
+
+
+def test_unsupported_checks_do_not_compile():
+    schema = pa.DataFrameSchema({"a": pa.Column(int, pa.Check(lambda s: s > 0))})
+    with pytest.raises(ValueError, match="Cannot compile"):
+        ColumnarValidator(schema)
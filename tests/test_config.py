@@ -0,0 +1,17 @@
+import pytest
+
+from config import AppConfig
+
+
+@pytest.mark.parametrize("workflow_name", ["train", "deploy"])
+def test_workflow_config_matches_schema(workflow_name):
+    config = AppConfig()
+    workflow_config = config.get_workflow_config(workflow_name=workflow_name)
+
+    assert workflow_config["label_column"] == config.label_column
+    assert set(workflow_config) == set(config.workflows[workflow_name].__fields__)
+
+
+def test_workflow_config_overrides():
+    workflow_config = AppConfig().get_workflow_config("deploy", max_p99_latency_ms=50)
+    assert workflow_config["max_p99_latency_ms"] == 50
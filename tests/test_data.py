@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("mlrun")
+
+from src.functions import data as data_module  # noqa: E402
+
+
+class FakeContext:
+    def __init__(self, params: dict):
+        self.params = params
+
+    def get_param(self, key, default=None):
+        return self.params.get(key, default)
+
+
+def test_process_data_reuses_cached_outputs(tmp_path, heart_data, monkeypatch):
+    splits = []
+    split = data_module.train_test_split
+
+    def train_test_split(*args, **kwargs):
+        splits.append(kwargs)
+        return split(*args, **kwargs)
+
+    monkeypatch.setattr(data_module, "train_test_split", train_test_split)
+    context = FakeContext({"step_cache_dir": str(tmp_path / "cache")})
+    params = {"label_column": "target", "test_size": 0.2, "ohe_columns": ["sex"]}
+
+    first = data_module.process_data(context, heart_data, **params)
+    second = data_module.process_data(context, heart_data.copy(), **params)
+
+    assert len(splits) == 1
+    for cached, computed in zip(second[:2], first[:2]):
+        assert cached.equals(computed)
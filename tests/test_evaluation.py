@@ -0,0 +1,100 @@
+import cloudpickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn import metrics
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from src.functions.evaluation import confusion_matrix, evaluate, evaluate_models
+
+
+def sklearn_metrics(y_true, y_pred) -> dict:
+    return {
+        "accuracy": metrics.accuracy_score(y_true, y_pred),
+        "test-error": np.mean(y_true != y_pred),
+        "f1": metrics.f1_score(y_true, y_pred, average="macro", zero_division=0),
+        "precision": metrics.precision_score(
+            y_true, y_pred, average="macro", zero_division=0
+        ),
+        "recall": metrics.recall_score(
+            y_true, y_pred, average="macro", zero_division=0
+        ),
+    }
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_evaluate_matches_sklearn(n_classes):
+    rng = np.random.default_rng(42)
+    y_true = rng.integers(0, n_classes, 5000)
+    proba = rng.dirichlet(np.ones(n_classes), 5000)
+    proba[np.arange(5000), y_true] += 0.3
+    proba /= proba.sum(axis=1, keepdims=True)
+    y_pred = proba.argmax(axis=1)
+
+    result = evaluate(y_true, y_pred, proba, classes=np.arange(n_classes))
+
+    for name, value in sklearn_metrics(y_true, y_pred).items():
+        assert result[name] == pytest.approx(value)
+    multi_class = {} if n_classes == 2 else {"multi_class": "ovr"}
+    expected_auc = metrics.roc_auc_score(
+        y_true, proba[:, 1] if n_classes == 2 else proba, **multi_class
+    )
+    assert result["roc_auc"] == pytest.approx(expected_auc)
+    assert result["log_loss"] == pytest.approx(metrics.log_loss(y_true, proba))
+
+
+def test_confusion_matrix_matches_sklearn_for_string_labels():
+    y_true = np.array(["b", "a", "c", "a", "b"])
+    y_pred = np.array(["b", "b", "c", "a", "d"])
+
+    matrix, classes = confusion_matrix(y_true, y_pred)
+    assert classes.tolist() == ["a", "b", "c", "d"]
+    np.testing.assert_array_equal(
+        matrix, metrics.confusion_matrix(y_true, y_pred, labels=classes)
+    )
+    for name, value in sklearn_metrics(y_true, y_pred).items():
+        assert evaluate(y_true, y_pred)[name] == pytest.approx(value)
+
+
+def test_roc_auc_handles_tied_scores():
+    y_true = np.array([0, 0, 1, 1, 1, 0])
+    proba = np.array([0.5, 0.2, 0.5, 0.9, 0.5, 0.5])
+    proba = np.column_stack([1 - proba, proba])
+
+    result = evaluate(y_true, proba.argmax(axis=1), proba, classes=[0, 1])
+    assert result["roc_auc"] == pytest.approx(
+        metrics.roc_auc_score(y_true, proba[:, 1])
+    )
+
+
+def test_evaluate_rejects_labels_outside_model_classes():
+    y_true = np.array([0, 1, 2])
+    proba = np.array([[0.8, 0.2], [0.3, 0.7], [0.6, 0.4]])
+
+    with pytest.raises(ValueError, match="label 2 not in the model classes"):
+        evaluate(y_true, proba.argmax(axis=1), proba, classes=[0, 1])
+
+
+def test_evaluate_models_in_worker_processes(tmp_path):
+    X, y = make_classification(n_samples=500, n_features=8, random_state=42)
+    X = pd.DataFrame(X, columns=[f"f{i}" for i in range(8)])
+    model_files = {}
+    for name, model in [
+        ("new_model", RandomForestClassifier(n_estimators=10, random_state=42)),
+        ("existing_model", DecisionTreeClassifier(random_state=42)),
+    ]:
+        model.fit(X, y)
+        model_files[name] = str(tmp_path / f"{name}.pkl")
+        with open(model_files[name], "wb") as f:
+            cloudpickle.dump(model, f)
+
+    evaluations = evaluate_models(model_files, X, y)
+
+    assert list(evaluations) == ["new_model", "existing_model"]
+    for name, (ypred, result) in evaluations.items():
+        with open(model_files[name], "rb") as f:
+            model = cloudpickle.load(f)
+        np.testing.assert_array_equal(ypred, model.predict(X))
+        assert result["accuracy"] == pytest.approx(metrics.accuracy_score(y, ypred))
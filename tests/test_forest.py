@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from src.functions.forest import CompactForest
+
+
+@pytest.fixture(scope="module")
+def forest():
+    X, y = make_classification(n_samples=500, n_features=30, random_state=42)
+    model = RandomForestClassifier(n_estimators=50, max_depth=10, random_state=42)
+    return model.fit(X, y), X
+
+
+def test_predict_matches_sklearn(forest, tmp_path):
+    model, X = forest
+    CompactForest.from_sklearn(model).save(tmp_path / "model.npy")
+    compact = CompactForest.load(tmp_path / "model.npy")
+
+    np.testing.assert_array_equal(compact.predict(X), model.predict(X))
+    np.testing.assert_array_equal(compact.predict_proba(X), model.predict_proba(X))
+    assert compact.n_features == model.n_features_in_
+
+
+def test_apply_matches_sklearn(forest):
+    model, X = forest
+    compact = CompactForest.from_sklearn(model)
+
+    leaves = compact.apply(X)
+    offsets = np.cumsum([0] + [e.tree_.node_count for e in model.estimators_[:-1]])
+    np.testing.assert_array_equal(leaves, model.apply(X) + offsets)
+
+
+def test_rejects_non_numeric_classes(forest):
+    model, X = forest
+    labeled = RandomForestClassifier(n_estimators=2, random_state=42)
+    labeled.fit(X, np.where(model.predict(X) == 1, "yes", "no"))
+
+    with pytest.raises(ValueError, match="numeric class labels"):
+        CompactForest.from_sklearn(labeled)
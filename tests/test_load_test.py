@@ -0,0 +1,150 @@
+import asyncio
+import json
+import socket
+import threading
+
+import numpy as np
+import pytest
+from aiohttp import web
+
+from src.functions.load_test import (
+    arrival_times,
+    check_performance,
+    latency_histogram,
+    latency_percentiles,
+    run_load,
+    run_open_loop,
+    run_open_loop_async,
+    trace_arrival_times,
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def model_server():
+    # Echoes the first input value back, fails for negative inputs
+    async def infer(request):
+        body = await request.json()
+        value = body["inputs"][0][0]
+        if value < 0:
+            return web.json_response({"error": "bad input"}, status=400)
+        return web.json_response({"outputs": [value]})
+
+    app = web.Application()
+    app.router.add_put("/v2/models/model/infer", infer)
+    port = free_port()
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}/v2/models/model/infer"
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
+def test_run_load_reports_responses_and_errors(model_server):
+    bodies = [json.dumps({"inputs": [[v]]}) for v in [1, 2, -1, 3]]
+    load = run_load(model_server, bodies, n_requests=40, concurrency=4)
+
+    assert load["responses"][:4] == [
+        {"outputs": [1]},
+        {"outputs": [2]},
+        None,
+        {"outputs": [3]},
+    ]
+    summary = load["summary"]
+    assert summary["errors"] == 10
+    assert summary["error_rate"] == 0.25
+    assert summary["throughput_rps"] > 0
+    assert len(load["latencies"]) == 30
+
+
+def test_run_load_paces_to_target_rps(model_server):
+    bodies = [json.dumps({"inputs": [[1]]})]
+    load = run_load(model_server, bodies, n_requests=20, concurrency=4, target_rps=100)
+
+    assert load["summary"]["throughput_rps"] <= 110
+
+
+@pytest.mark.parametrize("process", ["poisson", "constant", "bursty"])
+def test_arrival_times_match_rate(process):
+    arrivals = arrival_times(5000, rate=100, process=process, random_state=42)
+
+    assert len(arrivals) == 5000
+    assert np.all(np.diff(arrivals) >= 0)
+    assert 5000 / arrivals[-1] == pytest.approx(100, rel=0.1)
+
+
+def test_bursty_arrivals_send_bursts_together():
+    arrivals = arrival_times(25, rate=10, process="bursty", burst_size=10)
+    assert len(np.unique(arrivals)) == 3
+    assert np.all(arrivals[:10] == 0)
+
+
+def test_trace_arrival_times_replays_offsets():
+    timestamps = ["2024-01-01 00:00:02", "2024-01-01 00:00:00", "2024-01-01 00:00:03"]
+    assert trace_arrival_times(timestamps, speedup=2).tolist() == [0.0, 1.0, 1.5]
+
+
+def test_run_open_loop_reports_requested_and_achieved_rate(model_server):
+    bodies = [json.dumps({"inputs": [[v]]}) for v in [1, -1]]
+    arrivals = arrival_times(50, rate=200, process="constant")
+    load = run_open_loop(model_server, bodies, arrivals, method="PUT")
+
+    summary = load["summary"]
+    assert summary["errors"] == 25
+    assert summary["requested_rps"] == pytest.approx(200)
+    assert summary["achieved_rps"] == pytest.approx(200, rel=0.2)
+    assert load["responses"][0] == {"outputs": [1]}
+
+
+def test_latency_percentiles_in_microseconds():
+    percentiles = latency_percentiles([0.001] * 99 + [0.5])
+    assert percentiles["p50_latency"] == 1000
+    assert percentiles["p999_latency"] > percentiles["p90_latency"]
+
+
+def test_latency_histogram_counts_every_request():
+    histogram = latency_histogram([0.001, 0.002, 0.002, 0.1], n_bins=10)
+    assert histogram["count"].sum() == 4
+    assert histogram["bin_start_ms"].iloc[0] == pytest.approx(1.0)
+    assert histogram["bin_end_ms"].iloc[-1] == pytest.approx(100.0)
+
+
+def test_check_performance_thresholds_and_champion():
+    summary = {"p99_latency": 300_000, "throughput_rps": 40.0, "error_rate": 0.0}
+
+    assert (
+        check_performance(summary, max_p99_latency_ms=500, min_throughput_rps=10) == []
+    )
+    violations = check_performance(
+        summary,
+        max_p99_latency_ms=200,
+        champion={"p99_latency": 100_000, "throughput_rps": 100.0},
+    )
+    assert len(violations) == 3
+    assert "above 200ms" in violations[0]
+
+
+def test_run_open_loop_async_inside_running_loop(model_server):
+    bodies = [json.dumps({"inputs": [[1]]})]
+    arrivals = arrival_times(10, rate=200, process="constant")
+
+    async def handler():
+        # Like a nuclio handler, called from an already running event loop
+        return await run_open_loop_async(model_server, bodies, arrivals, method="PUT")
+
+    load = asyncio.run(handler())
+    assert load["summary"]["errors"] == 0
+    assert load["responses"][0] == {"outputs": [1]}
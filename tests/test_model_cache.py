@@ -0,0 +1,80 @@
+import os
+
+from src.functions.model_cache import ModelCache, extra_data_urls
+
+
+def write_file(path, size):
+    path.write_bytes(b"0" * size)
+    return str(path)
+
+
+def test_get_returns_cached_copy(tmp_path):
+    cache = ModelCache(tmp_path / "cache")
+    source = write_file(tmp_path / "model.pkl", 10)
+
+    assert cache.get("abc") is None
+    cached = cache.put("abc", source)
+    assert cache.get("abc") == cached
+    assert open(cached, "rb").read() == open(source, "rb").read()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ModelCache(tmp_path / "cache", max_size_mb=2.5 / 1024)
+    source = write_file(tmp_path / "model.pkl", 1024)
+
+    for i, key in enumerate(["a", "b"]):
+        os.utime(cache.put(key, source), (i, i))
+    # Reading "a" makes "b" the least recently used entry
+    cache.get("a")
+    cache.put("c", source)
+
+    assert cache.get("a") and cache.get("c")
+    assert cache.get("b") is None
+
+
+def test_keeps_new_entry_larger_than_cache(tmp_path):
+    cache = ModelCache(tmp_path / "cache", max_size_mb=1 / 1024)
+    source = write_file(tmp_path / "model.pkl", 4096)
+
+    assert cache.get("big") is None
+    cache.put("big", source)
+    assert cache.get("big")
+
+
+def test_models_without_hash_are_not_cached(tmp_path):
+    cache = ModelCache(tmp_path / "cache")
+    first = write_file(tmp_path / "first.pkl", 10)
+    second = write_file(tmp_path / "second.pkl", 20)
+
+    for key in [None, ""]:
+        assert cache.put(key, first) == first
+        assert cache.get(key) is None
+        assert cache.put(key, second) == second
+    assert not list((tmp_path / "cache").iterdir())
+
+
+def test_entries_keep_file_suffix(tmp_path):
+    cache = ModelCache(tmp_path / "cache")
+    source = write_file(tmp_path / "model.npy", 10)
+
+    cached = cache.put("abc", source)
+    assert cached.endswith("abc.npy")
+    assert cache.get("abc", ".npy") == cached
+    assert cache.get("abc") is None
+
+
+def test_extra_data_urls_resolve_relative_paths():
+    urls = extra_data_urls(
+        "s3://bucket/models/model.pkl",
+        {
+            "report": "report.html",
+            "absolute": "/data/plot.html",
+            "remote": "v3io:///projects/plot.html",
+        },
+    )
+
+    assert urls == {
+        "report": "s3://bucket/models/report.html",
+        "absolute": "/data/plot.html",
+        "remote": "v3io:///projects/plot.html",
+    }
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.functions.preprocessing import CompiledPreprocessor
+
+
+def test_compiled_transform_matches_pipeline(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor)
+
+    expected = heart_preprocessor.transform(heart_data)
+    records = heart_data.to_dict(orient="records")
+    np.testing.assert_array_equal(compiled.transform(records), expected)
+    np.testing.assert_array_equal(
+        compiled.transform(heart_data.to_dict(orient="list")), expected
+    )
+    assert compiled.feature_names == list(heart_preprocessor.get_feature_names_out())
+
+
+def test_compiled_transform_records(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor)
+    record = heart_data.iloc[:1].to_dict(orient="records")
+
+    (transformed,) = compiled.transform_records(record)
+    assert transformed["sex_male"] == float(record[0]["sex"] == "male")
+    assert transformed["age"] == record[0]["age"]
+
+
+def test_unknown_category_raises(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor)
+    record = heart_data.iloc[:1].to_dict(orient="records")
+    record[0]["cp"] = "unknown"
+
+    with pytest.raises(ValueError, match="unknown category"):
+        compiled.transform(record)
+
+
+def test_missing_passthrough_value_is_nan(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor)
+    events = heart_data.iloc[:2].astype({"age": float})
+    events.loc[events.index[0], "age"] = np.nan
+    records = events.to_dict(orient="records")
+    records[0]["age"] = None
+
+    expected = heart_preprocessor.transform(events)
+    np.testing.assert_array_equal(compiled.transform(records), expected)
+    np.testing.assert_array_equal(
+        compiled.transform_columns(pd.DataFrame(records)), expected
+    )
+
+
+def test_drop_columns_removes_label(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor, drop_columns=["target"])
+    records = heart_data.drop("target", axis=1).to_dict(orient="records")
+
+    expected = heart_preprocessor.transform(heart_data)
+    target_index = list(heart_preprocessor.get_feature_names_out()).index("target")
+    np.testing.assert_array_equal(
+        compiled.transform(records), np.delete(expected, target_index, axis=1)
+    )
+    assert "target" not in compiled.feature_names
+
+
+def test_transform_columns_matches_pipeline(heart_data, heart_preprocessor):
+    compiled = CompiledPreprocessor(heart_preprocessor, drop_columns=["target"])
+
+    expected = compiled.transform(heart_data.to_dict(orient="list"))
+    np.testing.assert_array_equal(compiled.transform_columns(heart_data), expected)
+
+    codes = compiled.category_codes("cp", heart_data["cp"])
+    ohe = heart_preprocessor.steps[-1][1].named_transformers_["onehotencoder"]
+    np.testing.assert_array_equal(ohe.categories_[1][codes], heart_data["cp"])
@@ -0,0 +1,32 @@
+import cloudpickle
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from src.functions.profiling import check_profile, profile_model
+
+
+def test_profile_model_measures_inference_cost(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=42)
+    X = pd.DataFrame(X, columns=[f"f{i}" for i in range(8)])
+    model_file = str(tmp_path / "model.pkl")
+    with open(model_file, "wb") as f:
+        cloudpickle.dump(RandomForestClassifier(n_estimators=10).fit(X, y), f)
+
+    profile = profile_model(
+        model_file, X, batch_sizes=[1, 50], n_single=20, min_seconds=0.05
+    )
+
+    assert profile["load_seconds"] > 0
+    assert 0 < profile["single_row_p50_ms"] <= profile["single_row_p99_ms"]
+    assert profile["throughput_rps_batch_50"] > profile["throughput_rps_batch_1"]
+    assert profile["peak_rss_mb"] > profile["model_size_mb"] > 0
+
+
+def test_check_profile_flags_slower_challenger():
+    champion = {"single_row_p50_ms": 2.0, "throughput_rps_batch_100": 50_000}
+    slower = {"single_row_p50_ms": 20.0, "throughput_rps_batch_100": 5_000}
+
+    assert check_profile(champion, champion) == []
+    assert len(check_profile(slower, champion)) == 2
+    assert check_profile(slower, {}) == []
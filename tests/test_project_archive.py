@@ -0,0 +1,59 @@
+import os
+import zipfile
+
+from project_archive import archive_files, build_archive, select_files
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_select_files_last_match_wins():
+    files = ["a.py", "tests/test_a.py", "tests/conftest.py", "docs/a.png"]
+    patterns = ["*.py", "!tests/*", "tests/conftest.py"]
+
+    assert select_files(files, patterns) == ["a.py", "tests/conftest.py"]
+
+
+def test_repo_manifest_skips_docs_and_secrets():
+    files = archive_files(REPO_DIR, f"{REPO_DIR}/archive.manifest")
+
+    assert "project_setup.py" in files
+    assert "src/workflows/train_workflow.py" in files
+    assert "artifacts/model:challenger.yaml" in files
+    assert not any(f.startswith(("docs/", "tests/", "benchmarks/")) for f in files)
+    assert "main.ipynb" not in files
+
+
+def test_build_archive_is_deterministic(tmp_path):
+    root = tmp_path / "project"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("a = 1")
+    (root / "b.py").write_text("b = 2")
+    files = ["src/a.py", "b.py"]
+
+    first = build_archive(root, files, tmp_path / "first.zip")
+    os.utime(root / "b.py", (0, 0))
+    assert build_archive(root, files[::-1], tmp_path / "second.zip") == first
+    with zipfile.ZipFile(tmp_path / "second.zip") as zipf:
+        assert zipf.namelist() == ["b.py", "src/a.py"]
+        assert zipf.read("src/a.py") == b"a = 1"
+
+    (root / "b.py").write_text("b = 3")
+    assert build_archive(root, files, tmp_path / "third.zip") != first
+
+
+def test_patterns_are_anchored_at_root():
+    files = [
+        "a.py",
+        "venv/lib/site.py",
+        "build/lib/a.py",
+        "pkg.egg-info/setup.py",
+        "src/functions/a.py",
+    ]
+
+    assert select_files(files, ["*.py"]) == ["a.py"]
+    assert select_files(files, ["src/**"]) == ["src/functions/a.py"]
+    assert select_files(files, ["**/a.py"]) == [
+        "a.py",
+        "build/lib/a.py",
+        "src/functions/a.py",
+    ]
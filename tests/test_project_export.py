@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+
+from project_export import (
+    expand_model_uris,
+    read_confirm_file,
+    set_artifact_block,
+    unique_artifacts,
+)
+
+MODELS = {
+    ("cicd-flow", "latest"): {
+        "model-a": "store://models/cicd-flow/model-a#0:latest@1",
+        "model-b": "store://models/cicd-flow/model-b#0:latest@2",
+        "other": "store://models/cicd-flow/other#0:latest@3",
+    },
+    ("cicd-flow", "candidate"): {
+        "model-a": "store://models/cicd-flow/model-a#0:latest@1",
+    },
+}
+
+
+def list_models(project, tag):
+    return MODELS.get((project, tag), {})
+
+
+def test_expand_model_uris():
+    requested = expand_model_uris(
+        [
+            "store://models/cicd-flow/model#0:latest",
+            "store://models/cicd-flow/model-*:latest",
+        ],
+        ["candidate"],
+        list_models,
+        project_name="cicd-flow",
+    )
+
+    assert requested == [
+        (
+            "store://models/cicd-flow/model#0:latest",
+            "store://models/cicd-flow/model#0:latest",
+        ),
+        (
+            "store://models/cicd-flow/model-*:latest",
+            "store://models/cicd-flow/model-a#0:latest@1",
+        ),
+        (
+            "store://models/cicd-flow/model-*:latest",
+            "store://models/cicd-flow/model-b#0:latest@2",
+        ),
+    ]
+
+
+def test_expand_model_uri_patterns_ignore_iter_and_tree():
+    requested = expand_model_uris(
+        ["store://models/cicd-flow/model-*#0:latest@1"],
+        [],
+        list_models,
+        project_name="cicd-flow",
+    )
+
+    assert [uri for _, uri in requested] == [
+        "store://models/cicd-flow/model-a#0:latest@1",
+        "store://models/cicd-flow/model-b#0:latest@2",
+    ]
+
+
+def model_artifact(key: str, tree: str):
+    return SimpleNamespace(metadata=SimpleNamespace(key=key, tree=tree, uid=None))
+
+
+def test_unique_artifacts_drops_repeated_models():
+    model_a = model_artifact("model-a", "1")
+    model_b = model_artifact("model-b", "2")
+
+    assert unique_artifacts([model_a, model_b, model_artifact("model-a", "1")]) == [
+        model_a,
+        model_b,
+    ]
+    with pytest.raises(ValueError, match="model-a"):
+        unique_artifacts([model_a, model_artifact("model-a", "3")])
+
+
+@pytest.mark.parametrize(
+    "model_uris, model_tags",
+    [
+        (["models/cicd-flow/model"], []),
+        (["store://models/cicd-flow/missing-*"], []),
+        ([], ["unknown"]),
+    ],
+)
+def test_expand_model_uris_errors(model_uris, model_tags):
+    with pytest.raises(ValueError):
+        expand_model_uris(model_uris, model_tags, list_models, "cicd-flow")
+
+
+def test_read_confirm_file(tmp_path):
+    path = tmp_path / "approved.txt"
+    path.write_text(
+        "# approved in review\nstore://models/cicd-flow/model-*\n\nlatest\n"
+    )
+
+    assert read_confirm_file(path) == {"store://models/cicd-flow/model-*", "latest"}
+
+
+def test_set_artifact_block():
+    block = set_artifact_block(
+        [("a", "artifacts/a:challenger.yaml"), ("b", "artifacts/b:challenger.yaml")],
+        "challenger",
+    )
+
+    assert block.count("fingerprints.run(") == 2
+    assert '"artifact:b",' in block
+    assert 'key="b", artifact="artifacts/b:challenger.yaml", tag="challenger"' in block
+    assert 'files=["artifacts/b:challenger.yaml"],' in block
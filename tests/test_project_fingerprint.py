@@ -0,0 +1,78 @@
+from project_fingerprint import (
+    FINGERPRINTS_FILE,
+    SetupFingerprints,
+    hash_files,
+    repo_files,
+)
+
+
+def test_hash_files_tracks_contents(tmp_path):
+    (tmp_path / "a.py").write_text("a = 1")
+    before = hash_files(["a.py", "missing.py"], tmp_path)
+    assert before == hash_files(["a.py"], tmp_path)
+
+    (tmp_path / "a.py").write_text("a = 2")
+    assert hash_files(["a.py"], tmp_path) != before
+
+
+def test_repo_files_skips_hidden_and_fingerprints(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("")
+    (tmp_path / FINGERPRINTS_FILE).write_text("{}")
+
+    assert repo_files(tmp_path) == ["src/a.py"]
+
+
+def test_unchanged_parts_are_skipped(tmp_path):
+    (tmp_path / "f.py").write_text("x")
+    calls = []
+    first = SetupFingerprints(root=tmp_path)
+    first.run("function:f", lambda: calls.append("f"), files=["f.py"], value={"a": 1})
+    first.run("workflow:w", lambda: calls.append("w"), value="w")
+    path = tmp_path / FINGERPRINTS_FILE
+    first.save(path)
+
+    second = SetupFingerprints.load(path, root=tmp_path)
+    second.run("function:f", lambda: calls.append("f"), files=["f.py"], value={"a": 1})
+    second.run("workflow:w", lambda: calls.append("w"), value="changed")
+
+    assert calls == ["f", "w", "w"]
+    assert second.skipped == ["function:f"]
+    assert second.ran == ["workflow:w"]
+    assert "function:f" in second.summary()
+
+
+def test_changed_guard_files_reset_fingerprints(tmp_path):
+    (tmp_path / "project.yaml").write_text("v1")
+    fingerprints = SetupFingerprints(root=tmp_path)
+    fingerprints.run("artifacts", lambda: None)
+    path = tmp_path / FINGERPRINTS_FILE
+    fingerprints.save(path, guard_files=["project.yaml"])
+
+    loaded = SetupFingerprints.load(path, root=tmp_path, guard_files=["project.yaml"])
+    assert loaded.previous == fingerprints.current
+
+    (tmp_path / "project.yaml").write_text("v2")
+    loaded = SetupFingerprints.load(path, root=tmp_path, guard_files=["project.yaml"])
+    assert loaded.previous == {}
+
+
+def test_fingerprints_are_tied_to_guard_value(tmp_path):
+    fingerprints = SetupFingerprints(root=tmp_path)
+    fingerprints.run("secrets", lambda: None)
+    path = tmp_path / FINGERPRINTS_FILE
+    fingerprints.save(path, guard_value=["cicd-flow", "http://mlrun-api:8080"])
+
+    loaded = SetupFingerprints.load(
+        path, root=tmp_path, guard_value=["cicd-flow", "http://mlrun-api:8080"]
+    )
+    assert loaded.previous == fingerprints.current
+
+    for guard_value in [
+        ["other-project", "http://mlrun-api:8080"],
+        ["cicd-flow", "http://other-mlrun-api:8080"],
+    ]:
+        loaded = SetupFingerprints.load(path, root=tmp_path, guard_value=guard_value)
+        assert loaded.previous == {}
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+
+from src.functions.request_bodies import BodyPool, load_rows
+
+
+def test_load_rows_drops_label_and_index(tmp_path, heart_data):
+    path = tmp_path / "test.parquet"
+    heart_data.select_dtypes("number").set_index("age").to_parquet(path)
+
+    rows = load_rows(str(path), drop_columns=["target"])
+    expected = heart_data.select_dtypes("number").drop(["age", "target"], axis=1)
+    np.testing.assert_array_equal(rows, expected.to_numpy(dtype=float))
+    assert rows.flags["C_CONTIGUOUS"]
+
+
+def test_load_rows_memory_maps_once(tmp_path, heart_data):
+    path = tmp_path / "test.parquet"
+    heart_data.select_dtypes("number").to_parquet(path)
+    mmap_path = str(tmp_path / "rows.npy")
+
+    rows = load_rows(str(path), drop_columns=["target"], mmap_path=mmap_path)
+    assert isinstance(rows, np.memmap)
+
+    # Later workers map the existing file without reading the parquet
+    path.unlink()
+    again = load_rows(str(path), drop_columns=["target"], mmap_path=mmap_path)
+    np.testing.assert_array_equal(rows, again)
+
+
+class FakeDataItem:
+    """Stands in for an MLRun DataItem, counting downloads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.downloads = 0
+
+    def local(self):
+        self.downloads += 1
+        return self.path
+
+
+def test_load_rows_downloads_data_item_only_when_needed(tmp_path, heart_data):
+    path = tmp_path / "test.parquet"
+    heart_data.select_dtypes("number").to_parquet(path)
+    data_item = FakeDataItem(str(path))
+    mmap_path = str(tmp_path / "rows.npy")
+
+    rows = load_rows(data_item, drop_columns=["target"], mmap_path=mmap_path)
+    load_rows(data_item, drop_columns=["target"], mmap_path=mmap_path)
+
+    assert data_item.downloads == 1
+    assert rows.shape == (
+        len(heart_data),
+        heart_data.select_dtypes("number").shape[1] - 1,
+    )
+
+
+def test_body_pool_bodies_are_valid_batches():
+    rows = np.arange(20, dtype=float).reshape(10, 2)
+    pool = BodyPool(rows, batch_size=3, n_bodies=50, random_state=42)
+
+    assert len(pool) == 50
+    for i in range(len(pool)):
+        inputs = json.loads(pool[i])["inputs"]
+        assert len(inputs) == 3
+        assert all(row in rows.tolist() for row in inputs)
+
+
+def test_body_pool_encodes_missing_values_as_null():
+    rows = np.array([[1.0, np.nan], [np.nan, 2.0]])
+    pool = BodyPool(rows, batch_size=2, n_bodies=5, random_state=42)
+
+    for i in range(len(pool)):
+        assert b"NaN" not in pool[i]
+        for row in json.loads(pool[i])["inputs"]:
+            assert row in [[1.0, None], [None, 2.0]]
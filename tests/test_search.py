@@ -0,0 +1,59 @@
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from src.functions.search import (
+    successive_halving,
+    truncate_forest,
+    warm_start_checkpoints,
+)
+
+
+def test_successive_halving_drops_candidates_per_rung():
+    X, y = make_classification(n_samples=300, n_features=10, random_state=42)
+    search = successive_halving(
+        X[:200],
+        y[:200],
+        X[200:],
+        y[200:],
+        param_grid={
+            "max_depth": [2, 5, None],
+            "min_samples_leaf": [1, 2, 4],
+            "n_estimators": [5, 45],
+        },
+        n_candidates=9,
+        factor=3,
+        n_workers=2,
+    )
+
+    rungs = [(r["rung"], r["n_estimators"]) for r in search["results"]]
+    assert rungs.count((0, 5)) == 9
+    assert rungs.count((1, 15)) == 3
+    assert rungs.count((2, 45)) == 1
+
+    final = search["results"][-1]
+    assert search["best_params"]["n_estimators"] == 45
+    assert search["best_accuracy"] == final["accuracy"]
+    assert search["cpu_seconds"] > 0 and search["wall_seconds"] > 0
+
+    # Refitting the selected configuration reproduces the scored model
+    refit = RandomForestClassifier(**search["best_params"]).fit(X[:200], y[:200])
+    assert np.mean(refit.predict(X[200:]) == y[200:]) == search["best_accuracy"]
+
+
+def test_warm_start_checkpoints_match_fresh_forests():
+    X, y = make_classification(n_samples=300, n_features=10, random_state=42)
+    params = {"max_depth": 5, "random_state": 42}
+    model, checkpoints = warm_start_checkpoints(
+        X[:200], y[:200], X[200:], y[200:], params=params, estimators=[20, 10]
+    )
+
+    assert [c["n_estimators"] for c in checkpoints] == [10, 20]
+    assert checkpoints[0]["fit_seconds"] <= checkpoints[1]["fit_seconds"]
+
+    fresh = RandomForestClassifier(n_estimators=10, **params).fit(X[:200], y[:200])
+    truncated = truncate_forest(model, 10)
+    np.testing.assert_array_equal(
+        truncated.predict_proba(X[200:]), fresh.predict_proba(X[200:])
+    )
+    assert len(model.estimators_) == 20
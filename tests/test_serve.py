@@ -0,0 +1,57 @@
+import types
+
+import cloudpickle
+import pytest
+
+mlrun = pytest.importorskip("mlrun")
+
+from src.functions.serve import ClassifierModel  # noqa: E402
+
+
+class FakeContext:
+    def __init__(self):
+        self.logger = types.SimpleNamespace(info=lambda message: None)
+
+    def get_param(self, key, default=None):
+        return default
+
+
+def test_second_load_hits_model_cache(tmp_path, monkeypatch):
+    model_spec = types.SimpleNamespace(
+        metadata=types.SimpleNamespace(hash="abc"),
+        spec=types.SimpleNamespace(extra_data={"report": "report.html"}),
+    )
+    monkeypatch.setattr(
+        mlrun.datastore.store_manager,
+        "get_store_artifact",
+        lambda url: (model_spec, "s3://bucket/models/model.pkl"),
+    )
+    monkeypatch.setattr(mlrun, "get_dataitem", lambda url: url)
+
+    downloads = []
+
+    def get_model(self, suffix=""):
+        downloads.append(suffix)
+        model_file = tmp_path / f"download{suffix}"
+        model_file.write_bytes(cloudpickle.dumps({"weights": [1, 2]}))
+        return str(model_file), {"report": "s3://bucket/models/report.html"}
+
+    monkeypatch.setattr(ClassifierModel, "get_model", get_model)
+
+    servers = []
+    for _ in range(2):
+        server = ClassifierModel(
+            context=FakeContext(),
+            name="model",
+            model_path="store://models/project/model",
+            model_cache_dir=str(tmp_path / "cache"),
+        )
+        server.load()
+        servers.append(server)
+
+    cold, warm = servers
+    assert downloads == [".pkl"]
+    assert "model_load_cold_seconds" in cold.metrics
+    assert "model_load_warm_seconds" in warm.metrics
+    assert warm.model == cold.model == {"weights": [1, 2]}
+    assert warm.extra_data == cold.extra_data
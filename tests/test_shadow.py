@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from src.functions.evaluation import evaluate
+from src.functions.shadow import StreamingMetrics, shadow_evaluate
+from src.functions.streaming import ParquetChunkWriter
+
+
+@pytest.fixture(scope="module")
+def shadow_data():
+    X, y = make_classification(n_samples=3000, n_features=8, random_state=42)
+    data = pd.DataFrame(X, columns=[f"f{i}" for i in range(8)]).assign(target=y)
+    train, test = data.iloc[:1000], data.iloc[1000:]
+    models = {
+        "challenger": RandomForestClassifier(n_estimators=20, random_state=42),
+        "champion": DecisionTreeClassifier(max_depth=3, random_state=42),
+    }
+    for model in models.values():
+        model.fit(train.drop("target", axis=1), train["target"])
+    return test, models
+
+
+def chunks(data: pd.DataFrame, chunk_size: int):
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start : start + chunk_size]
+
+
+def test_streaming_metrics_match_full_evaluation():
+    rng = np.random.default_rng(42)
+    y_true = rng.integers(0, 3, 6000)
+    proba = rng.dirichlet(np.ones(3), 6000)
+    proba[np.arange(6000), y_true] += 0.5
+    proba /= proba.sum(axis=1, keepdims=True)
+    y_pred = proba.argmax(axis=1)
+
+    metrics = StreamingMetrics(classes=[0, 1, 2])
+    for start in range(0, 6000, 700):
+        end = start + 700
+        metrics.update(y_true[start:end], y_pred[start:end], proba[start:end])
+    result, expected = metrics.result(), evaluate(y_true, y_pred, proba, [0, 1, 2])
+
+    for name in ["accuracy", "f1", "precision", "recall", "log_loss"]:
+        assert result[name] == pytest.approx(expected[name])
+    assert result["roc_auc"] == pytest.approx(expected["roc_auc"], abs=1e-3)
+
+
+def test_shadow_evaluate_reports_disagreement(tmp_path, shadow_data):
+    test, models = shadow_data
+    path = str(tmp_path / "disagreements.parquet")
+    with ParquetChunkWriter(path) as writer:
+        report = shadow_evaluate(
+            chunks(test, 300),
+            models,
+            "target",
+            classes=[0, 1],
+            disagreement_writer=writer,
+        )
+
+    X = test.drop("target", axis=1)
+    challenger, champion = models["challenger"].predict(X), models["champion"].predict(
+        X
+    )
+    assert report["rows"] == len(test)
+    assert report["disagreements"] == (challenger != champion).sum()
+    assert report["metrics"]["champion"]["accuracy"] == pytest.approx(
+        np.mean(champion == test["target"])
+    )
+    assert set(report["throughput_rps"]) == {"challenger", "champion"}
+
+    disagreements = pd.read_parquet(path)
+    assert len(disagreements) == report["disagreements"]
+    assert (
+        disagreements["prediction_challenger"] != disagreements["prediction_champion"]
+    ).all()
+
+
+def test_shadow_evaluate_transforms_chunks_per_model(shadow_data):
+    test, models = shadow_data
+    train = test.iloc[:1000]
+    # The champion is trained on its own encoding of the features
+    champion_features = ["f0", "f1", "f2"]
+    champion = DecisionTreeClassifier(max_depth=3, random_state=42)
+    champion.fit(train[champion_features] * 2, train["target"])
+
+    report = shadow_evaluate(
+        chunks(test, 300),
+        {"challenger": models["challenger"], "champion": champion},
+        "target",
+        classes=[0, 1],
+        transforms={"champion": lambda chunk: chunk[champion_features] * 2},
+    )
+
+    predictions = champion.predict(test[champion_features] * 2)
+    assert report["metrics"]["champion"]["accuracy"] == pytest.approx(
+        np.mean(predictions == test["target"])
+    )
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import socket
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from aiohttp import web
+
+pytest.importorskip("mlrun")
+
+from src.functions import simulate_traffic  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def predict_server():
+    async def predict(request):
+        body = await request.json()
+        return web.json_response({"outputs": [len(body["inputs"])]})
+
+    app = web.Application()
+    app.router.add_post(f"/{simulate_traffic.PREDICT_ROUTE}", predict)
+    port = free_port()
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}"
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
+def test_open_loop_handler_runs_inside_event_loop(predict_server):
+    context = SimpleNamespace(
+        addr=predict_server,
+        mode="open_loop",
+        test_data=np.ones((20, 3)),
+        logger=SimpleNamespace(info=print),
+    )
+    event = SimpleNamespace(
+        body=json.dumps({"arrival_process": "constant", "rate": 50, "duration": 0.2})
+    )
+
+    # Nuclio calls handlers from its own running event loop
+    async def nuclio_worker():
+        return await simulate_traffic.handler(context, event)
+
+    summary = asyncio.run(nuclio_worker())
+    assert summary["total_tests"] == 10
+    assert summary["errors"] == 0
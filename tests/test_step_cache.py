@@ -0,0 +1,112 @@
+import importlib
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from src.functions.step_cache import LocalStepCache, memoize_step, step_key
+
+
+class FakeContext:
+    def __init__(self):
+        self.results = {}
+        self.artifacts = {}
+
+    def log_result(self, key, value):
+        self.results[key] = value
+
+    def log_artifact(self, key, local_path):
+        with open(local_path) as f:
+            self.artifacts[key] = f.read()
+
+
+@pytest.fixture
+def cached_step(tmp_path):
+    cache = LocalStepCache(str(tmp_path / "cache"))
+    calls = []
+
+    @memoize_step(lambda context: cache)
+    def step(context, data: pd.DataFrame, scale: int = 2):
+        calls.append(scale)
+        report = tmp_path / f"report-{len(calls)}.txt"
+        report.write_text(f"rows={len(data)}")
+        context.log_result("total", int(data["x"].sum() * scale))
+        context.log_artifact("report", local_path=str(report))
+        return data * scale
+
+    return step, calls, cache
+
+
+def test_memoize_step_replays_outputs_on_hit(cached_step):
+    step, calls, _ = cached_step
+    data = pd.DataFrame({"x": [1, 2, 3]})
+
+    first, second = FakeContext(), FakeContext()
+    result = step(first, data)
+    cached = step(second, data.copy())
+
+    assert calls == [2]
+    pd.testing.assert_frame_equal(cached, result)
+    assert second.results == first.results == {"total": 12}
+    assert second.artifacts == first.artifacts == {"report": "rows=3"}
+
+
+def test_memoize_step_reruns_on_changed_params_or_inputs(cached_step):
+    step, calls, _ = cached_step
+    data = pd.DataFrame({"x": [1, 2, 3]})
+
+    step(FakeContext(), data)
+    step(FakeContext(), data, scale=3)
+    step(FakeContext(), data.assign(x=[1, 2, 4]))
+    assert calls == [2, 3, 2]
+
+
+def test_failed_steps_are_not_cached(tmp_path):
+    cache = LocalStepCache(str(tmp_path))
+    calls = []
+
+    @memoize_step(lambda context: cache)
+    def step(value: int):
+        calls.append(value)
+        raise ValueError("validation failed")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            step(1)
+    assert calls == [1, 1]
+    assert os.listdir(tmp_path) == []
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = LocalStepCache(str(tmp_path), max_size_mb=1.5)
+    for key in ["a", "b", "c"]:
+        staging_dir = cache.staging_dir()
+        with open(f"{staging_dir}/data.bin", "wb") as f:
+            f.write(os.urandom(600 * 1024))
+        cache.put(key, staging_dir, returns=key, calls=[])
+        cache.get("a")
+
+    assert cache.get("a")["returns"] == "a"
+    assert cache.get("b") is None
+    assert cache.get("c")["returns"] == "c"
+
+
+def test_step_key_tracks_imported_local_modules(tmp_path, monkeypatch):
+    package = tmp_path / "steps"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text("def scale(x):\n    return x * 2\n")
+    (package / "step.py").write_text(
+        "from steps.helpers import scale\n\n\ndef step(x):\n    return scale(x)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        module = importlib.import_module("steps.step")
+        key = step_key(module.step, {"x": 1})
+        assert step_key(module.step, {"x": 1}) == key
+        (package / "helpers.py").write_text("def scale(x):\n    return x * 3\n")
+        assert step_key(module.step, {"x": 1}) != key
+    finally:
+        for name in ["steps", "steps.helpers", "steps.step"]:
+            sys.modules.pop(name, None)
@@ -0,0 +1,65 @@
+import pandas as pd
+import pandera as pa
+import pytest
+
+from src.functions.columnar_validation import ColumnarValidator
+from src.functions.models import HeartSchema
+from src.functions.streaming import (
+    fit_vocabularies,
+    read_chunks,
+    read_dtypes,
+    split_chunks,
+    validate_to_parquet,
+)
+
+SCHEMA = HeartSchema.to_schema()
+
+
+def test_chunked_output_matches_source(heart_data, tmp_path):
+    output_path = str(tmp_path / "data.parquet")
+    chunks = read_chunks("data/heart.csv", chunk_size=100, dtype=read_dtypes(SCHEMA))
+
+    rows = validate_to_parquet(chunks, SCHEMA, output_path)
+
+    assert rows == len(heart_data)
+    pd.testing.assert_frame_equal(pd.read_parquet(output_path), heart_data)
+
+
+def test_errors_are_merged_across_chunks(heart_data, tmp_path):
+    source = heart_data.copy()
+    source.loc[5, "target"] = 3
+    source.loc[250, "target"] = 4
+    source_path = str(tmp_path / "source.parquet")
+    source.to_parquet(source_path)
+
+    chunks = read_chunks(source_path, chunk_size=100)
+    with pytest.raises(pa.errors.SchemaErrors) as err:
+        validate_to_parquet(chunks, SCHEMA, str(tmp_path / "data.parquet"))
+
+    failure_cases = err.value.failure_cases
+    assert sorted(failure_cases["index"]) == [5, 250]
+    assert sorted(failure_cases["failure_case"]) == [3, 4]
+
+
+def test_columnar_validator_backend(heart_data, tmp_path):
+    output_path = str(tmp_path / "data.parquet")
+    chunks = read_chunks("data/heart.csv", chunk_size=100, dtype=read_dtypes(SCHEMA))
+
+    rows = validate_to_parquet(
+        chunks, SCHEMA, output_path, validator=ColumnarValidator(SCHEMA)
+    )
+    assert rows == len(heart_data)
+
+
+def test_split_is_replayable_and_vocabularies_match_encoder(heart_preprocessor):
+    def split():
+        return split_chunks(read_chunks("data/heart.csv", chunk_size=100), 0.2)
+
+    first = [(len(train), len(test)) for train, test in split()]
+    assert first == [(len(train), len(test)) for train, test in split()]
+    assert sum(n_test for _, n_test in first) > 0
+
+    vocabularies = fit_vocabularies((train for train, _ in split()), ["cp", "thal"])
+    ohe = heart_preprocessor.steps[-1][1].named_transformers_["onehotencoder"]
+    assert vocabularies["cp"] == list(ohe.categories_[1])
+    assert vocabularies["thal"] == list(ohe.categories_[3])
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("deepchecks")
+
+from deepchecks.tabular import Suite  # noqa: E402
+from deepchecks.tabular.checks import (  # noqa: E402
+    DataDuplicates,
+    ModelInfo,
+    TrainTestPerformance,
+)
+from sklearn.compose import make_column_transformer  # noqa: E402
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from sklearn.pipeline import make_pipeline  # noqa: E402
+from sklearn.preprocessing import OneHotEncoder  # noqa: E402
+
+from src.functions.suite_runner import run_suite  # noqa: E402
+from src.functions.validation_session import ValidationSession  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def split_and_model(heart_data):
+    train, test = heart_data.iloc[:200], heart_data.iloc[200:]
+    categorical_columns = list(heart_data.select_dtypes("object").columns)
+    model = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(handle_unknown="ignore"), categorical_columns),
+            remainder="passthrough",
+        ),
+        RandomForestClassifier(n_estimators=10, random_state=42),
+    )
+    model.fit(train.drop(columns="target"), train["target"])
+    return train, test, model
+
+
+def make_suite() -> Suite:
+    return Suite("test", TrainTestPerformance(), DataDuplicates(), ModelInfo())
+
+
+def result_outputs(suite_result) -> list:
+    return [result.to_json(with_display=False) for result in suite_result.results]
+
+
+def test_parallel_run_matches_suite_run(split_and_model):
+    train, test, model = split_and_model
+    inputs = {"train_dataset": train, "test_dataset": test, "model": model}
+    session = ValidationSession(label_column="target")
+
+    serial, serial_timings = run_suite(make_suite(), session, **inputs)
+    parallel, parallel_timings = run_suite(make_suite(), session, n_workers=2, **inputs)
+
+    assert result_outputs(parallel) == result_outputs(serial)
+    assert list(serial_timings) == ["total"]
+    assert set(parallel_timings) == {
+        "TrainTestPerformance",
+        "DataDuplicates",
+        "ModelInfo",
+    }
+
+
+def test_sampled_checks_are_labelled(split_and_model):
+    train, test, model = split_and_model
+    session = ValidationSession(label_column="target")
+
+    suite_result, _ = run_suite(
+        make_suite(),
+        session,
+        train_dataset=train,
+        test_dataset=test,
+        model=model,
+        sample_rows=50,
+        heavy_checks=["DataDuplicates"],
+    )
+
+    headers = [result.get_header() for result in suite_result.results]
+    assert headers == [
+        "Train Test Performance",
+        "Data Duplicates (sampled 50 rows)",
+        "Model Info",
+    ]
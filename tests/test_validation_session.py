@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("deepchecks")
+
+from src.functions.validation_session import (  # noqa: E402
+    ValidationSession,
+    content_hash,
+    infer_column_metadata,
+    stratified_sample,
+)
+
+
+def test_content_hash_tracks_data_version(heart_data):
+    assert content_hash(heart_data) == content_hash(heart_data.copy())
+    changed = heart_data.copy()
+    changed.loc[0, "age"] += 1
+    assert content_hash(changed) != content_hash(heart_data)
+
+
+def test_column_metadata_excludes_label(heart_data):
+    metadata = infer_column_metadata(heart_data, label_column="target")
+    assert metadata["cat_features"] == ["cp", "restecg", "sex", "slope", "thal"]
+
+
+def test_session_reuses_datasets_and_metadata(heart_data):
+    session = ValidationSession(label_column="target")
+    train, test = heart_data.iloc[:200], heart_data.iloc[200:]
+
+    assert session.dataset(train) is session.dataset(train.copy())
+    assert session.dataset(test) is not session.dataset(train)
+    assert len(session.column_metadata) == 1
+
+
+def test_session_keeps_most_recently_used_datasets(heart_data):
+    session = ValidationSession(label_column="target", max_datasets=2)
+    first, second, third = (heart_data.iloc[i * 100 : (i + 1) * 100] for i in range(3))
+
+    cached = session.dataset(first)
+    session.dataset(second)
+    # Using the first dataset again makes the second the least recently used
+    session.dataset(first)
+    session.dataset(third)
+
+    assert len(session.datasets) == 2
+    assert session.dataset(first) is cached
+
+
+def test_stratified_sample_keeps_label_distribution(heart_data):
+    sample = stratified_sample(heart_data, "target", max_rows=100)
+
+    assert abs(len(sample) - 100) <= 2
+    assert sample["target"].mean() == pytest.approx(
+        heart_data["target"].mean(), abs=0.02
+    )
+    assert stratified_sample(heart_data, "target", max_rows=10_000) is heart_data